@@ -0,0 +1,95 @@
+"""
+Measure the throughput of authenticated requests with and without caching tokens.
+
+Seed a user, then time the request retrieving the user with a bearer token signed with
+RS256, verifying the token on each request and once for all requests.
+"""
+from timeit import repeat
+from unittest import mock
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.settings import api_settings
+
+from magnify.apps.core.api import UserViewSet
+from magnify.apps.core.authentication import (
+    DelegatedJWTAuthentication,
+    validated_tokens_cache,
+)
+from magnify.apps.core.models import User
+from magnify.apps.core.tokens import BearerToken
+
+# Number of requests made in each run
+NB_REQUESTS = 200
+# Number of runs of which the fastest one is kept
+NB_RUNS = 5
+# Values of the `JWT_VALIDATED_TOKENS_CACHE_SIZE` setting compared
+MODES = [("without cache", 0), ("with cache", 1000)]
+
+
+def get_rsa_token_backend():
+    """Returns a token backend signing and verifying tokens with a new RSA key."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return TokenBackend(
+        "RS256",
+        private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode(),
+        private_key.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode(),
+    )
+
+
+class AuthenticationBenchmark(TestCase):
+    """Benchmark authenticating requests with bearer tokens."""
+
+    @mock.patch.object(api_settings, "AUTH_TOKEN_CLASSES", (BearerToken,))
+    def test_benchmark_authentication(self):
+        """Print the number of authenticated requests per second in each mode."""
+        user = User.objects.create(
+            username="benchmark",
+            email="benchmark@example.com",
+            jwt_sub="benchmark",
+            password="!",  # nosec
+        )
+        view = UserViewSet.as_view(
+            {"get": "me"}, authentication_classes=[DelegatedJWTAuthentication]
+        )
+        factory = APIRequestFactory()
+
+        with mock.patch.object(
+            BearerToken, "get_token_backend", return_value=get_rsa_token_backend()
+        ):
+            token = BearerToken()
+            token["sub"] = user.jwt_sub
+            token["preferred_username"] = user.username
+            token["email"] = user.email
+            authorization = f"Bearer {token!s}"
+
+            def get_user():
+                response = view(
+                    factory.get("/api/users/me/", HTTP_AUTHORIZATION=authorization)
+                )
+                self.assertEqual(response.status_code, 200, response.data)
+                return response
+
+            for label, cache_size in MODES:
+                validated_tokens_cache.clear()
+                with override_settings(JWT_VALIDATED_TOKENS_CACHE_SIZE=cache_size):
+                    get_user()
+                    duration = min(repeat(get_user, number=NB_REQUESTS, repeat=NB_RUNS))
+                print(
+                    f"{label:s}: {NB_REQUESTS / duration:.0f} requests/s "
+                    f"({duration * 1e3 / NB_REQUESTS:.2f}ms per request)"
+                )
@@ -0,0 +1,50 @@
+"""
+Measure the throughput of signing Jitsi tokens with PyJWT and with the token factory.
+
+Sign the token of a user in a room many times in a row, encoding the payload with PyJWT on
+each call and with the factory reusing the parts that only depend on settings.
+"""
+from timeit import repeat
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+import jwt
+
+from magnify.apps.core.models import User
+from magnify.apps.core.tokens import JitsiTokenFactory
+from magnify.apps.core.utils import create_token_payload
+
+# Number of tokens signed in each run
+NB_TOKENS = 10000
+# Number of runs of which the fastest one is kept
+NB_RUNS = 5
+
+
+class JitsiTokensBenchmark(SimpleTestCase):
+    """Benchmark signing Jitsi tokens."""
+
+    def test_benchmark_jitsi_tokens(self):
+        """Print the number of tokens signed per second in each mode."""
+        user = User(username="benchmark", email="benchmark@example.com")
+        secret_key = settings.JITSI_CONFIGURATION["jitsi_secret_key"]
+
+        def encode_with_pyjwt():
+            return jwt.encode(
+                create_token_payload(user, "benchmark"),
+                secret_key,
+                algorithm="HS256",
+            )
+
+        def encode_with_factory():
+            return JitsiTokenFactory.get_instance().create_token(user, "benchmark")
+
+        for label, encode in [
+            ("pyjwt", encode_with_pyjwt),
+            ("factory", encode_with_factory),
+        ]:
+            duration = min(repeat(encode, number=NB_TOKENS, repeat=NB_RUNS))
+            print(
+                f"{label:s}: {NB_TOKENS / duration:.0f} tokens/s "
+                f"({duration * 1e6 / NB_TOKENS:.2f}µs per token)"
+            )
@@ -0,0 +1,93 @@
+"""
+Measure the cost of filtering the meetings to which a user is related.
+
+Seed meetings shared with a big group, then time and explain the query listing the meetings
+of one of its members, with the relations looked up in subqueries and with the former joins
+deduplicated by a DISTINCT.
+"""
+from datetime import datetime, timedelta
+from timeit import repeat
+from zoneinfo import ZoneInfo
+
+from django.db.models import Q
+from django.test import TestCase
+
+from magnify.apps.core.models import Group, Meeting, MeetingAccess, User
+
+# Number of meetings seeded
+NB_MEETINGS = 10000
+# Number of members of the group with which meetings are shared
+NB_MEMBERS = 5000
+# Number of runs of which the fastest one is kept
+NB_RUNS = 5
+
+
+def seed(nb_meetings, nb_members):
+    """
+    Create a group of members and meetings owned by them, one in ten being shared with the
+    group and one in ten with its first member. Returns the first member.
+    """
+    members = User.objects.bulk_create(
+        User(username=f"benchmark-{i:d}", email=f"benchmark-{i:d}@example.com")
+        for i in range(nb_members)
+    )
+    group = Group.objects.create(name="benchmark", token="benchmark")  # nosec
+    group.members.set(members)
+    group.administrators.set(members[:1])
+
+    start = datetime(2022, 1, 3, 9, 0, tzinfo=ZoneInfo("UTC"))
+    meetings = Meeting.objects.bulk_create(
+        Meeting(
+            name=f"benchmark-{i:d}",
+            owner=members[i % nb_members],
+            start=start + timedelta(hours=i),
+            end=start + timedelta(hours=i + 1),
+            timezone=ZoneInfo("UTC"),
+            is_public=bool(i % 2),
+        )
+        for i in range(nb_meetings)
+    )
+    MeetingAccess.objects.bulk_create(
+        [MeetingAccess(meeting=meeting, group=group) for meeting in meetings[::10]]
+        + [
+            MeetingAccess(meeting=meeting, user=members[0])
+            for meeting in meetings[5::10]
+        ]
+    )
+    return members[0]
+
+
+class MeetingsAccessBenchmark(TestCase):
+    """Benchmark filtering the meetings accessible to a user."""
+
+    def test_benchmark_meetings_access(self):
+        """Print the duration and the plan of each query."""
+        user = seed(NB_MEETINGS, NB_MEMBERS)
+
+        queries = [
+            ("subqueries", Meeting.objects.accessible_to(user)),
+            (
+                "joins",
+                Meeting.objects.filter(
+                    Q(owner=user)
+                    | Q(users=user)
+                    | Q(groups__members=user)
+                    | Q(groups__administrators=user)
+                ).distinct(),
+            ),
+        ]
+        for label, queryset in queries:
+            duration = (
+                min(
+                    repeat(
+                        lambda queryset=queryset: list(queryset.all()),
+                        number=1,
+                        repeat=NB_RUNS,
+                    )
+                )
+                * 1e3
+            )
+            print(
+                f"{label:s}: {queryset.count():d} meetings in {duration:.2f}ms\n"
+                f"{queryset.explain():s}\n"
+            )
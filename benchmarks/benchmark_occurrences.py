@@ -0,0 +1,138 @@
+"""
+Measure the cost of computing each occurrence of recurring meetings.
+
+Walk the occurrences of sample recurring meetings, either with the implementation of
+`Meeting.next_occurrence` that parsed the fields of the meeting on each call, as it was
+before recurrence rules were compiled, with the current implementation, or with
+`Meeting.iter_occurrences` that computes them arithmetically, and print the cost per
+occurrence of each.
+"""
+from datetime import datetime, timedelta
+from timeit import repeat
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase
+
+from dateutil.relativedelta import relativedelta
+
+from magnify.apps.core.models import Meeting
+from magnify.apps.core.utils import get_date_of_weekday_in_nth_week, get_nth_week_number
+
+# Number of occurrences walked for each meeting
+NB_OCCURRENCES = 1000
+# Number of runs of which the fastest one is kept
+NB_RUNS = 5
+
+RECURRENCES = [
+    ("daily", {"recurrence": Meeting.DAILY}),
+    ("weekly", {"recurrence": Meeting.WEEKLY, "weekdays": "0246"}),
+    (
+        "monthly on date",
+        {"recurrence": Meeting.MONTHLY, "monthly_type": Meeting.DATE_DAY},
+    ),
+    (
+        "monthly on nth day",
+        {"recurrence": Meeting.MONTHLY, "monthly_type": Meeting.NTH_DAY},
+    ),
+    ("yearly", {"recurrence": Meeting.YEARLY}),
+]
+
+
+def baseline_next_occurrence(meeting, current_datetime):
+    """
+    Returns the next occurrence of a meeting as `Meeting.next_occurrence` did before
+    recurrence rules were compiled, parsing the fields of the meeting on each call.
+    """
+    current_datetime_tz = current_datetime.astimezone(meeting.timezone)
+    if meeting.recurrence == Meeting.DAILY:
+        return (current_datetime_tz + timedelta(days=meeting.frequency)).astimezone(
+            ZoneInfo("UTC")
+        )
+
+    if meeting.recurrence == Meeting.WEEKLY:
+        increment = 1
+        # Look in the current week
+        weekday = current_datetime.astimezone(meeting.timezone).weekday()
+        while weekday + increment <= 6:
+            if str(weekday + increment) in meeting.weekdays:
+                return (current_datetime_tz + timedelta(days=increment)).astimezone(
+                    ZoneInfo("UTC")
+                )
+            increment += 1
+        # Skip the weeks not covered by frequency
+        next_datetime_tz = (
+            current_datetime_tz
+            + timedelta(days=increment)
+            + timedelta(weeks=meeting.frequency - 1)
+        )
+
+        # Look in this week and be sure to find
+        weekday = -1
+        increment = 1
+        while weekday + increment <= 6:
+            if str(weekday + increment) in meeting.weekdays:
+                return (next_datetime_tz + timedelta(days=increment - 1)).astimezone(
+                    ZoneInfo("UTC")
+                )
+            increment += 1
+
+        raise RuntimeError("You should have found the next weekly occurrence by now.")
+
+    if meeting.recurrence == Meeting.MONTHLY:
+        next_datetime_tz = current_datetime_tz + relativedelta(months=meeting.frequency)
+        if meeting.monthly_type == Meeting.DATE_DAY:
+            return next_datetime_tz.astimezone(ZoneInfo("UTC"))
+
+        weekday = current_datetime_tz.weekday()
+        week_number = get_nth_week_number(current_datetime_tz.date())
+        next_date = get_date_of_weekday_in_nth_week(
+            next_datetime_tz.year, next_datetime_tz.month, week_number, weekday
+        )
+        return current_datetime_tz.replace(
+            year=next_date.year, month=next_date.month, day=next_date.day
+        ).astimezone(ZoneInfo("UTC"))
+
+    return (current_datetime_tz + relativedelta(years=meeting.frequency)).astimezone(
+        ZoneInfo("UTC")
+    )
+
+
+class OccurrencesBenchmark(SimpleTestCase):
+    """Benchmark computing occurrences before and after compiling recurrence rules."""
+
+    def test_benchmark_occurrences(self):
+        """Print the cost per occurrence for each kind of recurrence."""
+        start = datetime(2022, 1, 3, 9, 0, tzinfo=ZoneInfo("UTC"))
+
+        for label, fields in RECURRENCES:
+            meeting = Meeting(
+                start=start,
+                end=start + timedelta(hours=1),
+                timezone=ZoneInfo("Europe/Paris"),
+                frequency=1,
+                **fields,
+            )
+
+            def walk_baseline(meeting=meeting):
+                occurrence = meeting.start
+                for _i in range(NB_OCCURRENCES):
+                    occurrence = baseline_next_occurrence(meeting, occurrence)
+
+            def walk_current(meeting=meeting):
+                occurrence = meeting.start
+                for _i in range(NB_OCCURRENCES):
+                    occurrence = meeting.next_occurrence(occurrence)
+
+            def walk_iterated(meeting=meeting):
+                for _occurrence in meeting.iter_occurrences(limit=NB_OCCURRENCES):
+                    pass
+
+            baseline, current, iterated = (
+                min(repeat(walk, number=1, repeat=NB_RUNS)) / NB_OCCURRENCES * 1e6
+                for walk in (walk_baseline, walk_current, walk_iterated)
+            )
+            print(
+                f"{label:s}: {baseline:.2f}us per occurrence with the baseline "
+                f"implementation, {current:.2f}us with compiled recurrence rules, "
+                f"{iterated:.2f}us when iterated"
+            )
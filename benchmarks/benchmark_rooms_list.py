@@ -0,0 +1,54 @@
+"""
+Measure the latency of listing rooms with and without Jitsi tokens in payloads.
+
+Seed rooms of which a user is member, then time the request listing them with a Jitsi token
+signed for each room and with tokens left to the token endpoint.
+"""
+from timeit import repeat
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from magnify.apps.core.api import RoomViewSet
+from magnify.apps.core.models import ResourceAccess, RoleChoices, Room, User
+
+# Number of rooms listed
+NB_ROOMS = 100
+# Number of runs of which the fastest one is kept
+NB_RUNS = 5
+# Values of the `JITSI_TOKEN_IN_PAYLOADS` setting compared
+MODES = [("with tokens", True), ("without tokens", False)]
+
+
+def seed(nb_rooms):
+    """Create rooms of which a user is member and return the user."""
+    user = User.objects.create(
+        username="benchmark", email="benchmark@example.com", password="!"  # nosec
+    )
+    for i in range(nb_rooms):
+        room = Room.objects.create(name=f"benchmark-{i:d}")
+        ResourceAccess.objects.create(resource=room, user=user, role=RoleChoices.MEMBER)
+    return user
+
+
+class RoomsListBenchmark(TestCase):
+    """Benchmark listing rooms with and without Jitsi tokens."""
+
+    def test_benchmark_rooms_list(self):
+        """Print the duration of the request listing rooms in each mode."""
+        view = RoomViewSet.as_view({"get": "list"})
+        factory = APIRequestFactory()
+        user = seed(NB_ROOMS)
+
+        def list_rooms():
+            request = factory.get("/api/rooms/")
+            force_authenticate(request, user=user)
+            return view(request).render()
+
+        for label, in_payloads in MODES:
+            with override_settings(JITSI_TOKEN_IN_PAYLOADS=in_payloads):
+                nb_rooms = len(list_rooms().data["results"])
+                duration = min(repeat(list_rooms, number=1, repeat=NB_RUNS)) * 1e3
+            print(f"{label:s}: {nb_rooms:d} rooms in {duration:.2f}ms")
@@ -14,3 +14,12 @@ accesslog = "-"
 # Using '-' for the error log file makes gunicorn log errors to stderr
 errorlog = "-"
 loglevel = "info"
+
+
+# Hooks
+def post_worker_init(worker):  # pylint: disable=unused-argument
+    """Fetch the keys verifying OIDC tokens before the worker serves its first request."""
+    # pylint: disable=import-outside-toplevel
+    from magnify.apps.core.jwks import jwks_cache
+
+    jwks_cache.warm_up()
@@ -84,7 +84,7 @@ class Base(MagnifyCoreConfigurationMixin, Configuration):
             environ_name="DRF_DEFAULT_AUTHENTICATION_CLASSES",
             environ_prefix=None,
         ),
-        "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+        "DEFAULT_PAGINATION_CLASS": "magnify.apps.core.pagination.Pagination",
         "PAGE_SIZE": 100,
         "DEFAULT_VERSION": "1.0",
         "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.URLPathVersioning",
@@ -137,6 +137,18 @@ class Base(MagnifyCoreConfigurationMixin, Configuration):
         ),
     }
 
+    JITSI_TOKEN_IN_PAYLOADS = values.BooleanValue(
+        True, environ_name="MAGNIFY_JITSI_TOKEN_IN_PAYLOADS", environ_prefix=None
+    )
+    JITSI_TOKEN_CACHE_SIZE = values.PositiveIntegerValue(
+        0, environ_name="MAGNIFY_JITSI_TOKEN_CACHE_SIZE", environ_prefix=None
+    )
+    JITSI_TOKEN_CACHE_ALIAS = values.Value(
+        None, environ_name="MAGNIFY_JITSI_TOKEN_CACHE_ALIAS", environ_prefix=None
+    )
+    JITSI_TOKEN_CACHE_MIN_REMAINING = values.FloatValue(
+        0.5, environ_name="MAGNIFY_JITSI_TOKEN_CACHE_MIN_REMAINING", environ_prefix=None
+    )
     JITSI_ROOM_PREFIX = values.Value(
         "", environ_name="MAGNIFY_JITSI_ROOM_PREFIX", environ_prefix=None
     )
@@ -149,6 +161,37 @@ class Base(MagnifyCoreConfigurationMixin, Configuration):
     ALLOW_API_USER_CREATE = values.BooleanValue(
         False, environ_name="MAGNIFY_ALLOW_API_USER_CREATE", environ_prefix=None
     )
+    MEETING_OCCURRENCES_HORIZON_DAYS = values.PositiveIntegerValue(
+        365,
+        environ_name="MAGNIFY_MEETING_OCCURRENCES_HORIZON_DAYS",
+        environ_prefix=None,
+    )
+    MEETING_OCCURRENCES_RETENTION_DAYS = values.PositiveIntegerValue(
+        365,
+        environ_name="MAGNIFY_MEETING_OCCURRENCES_RETENTION_DAYS",
+        environ_prefix=None,
+    )
+    MEETING_CONFLICTS_CHECK = values.BooleanValue(
+        False, environ_name="MAGNIFY_MEETING_CONFLICTS_CHECK", environ_prefix=None
+    )
+    MEETING_OCCURRENCES_CACHE_ALIAS = values.Value(
+        "default",
+        environ_name="MAGNIFY_MEETING_OCCURRENCES_CACHE_ALIAS",
+        environ_prefix=None,
+    )
+    MEETING_OCCURRENCES_CACHE_TIMEOUT = values.PositiveIntegerValue(
+        3600,
+        environ_name="MAGNIFY_MEETING_OCCURRENCES_CACHE_TIMEOUT",
+        environ_prefix=None,
+    )
+    MEETING_OCCURRENCES_CACHE_SIZE = values.PositiveIntegerValue(
+        1000,
+        environ_name="MAGNIFY_MEETING_OCCURRENCES_CACHE_SIZE",
+        environ_prefix=None,
+    )
+    API_PAGINATION = values.Value(
+        "page", environ_name="MAGNIFY_API_PAGINATION", environ_prefix=None
+    )
 
     # Database
     DATABASES = {
@@ -201,6 +244,21 @@ class Base(MagnifyCoreConfigurationMixin, Configuration):
         "USER_ID_CLAIM": "sub",
         "AUTH_TOKEN_CLASSES": ("magnify.apps.core.tokens.BearerToken",),
     }
+    JWT_JWKS_CACHE_TTL = values.PositiveIntegerValue(
+        300, environ_name="MAGNIFY_JWT_JWKS_CACHE_TTL", environ_prefix=None
+    )
+    JWT_JWKS_STALE_TTL = values.PositiveIntegerValue(
+        3600, environ_name="MAGNIFY_JWT_JWKS_STALE_TTL", environ_prefix=None
+    )
+    JWT_JWKS_MIN_REFRESH_INTERVAL = values.PositiveIntegerValue(
+        10, environ_name="MAGNIFY_JWT_JWKS_MIN_REFRESH_INTERVAL", environ_prefix=None
+    )
+    JWT_JWKS_TIMEOUT = values.FloatValue(
+        5, environ_name="MAGNIFY_JWT_JWKS_TIMEOUT", environ_prefix=None
+    )
+    JWT_VALIDATED_TOKENS_CACHE_SIZE = values.PositiveIntegerValue(
+        0, environ_name="MAGNIFY_JWT_VALIDATED_TOKENS_CACHE_SIZE", environ_prefix=None
+    )
     JWT_USER_FIELDS_SYNC = values.DictValue(
         {
             "email": "email",
@@ -215,6 +273,16 @@ class Base(MagnifyCoreConfigurationMixin, Configuration):
         environ_name="MAGNIFY_JWT_USER_DEVICE_AUDIENCES",
         environ_prefix=None,
     )
+    JWT_USER_SYNC_CACHE_ALIAS = values.Value(
+        "default",
+        environ_name="MAGNIFY_JWT_USER_SYNC_CACHE_ALIAS",
+        environ_prefix=None,
+    )
+    JWT_USER_SYNC_CACHE_TIMEOUT = values.PositiveIntegerValue(
+        300,
+        environ_name="MAGNIFY_JWT_USER_SYNC_CACHE_TIMEOUT",
+        environ_prefix=None,
+    )
 
     USERNAME_REGEX = values.Value(
         r"^[a-z0-9_.-]+$",
@@ -271,6 +339,7 @@ class Base(MagnifyCoreConfigurationMixin, Configuration):
         "django.middleware.clickjacking.XFrameOptionsMiddleware",
         "corsheaders.middleware.CorsMiddleware",
         "dockerflow.django.middleware.DockerflowMiddleware",
+        "magnify.apps.core.middleware.RolesMemoMiddleware",
     )
 
     # Swagger
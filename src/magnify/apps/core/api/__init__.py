@@ -3,10 +3,16 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 
 from rest_framework import exceptions as drf_exceptions
+from rest_framework import permissions
 from rest_framework import views as drf_views
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 
+from ..authentication import user_sync_stats, validated_tokens_cache
+from ..cache import occurrences_cache
+from ..jwks import jwks_cache
+from ..tokens import jitsi_tokens_cache
+from .calendars import get_user_calendar
 from .groups import GroupViewSet
 from .meetings import MeetingAccessViewSet, MeetingViewSet
 from .rooms import ResourceAccessViewSet, RoomViewSet
@@ -20,6 +26,7 @@ __all__ = [
     "RoomViewSet",
     "ResourceAccessViewSet",
     "UserViewSet",
+    "get_user_calendar",
 ]
 
 
@@ -53,3 +60,22 @@ def get_frontend_configuration(request):
     }
     frontend_configuration.update(settings.FRONTEND_CONFIGURATION)
     return Response(frontend_configuration)
+
+
+# pylint: disable=unused-argument
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def get_cache_stats(request):
+    """
+    Returns the counters of the caches of the process that handles the request, to help
+    sizing them. Each process keeps its own counters since it was started.
+    """
+    return Response(
+        {
+            "occurrences": occurrences_cache.get_stats(),
+            "jitsi_tokens": jitsi_tokens_cache.get_stats(),
+            "validated_tokens": validated_tokens_cache.get_stats(),
+            "jwks": jwks_cache.get_stats(),
+            "user_sync": user_sync_stats.get_stats(),
+        }
+    )
@@ -0,0 +1,32 @@
+"""Magnify iCalendar feeds endpoints"""
+from django.http import Http404, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.views.decorators.http import require_GET
+
+from .. import ical
+
+
+@require_GET
+def get_user_calendar(request, token):
+    """
+    Stream the iCalendar feed of the meetings of the user identified by the signed token
+    passed in the url, as calendar clients can't authenticate with a bearer token.
+
+    The fields of meetings are fingerprinted by a first query, so that clients polling an
+    unchanged feed get a 304 response without it being built. Otherwise, the feed is built
+    while streaming meetings from the database.
+    """
+    user_id = ical.get_calendar_user_id(token)
+    if user_id is None:
+        raise Http404()
+
+    meetings = ical.get_calendar_meetings(user_id)
+    etag = quote_etag(ical.get_calendar_etag(meetings))
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = StreamingHttpResponse(
+            ical.iter_calendar(meetings),
+            content_type="text/calendar; charset=utf-8",
+        )
+    response["ETag"] = etag
+    return response
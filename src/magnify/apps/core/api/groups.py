@@ -21,6 +21,19 @@ class GroupViewSet(
     queryset = models.Group.objects.all()
     serializer_class = serializers.GroupSerializer
 
+    def get_queryset(self):
+        """Prefetch the administrators and members of groups when they are requested."""
+        queryset = super().get_queryset()
+        if self.action in ["list", "retrieve"]:
+            queryset = queryset.prefetch_related(
+                *(
+                    name
+                    for name in ["administrators", "members"]
+                    if self.serializer_class.is_field_requested(self.request, name)
+                )
+            )
+        return queryset
+
     def list(self, request, *args, **kwargs):
         """Limit listed groups to the ones in which the authenticated user is administator."""
         queryset = self.filter_queryset(self.get_queryset())
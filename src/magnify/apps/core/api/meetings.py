@@ -1,12 +1,15 @@
 """Magnify meetings API endpoints"""
-from django.db.models import Q
+from django.conf import settings
+from django.db import transaction
 
-from rest_framework import mixins, response, viewsets
+from rest_framework import decorators, mixins, response, viewsets
 from rest_framework.exceptions import PermissionDenied
 
 from .. import forms, models
 from .. import permissions as magnify_permissions
 from .. import serializers as magnify_serializers
+from .. import utils
+from ..cache import occurrences_cache
 
 
 class MeetingViewSet(
@@ -24,117 +27,92 @@ class MeetingViewSet(
     queryset = models.Meeting.objects.all()
     serializer_class = magnify_serializers.MeetingSerializer
 
+    def get_queryset(self):
+        """
+        Annotate meetings with whether the authenticated user is a guest and prefetch their
+        accesses so that the serializer does not query them for each meeting, unless guests
+        were not requested.
+        """
+        queryset = super().get_queryset()
+        if self.action not in ["list", "retrieve"]:
+            return queryset
+
+        user = self.request.user
+        if self.serializer_class.is_field_requested(self.request, "guests"):
+            queryset = queryset.annotate_user_is_guest(user)
+            if user.is_authenticated:
+                queryset = queryset.prefetch_accesses()
+        return queryset
+
     def get_permissions(self):
         """User only needs to be authenticated to list rooms access"""
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "token"]:
             return super().get_permissions()
 
         return [magnify_permissions.IsOwner()]
 
     def list(self, request, *args, **kwargs):
-        """Limit listed meetings to the ones related to the authenticated user."""
-        user = self.request.user
-        queryset = self.filter_queryset(self.get_queryset())
-
+        """Limit listed meetings to the ones occurring in the time range requested."""
         # Instantiate the form to allow validation/cleaning
         filter_form = forms.MeetingFilterForm(data=self.request.query_params)
+        if not filter_form.is_valid():
+            return response.Response(status=400, data={"errors": filter_form.errors})
 
-        # Filter meetings by time range fo list requests
-        if self.action == "list":
-            if not filter_form.is_valid():
-                return response.Response(
-                    status=400, data={"errors": filter_form.errors}
-                )
-
-            filter_from = filter_form.cleaned_data["from"]
-            filter_to = filter_form.cleaned_data["to"]
-            queryset = queryset.filter(
-                Q(
-                    recurrence__isnull=True,
-                    end__gte=filter_from,
-                    start__lte=filter_to,
-                )
-                | (
-                    Q(recurrence__isnull=False, start__lte=filter_to)
-                    & (
-                        Q(recurring_until__gte=filter_from)
-                        | Q(recurring_until__isnull=True)
-                    )
-                )
-            )
+        filter_from = filter_form.cleaned_data["from"]
+        filter_to = filter_form.cleaned_data["to"]
+        queryset = self.filter_queryset(self.get_queryset()).occurring_between(
+            filter_from, filter_to
+        )
 
-        user = self.request.user
-        if user.is_authenticated:
-            retrieve_clause = (
-                Q(owner=user)
-                | Q(users=user)
-                | Q(groups__members=user)
-                | Q(groups__administrators=user)
+        page = self.paginate_queryset(queryset)
+        meetings = queryset if page is None else page
+
+        # Expand the occurrences of all listed meetings in one pass
+        context = self.get_serializer_context()
+        context["period"] = (filter_from, filter_to)
+        if self.serializer_class.is_field_requested(request, "occurrences"):
+            context["occurrences"] = occurrences_cache.get_many(
+                meetings, filter_from, filter_to
             )
-            if self.action != "list":
-                retrieve_clause |= Q(is_public=True)
-            queryset = queryset.filter(retrieve_clause).distinct()
 
-        elif self.action == "retrieve":
-            queryset = queryset.filter(is_public=True)
-
-        else:
-            queryset = queryset.none()
-
-        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(meetings, many=True, context=context)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(queryset, many=True)
         return response.Response(serializer.data)
 
     def filter_queryset(self, queryset):
-        """Limit listed meetings to the ones related to the authenticated user."""
-        # Instantiate the form to allow validation/cleaning
-        filter_form = forms.MeetingFilterForm(data=self.request.query_params)
-
-        # Filter meetings by time range fo list requests
-        if self.action == "list":
-            if not filter_form.is_valid():
-                return response.Response(
-                    status=400, data={"errors": filter_form.errors}
-                )
-
-            filter_from = filter_form.cleaned_data["from"]
-            filter_to = filter_form.cleaned_data["to"]
-            queryset = queryset.filter(
-                Q(
-                    recurrence__isnull=True,
-                    end__gte=filter_from,
-                    start__lte=filter_to,
-                )
-                | (
-                    Q(recurrence__isnull=False, start__lte=filter_to)
-                    & (
-                        Q(recurring_until__gte=filter_from)
-                        | Q(recurring_until__isnull=True)
-                    )
-                )
-            )
-
+        """Limit meetings to the ones related to the authenticated user."""
         user = self.request.user
         if user.is_authenticated:
-            retrieve_clause = (
-                Q(owner=user)
-                | Q(users=user)
-                | Q(groups__members=user)
-                | Q(groups__administrators=user)
-            )
-            if self.action != "list":
-                retrieve_clause |= Q(is_public=True)
-            return queryset.filter(retrieve_clause).distinct()
+            return queryset.accessible_to(user, include_public=self.action != "list")
 
-        if self.action == "retrieve":
+        if self.action in ["retrieve", "token"]:
             return queryset.filter(is_public=True)
 
         return queryset.none()
 
+    @decorators.action(
+        methods=["get"],
+        detail=True,
+        url_path="token",
+    )
+    # pylint: disable=invalid-name, unused-argument
+    def token(self, request, pk=None):
+        """
+        Endpoint to get a Jitsi token for the meeting, given to users who can retrieve it.
+        """
+        meeting = self.get_object()
+        return response.Response(
+            {
+                "meeting": meeting.jitsi_name,
+                "token": utils.generate_token(
+                    request.user,
+                    meeting.jitsi_name,
+                    is_admin=request.user.pk == meeting.owner_id,
+                ),
+            }
+        )
+
     def perform_create(self, serializer):
         """
         Set the current user as owner of the newly created meeting.
@@ -146,7 +124,24 @@ class MeetingViewSet(
             serializer.validated_data.get("timezone") or user.timezone
         )
 
-        return super().perform_create(serializer)
+        with transaction.atomic():
+            super().perform_create(serializer)
+            self.check_conflicts(serializer.instance)
+
+    def perform_update(self, serializer):
+        """Refuse updating a meeting in conflict with other meetings of its room."""
+        with transaction.atomic():
+            super().perform_update(serializer)
+            self.check_conflicts(serializer.instance)
+
+    def check_conflicts(self, meeting):
+        """
+        Check the conflicts of a saved meeting with the other meetings of its room if it is
+        activated, reporting the ones the authenticated user can see. The save is rolled back
+        if there are conflicts.
+        """
+        if settings.MEETING_CONFLICTS_CHECK and meeting.room_id:
+            meeting.check_conflicts(self.request.user)
 
 
 class MeetingAccessViewSet(
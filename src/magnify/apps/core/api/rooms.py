@@ -2,18 +2,20 @@
 import uuid
 
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import F, Max, Prefetch
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.utils.text import slugify
+from django.utils.translation import gettext_lazy as _
 
 from rest_framework import decorators as drf_decorators
 from rest_framework import mixins, permissions, response, viewsets
 from rest_framework.exceptions import PermissionDenied
 
-from .. import forms, models
+from .. import authorization, forms, models
 from .. import permissions as magnify_permissions
 from .. import serializers, utils
+from ..cache import occurrences_cache
 
 
 class RoomViewSet(
@@ -30,6 +32,35 @@ class RoomViewSet(
     queryset = models.Room.objects.all()
     serializer_class = serializers.RoomSerializer
 
+    def get_queryset(self):
+        """
+        Annotate rooms with the role of the authenticated user and prefetch their accesses
+        so that the serializer does not query them for each room, unless the fields requested
+        do not need them.
+        """
+        queryset = super().get_queryset()
+        if self.action == "token":
+            return queryset.annotate_user_role(self.request.user)
+
+        if self.action not in ["list", "retrieve"]:
+            return queryset
+
+        user = self.request.user
+        if self.serializer_class.is_role_requested(self.request):
+            queryset = queryset.annotate_user_role(user)
+        if user.is_authenticated and self.serializer_class.is_field_requested(
+            self.request, "accesses"
+        ):
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "accesses",
+                    queryset=models.ResourceAccess.objects.select_related(
+                        "user", "group"
+                    ),
+                )
+            )
+        return queryset
+
     def get_object(self):
         """Allow getting a room by its slug."""
         try:
@@ -55,31 +86,62 @@ class RoomViewSet(
             if not settings.ALLOW_UNREGISTERED_ROOMS:
                 raise
             slug = slugify(self.kwargs["pk"])
-            data = {
-                "id": None,
-                "jitsi": {
-                    "room": slug,
-                    "token": utils.generate_token(request.user, slug, is_admin=True),
-                },
-            }
+            data = {"id": None, "jitsi": {"room": slug}}
+            if settings.JITSI_TOKEN_IN_PAYLOADS:
+                data["jitsi"]["token"] = utils.generate_token(
+                    request.user, slug, is_admin=True
+                )
         else:
             data = self.get_serializer(instance).data
 
         return response.Response(data)
 
+    @drf_decorators.action(
+        methods=["get"],
+        detail=True,
+        url_path="token",
+    )
+    # pylint: disable=invalid-name, unused-argument
+    def token(self, request, pk=None):
+        """
+        Endpoint to get a Jitsi token for the room, given to users related to the room or to
+        anybody if it is public or if it is not registered and unregistered rooms are allowed.
+        """
+        try:
+            room = self.get_object()
+        except Http404:
+            if not settings.ALLOW_UNREGISTERED_ROOMS:
+                raise
+            slug = slugify(self.kwargs["pk"])
+            return response.Response(
+                {
+                    "room": slug,
+                    "token": utils.generate_token(request.user, slug, is_admin=True),
+                }
+            )
+
+        if room.user_role is None and not room.is_public:
+            self.permission_denied(
+                request, message=_("You must be related to this room to join it.")
+            )
+
+        is_admin = models.RoleChoices.check_administrator_role(room.user_role)
+        return response.Response(
+            {
+                "room": room.jitsi_name,
+                "token": utils.generate_token(
+                    request.user, room.jitsi_name, is_admin=is_admin
+                ),
+            }
+        )
+
     def list(self, request, *args, **kwargs):
         """Limit listed rooms to the ones related to the authenticated user."""
         user = self.request.user
 
         if user.is_authenticated:
-            queryset = (
-                self.filter_queryset(self.get_queryset())
-                .filter(
-                    Q(users=user)
-                    | Q(groups__members=user)
-                    | Q(groups__administrators=user)
-                )
-                .distinct()
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                effective_accesses__user=user
             )
         else:
             queryset = self.get_queryset().none()
@@ -101,12 +163,25 @@ class RoomViewSet(
             role=models.RoleChoices.OWNER,
         )
 
+    def get_room_meetings(self, room, filter_from, filter_to):
+        """
+        Returns the meetings of a room occurring in a time range and to which the user
+        is related, or which are public.
+        """
+        meetings_query = room.meetings.occurring_between(filter_from, filter_to)
+
+        # Filter meetings to which the authenticated user is related
+        user = self.request.user
+        if user.is_authenticated:
+            return meetings_query.accessible_to(user, include_public=True)
+        return meetings_query.filter(is_public=True)
+
     @drf_decorators.action(
         methods=["get"],
         detail=True,
         url_path="meetings",
     )
-    # pylint: disable=invalid-name, unused-argument, too-many-locals
+    # pylint: disable=invalid-name, unused-argument
     def meetings(self, request, pk=None):
         """Endpoint to retrieve meetings related to the room."""
         room = self.get_object()
@@ -121,37 +196,75 @@ class RoomViewSet(
         # Filter meetings by time range
         filter_from = filter_form.cleaned_data["from"]
         filter_to = filter_form.cleaned_data["to"]
-        meetings_query = room.meetings.filter(
-            Q(
-                recurrence__isnull=True,
-                end__gte=filter_from,
-                start__lte=filter_to,
-            )
-            | (
-                Q(recurrence__isnull=False, start__lte=filter_to)
-                & (
-                    Q(recurring_until__gte=filter_from)
-                    | Q(recurring_until__isnull=True)
-                )
+        meetings_query = self.get_room_meetings(room, filter_from, filter_to)
+        context = {"request": request, "period": (filter_from, filter_to)}
+        if serializers.MeetingSerializer.is_field_requested(request, "guests"):
+            meetings_query = meetings_query.annotate_user_is_guest(request.user)
+            if request.user.is_authenticated:
+                meetings_query = meetings_query.prefetch_accesses()
+        if serializers.MeetingSerializer.is_field_requested(request, "occurrences"):
+            context["occurrences"] = occurrences_cache.get_many(
+                meetings_query, filter_from, filter_to
             )
+
+        serializer = serializers.MeetingSerializer(
+            meetings_query, context=context, many=True
         )
+        return response.Response(serializer.data, status=200)
 
-        # Filter meetings to which the authenticated user is related
-        user = request.user
-        access_clause = Q(is_public=True)
-        if user.is_authenticated:
-            access_clause |= (
-                Q(owner=user)
-                | Q(users=user)
-                | Q(groups__members=user)
-                | Q(groups__administrators=user)
+    @drf_decorators.action(
+        methods=["get"],
+        detail=True,
+        url_path="busy",
+    )
+    # pylint: disable=invalid-name, unused-argument
+    def busy(self, request, pk=None):
+        """
+        Endpoint to retrieve the time intervals during which the room is busy, with the
+        occurrences of all its meetings that overlap the period merged into `[start, end]`
+        pairs. Like conflicts, private meetings make the room busy without being disclosed.
+        """
+        room = self.get_object()
+
+        # Instantiate the form to allow validation/cleaning
+        filter_form = forms.MeetingFilterForm(data=request.query_params)
+
+        # Return a 400 with error information if the query params are not valid
+        if not filter_form.is_valid():
+            return response.Response(status=400, data={"errors": filter_form.errors})
+
+        filter_from = filter_form.cleaned_data["from"]
+        filter_to = filter_form.cleaned_data["to"]
+
+        # Occurrences still running at the start of the period started at most the duration
+        # of the longest meeting of the room earlier
+        longest = room.meetings.aggregate(longest=Max(F("end") - F("start")))["longest"]
+        intervals = []
+        if longest is not None:
+            since = filter_from - longest
+            meetings_query = room.meetings.occurring_between(since, filter_to).only(
+                *models.Meeting.RECURRENCE_FIELDS
             )
-        meetings_query = meetings_query.filter(access_clause)
+            occurrences = occurrences_cache.get_many(meetings_query, since, filter_to)
+            for meeting in meetings_query:
+                duration = meeting.end - meeting.start
+                intervals.append(
+                    [
+                        (start, start + duration)
+                        for start in occurrences[meeting.pk]
+                        if start < filter_to and start + duration > filter_from
+                    ]
+                )
 
-        serializer = serializers.MeetingSerializer(
-            meetings_query.distinct(), context={"request": request}, many=True
+        busy = utils.merge_intervals(intervals)
+        return response.Response(
+            {
+                "from": filter_from,
+                "to": filter_to,
+                "busy": [[start, end] for start, end in busy],
+            },
+            status=200,
         )
-        return response.Response(serializer.data, status=200)
 
 
 class ResourceAccessListModelMixin:
@@ -170,16 +283,12 @@ class ResourceAccessListModelMixin:
         """Return the queryset according to the action."""
         queryset = super().get_queryset()
         if self.action == "list":
-            user = self.request.user
             queryset = queryset.filter(
-                Q(resource__accesses__user=user)
-                | Q(resource__accesses__group__members=user)
-                | Q(resource__accesses__group__administrators=user),
-                resource__accesses__role__in=[
-                    models.RoleChoices.ADMIN,
-                    models.RoleChoices.OWNER,
-                ],
-            ).distinct()
+                resource__in=authorization.resource_ids_with_roles(
+                    self.request.user,
+                    [models.RoleChoices.ADMIN, models.RoleChoices.OWNER],
+                )
+            )
         return queryset
 
 
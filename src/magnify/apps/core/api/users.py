@@ -2,13 +2,14 @@
 from django.contrib.auth import authenticate
 from django.core.cache import cache
 from django.db.models import Q
+from django.urls import reverse
 from django.utils.text import slugify
 
 from rest_framework import decorators as drf_decorators
 from rest_framework import exceptions as drf_exceptions
 from rest_framework import mixins, permissions, response, viewsets
 
-from .. import models
+from .. import ical, models
 from .. import permissions as magnify_permissions
 from .. import serializers
 
@@ -91,6 +92,26 @@ class UserViewSet(
         )
         return response.Response(serializer.data, status=200)
 
+    @staticmethod
+    @drf_decorators.action(
+        methods=["get", "post"],
+        detail=False,
+        url_path="me/calendar",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def calendar(request):
+        """
+        Return the url of the iCalendar feed of the logged-in user's meetings. Posting
+        revokes the urls returned so far and returns a new one.
+        """
+        if request.method == "POST":
+            ical.reset_calendar_token(request.user)
+
+        url = reverse(
+            "user-calendar", kwargs={"token": ical.get_calendar_token(request.user)}
+        )
+        return response.Response({"url": request.build_absolute_uri(url)}, status=200)
+
     @staticmethod
     @drf_decorators.action(
         methods=["post"],
@@ -8,3 +8,8 @@ class CoreConfig(AppConfig):
 
     name = "magnify.apps.core"
     verbose_name = _("Magnify's core application")
+
+    def ready(self):
+        """Connect the signal receivers of the app."""
+        # pylint: disable=import-outside-toplevel,unused-import
+        from . import signals  # noqa: F401
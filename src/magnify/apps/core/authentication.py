@@ -1,18 +1,98 @@
 """Authentication for Magnify's core app."""
+import hashlib
+import threading
+import time
+
 from django.conf import settings
+from django.core.cache import caches
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken
 from rest_framework_simplejwt.settings import api_settings
 
+from .lru import LRUCache
+
+
+class UserSyncStats:
+    """
+    Count how the users authenticated by delegated JWT tokens were synchronized, to measure
+    how many requests skipped writing to the database.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.created = self.updated = self.skipped = 0
+
+    def increment(self, name):
+        """Increment the counter passed in argument."""
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get_stats(self):
+        """Returns the counters and the ratio of requests that skipped the write."""
+        with self.lock:
+            total = self.created + self.updated + self.skipped
+            return {
+                "created": self.created,
+                "updated": self.updated,
+                "skipped": self.skipped,
+                "skipped_ratio": self.skipped / total if total else 0,
+            }
+
+    def clear(self):
+        """Reset the counters."""
+        with self.lock:
+            self.created = self.updated = self.skipped = 0
+
+
+user_sync_stats = UserSyncStats()
+
+
+# Tokens validated in the memory of the process, so that the signature of a token is verified
+# once per process instead of on each request
+validated_tokens_cache = LRUCache("JWT_VALIDATED_TOKENS_CACHE_SIZE")
+
 
 class DelegatedJWTAuthentication(JWTAuthentication):
     """Override JWTAuthentication to create missing users on the fly."""
 
+    def get_validated_token(self, raw_token):
+        """
+        Validate a raw token like Simple JWT does, or hand back the token validated earlier
+        when validated tokens are cached.
+        """
+        if not settings.JWT_VALIDATED_TOKENS_CACHE_SIZE:
+            return super().get_validated_token(raw_token)
+
+        # Tokens are cached under a digest, not keeping the raw tokens in memory
+        cache_key = hashlib.sha256(raw_token).digest()
+        validated_token = validated_tokens_cache.get(cache_key, deadline=time.time())
+        if validated_token is None:
+            validated_token = super().get_validated_token(raw_token)
+            expires_at = validated_token.get("exp")
+            if expires_at is not None:
+                validated_tokens_cache.set(cache_key, validated_token, expires_at)
+        return validated_token
+
+    @staticmethod
+    def get_sync_key(user_id):
+        """Returns the key under which the synced claims of a user are cached."""
+        return f"jwt-user-sync:{user_id!s}"
+
+    @staticmethod
+    def get_sync_fingerprint(defaults):
+        """Returns a hash of the values synchronized from the claims of a token."""
+        return hashlib.sha256(repr(sorted(defaults.items())).encode()).hexdigest()
+
     def get_user(self, validated_token):
         """
         Return the user related to the given validated token, creating it if necessary.
+
+        Users synchronized recently from the same claims are only read from the database by
+        their primary key, the short lived cache remembering that their claims were already
+        synchronized. Otherwise, the user is only written when it is missing or when the
+        values synchronized from the token differ from the values of the user in database.
         """
         try:
             user_id = validated_token[api_settings.USER_ID_CLAIM]
@@ -31,11 +111,38 @@ class DelegatedJWTAuthentication(JWTAuthentication):
         is_device = validated_token.get("aud") in getattr(
             settings, "JWT_USER_DEVICE_AUDIENCES", []
         )
-
-        # Update or create the user
         defaults.update({"password": "!", "is_active": True, "is_device": is_device})
-        user, _created = self.user_model.objects.update_or_create(
-            **{api_settings.USER_ID_FIELD: user_id}, defaults=defaults
-        )
 
+        sync_cache = caches[settings.JWT_USER_SYNC_CACHE_ALIAS]
+        sync_key = self.get_sync_key(user_id)
+        fingerprint = self.get_sync_fingerprint(defaults)
+        timeout = settings.JWT_USER_SYNC_CACHE_TIMEOUT
+
+        if timeout:
+            synced = sync_cache.get(sync_key)
+            if synced is not None and synced[0] == fingerprint:
+                try:
+                    user = self.user_model.objects.get(pk=synced[1])
+                except self.user_model.DoesNotExist:
+                    pass
+                else:
+                    user_sync_stats.increment("skipped")
+                    return user
+
+        user = self.user_model.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).first()
+        if user is not None and all(
+            getattr(user, field) == value for field, value in defaults.items()
+        ):
+            user_sync_stats.increment("skipped")
+        else:
+            # Update or create the user
+            user, created = self.user_model.objects.update_or_create(
+                **{api_settings.USER_ID_FIELD: user_id}, defaults=defaults
+            )
+            user_sync_stats.increment("created" if created else "updated")
+
+        if timeout:
+            sync_cache.set(sync_key, (fingerprint, user.pk), timeout)
         return user
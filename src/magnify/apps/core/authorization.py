@@ -0,0 +1,91 @@
+"""
+Authorization service resolving the roles of users on resources.
+
+Roles are read from effective accesses, in which the direct and group derived accesses of
+users are denormalized with the highest of their roles (owner > administrator > member), so
+that the roles of a user on any number of resources are resolved in a single query. Roles
+looked up while processing a request are memoized for the rest of the request.
+"""
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.apps import apps
+
+# Roles looked up during the current request by (resource id, user id), or None outside
+# of a request so that roles are always read from the database
+roles_memo = ContextVar("roles_memo", default=None)
+
+
+@contextmanager
+def memoize_roles():
+    """Share the roles looked up within the block, e.g. while processing a request."""
+    token = roles_memo.set({})
+    try:
+        yield
+    finally:
+        roles_memo.reset(token)
+
+
+def clear_roles_memo():
+    """Forget the roles looked up so far, e.g. after accesses to resources changed."""
+    memo = roles_memo.get()
+    if memo is not None:
+        memo.clear()
+
+
+def get_effective_accesses():
+    """Returns the manager of effective accesses, not importing models in this module."""
+    return apps.get_model("core", "EffectiveResourceAccess").objects
+
+
+def roles_for(user, resource_ids):
+    """
+    Returns the role of a user on each of the resources passed in argument by id, or None
+    when the user has no role on a resource. Roles that were not memoized yet are looked up
+    in one query.
+    """
+    roles = dict.fromkeys(
+        resource_id
+        if isinstance(resource_id, uuid.UUID)
+        else uuid.UUID(str(resource_id))
+        for resource_id in resource_ids
+    )
+    if not roles or not user or not user.is_authenticated:
+        return roles
+
+    memo = roles_memo.get()
+    if memo is None:
+        memo = {}
+
+    missing_ids = [
+        resource_id for resource_id in roles if (resource_id, user.pk) not in memo
+    ]
+    if missing_ids:
+        found_roles = dict(
+            get_effective_accesses()
+            .filter(user=user, resource_id__in=missing_ids)
+            .values_list("resource_id", "role")
+        )
+        for resource_id in missing_ids:
+            memo[resource_id, user.pk] = found_roles.get(resource_id)
+
+    for resource_id in roles:
+        roles[resource_id] = memo[resource_id, user.pk]
+    return roles
+
+
+def role_for(user, resource_id):
+    """Returns the role of a user on the resource passed in argument by id, or None."""
+    return next(iter(roles_for(user, [resource_id]).values()))
+
+
+def resource_ids_with_roles(user, roles):
+    """
+    Returns a queryset of the ids of the resources on which a user has one of the roles
+    passed in argument, to filter querysets without listing resources beforehand.
+    """
+    queryset = get_effective_accesses().values("resource_id")
+    if not user or not user.is_authenticated:
+        return queryset.none()
+    return queryset.filter(user=user, role__in=roles)
@@ -0,0 +1,136 @@
+"""
+Cache of the occurrences of recurring meetings
+"""
+import hashlib
+import threading
+from collections import defaultdict
+from datetime import timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .lru import LRUCache
+from .recurrence import expand_occurrences
+
+
+class OccurrencesCache:
+    """
+    Cache the occurrences of recurring meetings in two tiers: a local LRU cache in the memory
+    of the process in front of the Django cache configured for occurrences and shared by all
+    processes.
+
+    Occurrences are cached for the period passed in argument extended to whole days (UTC), so
+    that the same entry serves all clients polling a meeting for the same days, and filtered
+    when they are returned. Keys hold a fingerprint of the recurrence of the meeting so that
+    an entry can not be read anymore as soon as the recurrence changes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = LRUCache("MEETING_OCCURRENCES_CACHE_SIZE")
+        self.local_keys = defaultdict(set)
+        self.shared_hits = self.misses = 0
+
+    @staticmethod
+    def get_key(meeting, start, end):
+        """Returns the key of the occurrences of a meeting for a period of whole days."""
+        fingerprint = hashlib.sha256(
+            repr(meeting.get_recurrence()).encode()
+        ).hexdigest()
+        return f"occurrences:{meeting.pk!s}:{fingerprint[:16]:s}:{start:%Y%m%d}:{end:%Y%m%d}"
+
+    def get_stats(self):
+        """Returns the counters of the cache to help sizing it."""
+        local_stats = self.local.get_stats()
+        with self.lock:
+            return {
+                "local_hits": local_stats["hits"],
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "local_size": local_stats["size"],
+                "local_max_size": local_stats["max_size"],
+            }
+
+    def get_occurrences(self, meeting, start, end):
+        """Returns the occurrences of a meeting between the start and end dates."""
+        return self.get_many([meeting], start, end)[meeting.pk]
+
+    def get_many(self, meetings, start, end):
+        """
+        Returns the occurrences of all the meetings passed in argument between the start and
+        end dates, in a dictionary indexed by meeting id. Occurrences missing from both tiers
+        are expanded at once and cached.
+        """
+        day_start = start.astimezone(ZoneInfo("UTC")).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        day_end = end.astimezone(ZoneInfo("UTC")).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) + timedelta(days=1, microseconds=-1)
+
+        results = {}
+        missing = {}
+        for meeting in meetings:
+            # Occurrences of a meeting without recurrence are not worth caching
+            if not meeting.recurrence:
+                results[meeting.pk] = meeting.get_occurrences(start, end)
+                continue
+
+            key = self.get_key(meeting, day_start, day_end)
+            dates = self.local.get(key)
+            if dates is None:
+                missing[key] = meeting
+                continue
+            results[meeting.pk] = [date for date in dates if start <= date <= end]
+
+        timeout = settings.MEETING_OCCURRENCES_CACHE_TIMEOUT
+        shared_cache = caches[settings.MEETING_OCCURRENCES_CACHE_ALIAS]
+        if missing and timeout:
+            for key, dates in shared_cache.get_many(list(missing)).items():
+                meeting = missing.pop(key)
+                self.set_local(meeting, key, dates)
+                with self.lock:
+                    self.shared_hits += 1
+                results[meeting.pk] = [date for date in dates if start <= date <= end]
+
+        if missing:
+            expanded = expand_occurrences(missing.values(), day_start, day_end)
+            if timeout:
+                shared_cache.set_many(
+                    {key: expanded[meeting.pk] for key, meeting in missing.items()},
+                    timeout,
+                )
+            for key, meeting in missing.items():
+                dates = expanded[meeting.pk]
+                self.set_local(meeting, key, dates)
+                results[meeting.pk] = [date for date in dates if start <= date <= end]
+            with self.lock:
+                self.misses += len(missing)
+
+        return results
+
+    def set_local(self, meeting, key, dates):
+        """Store occurrences in the local tier and evict the least recently used ones."""
+        if not self.local.get_max_size():
+            return
+
+        with self.lock:
+            self.local_keys[str(meeting.pk)].add(key)
+            for evicted_key in self.local.set(key, dates):
+                meeting_id = evicted_key.split(":")[1]
+                self.local_keys[meeting_id].discard(evicted_key)
+                if not self.local_keys[meeting_id]:
+                    del self.local_keys[meeting_id]
+
+    def invalidate(self, meeting):
+        """
+        Drop the occurrences of a meeting from the local tier. Entries of the shared tier can
+        not be read anymore if the recurrence changed, and are left to expire.
+        """
+        with self.lock:
+            for key in self.local_keys.pop(str(meeting.pk), ()):
+                self.local.delete(key)
+
+
+occurrences_cache = OccurrencesCache()
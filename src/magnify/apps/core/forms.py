@@ -15,3 +15,10 @@ class MeetingFilterForm(forms.Form):
         """
         super().__init__(*args, **kwargs)
         self.fields["from"] = forms.DateTimeField(required=True)
+
+
+class MeetingNextOccurrencesForm(forms.Form):
+    """Validate the query string params in a request for the next occurrences of a meeting."""
+
+    after = forms.DateTimeField(required=False)
+    next = forms.IntegerField(min_value=1, max_value=100)
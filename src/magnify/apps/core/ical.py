@@ -0,0 +1,289 @@
+"""
+iCalendar feeds of the meetings of users
+"""
+import hashlib
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from django.core import signing
+from django.db.models import Max, Min
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from .models import Meeting, User
+from .recurrence import MONTHS, WEEKS
+from .utils import get_day_after_months, get_nth_week_number
+
+CALENDAR_TOKEN_SALT = "magnify.calendar"  # nosec
+UTC = ZoneInfo("UTC")
+
+ICAL_WEEKDAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+ICAL_FREQUENCIES = {
+    Meeting.DAILY: "DAILY",
+    Meeting.WEEKLY: "WEEKLY",
+    Meeting.MONTHLY: "MONTHLY",
+    Meeting.YEARLY: "YEARLY",
+}
+ICAL_FIELDS = ("id", "name", *Meeting.RECURRENCE_FIELDS, "occurrences_until")
+# Number of meetings fetched at once while fingerprinting or streaming a calendar
+ICAL_CHUNK_SIZE = 500
+ICAL_DATETIME_FORMAT = "%Y%m%dT%H%M%S"
+# Number of months after which the day of monthly recurrences is surely not clipped anymore
+MAX_CLIPPED_MONTHS = 400 * 12
+
+
+def get_calendar_token(user):
+    """
+    Returns the token signed to give access to the calendar of a user without login. Tokens
+    are revoked when the calendar key of the user is reset.
+    """
+    return signing.dumps([str(user.id), user.calendar_key], salt=CALENDAR_TOKEN_SALT)
+
+
+def reset_calendar_token(user):
+    """Revoke the tokens giving access to the calendar of a user."""
+    user.calendar_key = get_random_string(32)
+    user.save(update_fields=["calendar_key"])
+
+
+def get_calendar_user_id(token):
+    """Returns the id of the user whose calendar a token gives access to or None."""
+    try:
+        user_id, calendar_key = signing.loads(token, salt=CALENDAR_TOKEN_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+
+    if not User.objects.filter(pk=user_id, calendar_key=calendar_key).exists():
+        return None
+    return user_id
+
+
+def get_calendar_meetings(user_id):
+    """Returns the queryset of the meetings displayed in the calendar of a user."""
+    return Meeting.objects.accessible_to(user_id).order_by("id")
+
+
+def get_calendar_etag(meetings):
+    """
+    Returns a fingerprint of the fields from which the events of the meetings displayed in a
+    calendar are built, streamed from the database without building the calendar nor loading
+    the meetings.
+    """
+    fingerprint = hashlib.sha256()
+    for values in meetings.values_list(*ICAL_FIELDS).iterator(
+        chunk_size=ICAL_CHUNK_SIZE
+    ):
+        fingerprint.update(repr(values).encode())
+    return fingerprint.hexdigest()
+
+
+def get_calendar_timezones(meetings):
+    """
+    Returns the timezones of the meetings displayed in a calendar, each with the period in
+    which local times are expressed in it, aggregated in database.
+    """
+    return (
+        meetings.order_by("timezone")
+        .values("timezone")
+        .annotate(
+            since=Min("start"),
+            until=Max(Coalesce("recurring_until", "occurrences_until", "end")),
+        )
+    )
+
+
+def escape_text(value):
+    """Escape a text value as required by RFC 5545."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line):
+    """Fold a content line in lines of at most 75 octets as required by RFC 5545."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return f"{line:s}\r\n"
+
+    parts = []
+    start, limit = 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Do not split a multi-byte character
+        while end < len(encoded) and encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start, limit = end, 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_offset(offset):
+    """Format a UTC offset as required by RFC 5545, e.g. +0100."""
+    seconds = int(offset.total_seconds())
+    sign = "-" if seconds < 0 else "+"
+    hours, seconds = divmod(abs(seconds), 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{sign:s}{hours:02d}{minutes:02d}" + (f"{seconds:02d}" if seconds else "")
+
+
+def iter_transitions(tzinfo, since, until):
+    """
+    Yields the timestamps at which the UTC offset of a timezone changes between the dates
+    passed in argument, found by comparing offsets from one day to the next and bisecting
+    the day of each change to the second.
+    """
+
+    def get_offset(timestamp):
+        return datetime.fromtimestamp(timestamp, tzinfo).utcoffset()
+
+    low, end = int(since.timestamp()), int(until.timestamp())
+    offset = get_offset(low)
+    while low < end:
+        high = low + 86400
+        if get_offset(high) == offset:
+            low = high
+            continue
+        while high - low > 1:
+            middle = (low + high) // 2
+            if get_offset(middle) == offset:
+                low = middle
+            else:
+                high = middle
+        yield high
+        low, offset = high, get_offset(high)
+
+
+def iter_timezone(tzinfo, since, until):
+    """
+    Yields the content lines of the VTIMEZONE describing a timezone between the dates passed
+    in argument, with one observance from the first date and one for each change of offset.
+    After the last date, calendar clients keep the offset of the last observance.
+    """
+
+    def iter_observance(moment, offset_from):
+        local = moment.astimezone(tzinfo)
+        component = "DAYLIGHT" if local.dst() else "STANDARD"
+        yield f"BEGIN:{component:s}"
+        yield f"DTSTART:{(moment + offset_from).replace(tzinfo=None):{ICAL_DATETIME_FORMAT}}"
+        yield f"TZOFFSETFROM:{format_offset(offset_from):s}"
+        yield f"TZOFFSETTO:{format_offset(local.utcoffset()):s}"
+        if local.tzname():
+            yield f"TZNAME:{local.tzname():s}"
+        yield f"END:{component:s}"
+
+    yield "BEGIN:VTIMEZONE"
+    yield f"TZID:{tzinfo!s}"
+    yield from iter_observance(since, since.astimezone(tzinfo).utcoffset())
+    for timestamp in iter_transitions(tzinfo, since, until):
+        moment = datetime.fromtimestamp(timestamp, UTC)
+        offset_from = datetime.fromtimestamp(timestamp - 1, tzinfo).utcoffset()
+        yield from iter_observance(moment, offset_from)
+    yield "END:VTIMEZONE"
+
+
+def get_rrule(meeting):
+    """
+    Returns the RRULE of a meeting, or None if it is not recurring or if its occurrences, as
+    computed by its recurrence rule, can not be described by an RRULE: monthly recurrences
+    on a nth weekday that must be walked (see `RecurrenceRule.is_walked`) and monthly or
+    yearly recurrences of which the day is clipped to the end of shorter months.
+    """
+    rule = meeting.get_recurrence_rule()
+    start_date = rule.start_local.date()
+    if rule.unit is None or rule.is_walked:
+        return None
+    if (
+        rule.unit == MONTHS
+        and not rule.nth_day
+        and get_day_after_months(start_date, rule.frequency, MAX_CLIPPED_MONTHS)
+        != start_date.day
+    ):
+        return None
+
+    parts = [f"FREQ={ICAL_FREQUENCIES[meeting.recurrence]:s}"]
+    if meeting.frequency and meeting.frequency > 1:
+        parts.append(f"INTERVAL={meeting.frequency:d}")
+    if rule.unit == WEEKS and rule.weekdays_list:
+        parts.append(
+            "BYDAY=" + ",".join(ICAL_WEEKDAYS[day] for day in rule.weekdays_list)
+        )
+    elif rule.nth_day:
+        parts.append(
+            f"BYDAY={get_nth_week_number(start_date):d}"
+            f"{ICAL_WEEKDAYS[start_date.weekday()]:s}"
+        )
+    if meeting.nb_occurrences:
+        parts.append(f"COUNT={meeting.nb_occurrences:d}")
+    return ";".join(parts)
+
+
+def get_rdates(meeting):
+    """
+    Returns the occurrences of a recurring meeting following its start, up to the end of
+    its recurrence or up to its materialized occurrences for infinite recurrences. Unlike
+    the horizon, the materialized occurrences do not move every day, so that the feed of
+    a calendar only changes when they are extended.
+    """
+    until = meeting.recurring_until or meeting.occurrences_until
+    if until is None:
+        return []
+    return [
+        occurrence
+        for occurrence in meeting.get_occurrences(meeting.start, until)
+        if occurrence != meeting.start
+    ]
+
+
+def iter_event(meeting, dtstamp):
+    """Yields the content lines of the VEVENT of a meeting."""
+    tzid = str(meeting.timezone)
+    start_tz = meeting.start.astimezone(meeting.timezone)
+    end_tz = meeting.end.astimezone(meeting.timezone)
+
+    yield "BEGIN:VEVENT"
+    yield f"UID:{meeting.id!s}"
+    yield f"DTSTAMP:{dtstamp:s}"
+    yield f"DTSTART;TZID={tzid:s}:{start_tz:{ICAL_DATETIME_FORMAT}}"
+    yield f"DTEND;TZID={tzid:s}:{end_tz:{ICAL_DATETIME_FORMAT}}"
+    yield f"SUMMARY:{escape_text(meeting.name):s}"
+    rrule = get_rrule(meeting)
+    if rrule:
+        yield f"RRULE:{rrule:s}"
+    elif meeting.recurrence:
+        rdates = get_rdates(meeting)
+        if rdates:
+            yield f"RDATE;TZID={tzid:s}:" + ",".join(
+                f"{rdate.astimezone(meeting.timezone):{ICAL_DATETIME_FORMAT}}"
+                for rdate in rdates
+            )
+    yield "END:VEVENT"
+
+
+def iter_calendar(meetings):
+    """
+    Lazily yields the iCalendar feed of the queryset of meetings passed in argument, with
+    the VTIMEZONE of each timezone in which their local times are expressed, then one VEVENT
+    for each meeting instead of one event per occurrence, streamed from the database.
+
+    Occurrences are described by an RRULE when it yields the same dates as the recurrence
+    rule of the meeting, and listed in an RDATE otherwise, up to the materialized
+    occurrences for infinite recurrences.
+    """
+    now = timezone.now().astimezone(UTC)
+    dtstamp = f"{now:%Y%m%dT%H%M%SZ}"
+
+    yield fold_line("BEGIN:VCALENDAR")
+    yield fold_line("VERSION:2.0")
+    yield fold_line("PRODID:-//Magnify//Meetings//EN")
+    yield fold_line("CALSCALE:GREGORIAN")
+    for period in get_calendar_timezones(meetings):
+        for line in iter_timezone(period["timezone"], period["since"], period["until"]):
+            yield fold_line(line)
+    for meeting in meetings.only(*ICAL_FIELDS).iterator(chunk_size=ICAL_CHUNK_SIZE):
+        for line in iter_event(meeting, dtstamp):
+            yield fold_line(line)
+    yield fold_line("END:VCALENDAR")
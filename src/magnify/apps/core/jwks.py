@@ -0,0 +1,231 @@
+"""
+Cache of the JSON Web Key Set (JWKS) published by the identity provider to verify the
+signature of OIDC tokens.
+"""
+import json
+import logging
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+
+import jwt
+from jwt import PyJWKClientError, PyJWKSet
+from jwt.exceptions import PyJWKError, PyJWKSetError
+from rest_framework_simplejwt import settings as simplejwt_settings
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JWKSState:
+    """Keys of the JWKS cache and the counters of their fetches."""
+
+    keys: dict = None
+    fetched_at: float = None
+    attempted_at: float = None
+    attempts: int = 0
+    fetches: int = 0
+    failures: int = 0
+    is_revalidating: bool = False
+
+
+class JWKSCache:
+    """
+    Cache the signing keys of the JWKS found at the `JWK_URL` of Simple JWT in the memory of
+    the process.
+
+    - keys are fetched again in the background once they are older than their TTL, requests
+      being served with the stale keys meanwhile, until they exceed their stale TTL and are
+      fetched again synchronously,
+    - a key id missing from the cached keys, e.g. after a rotation of keys, triggers fetching
+      keys again synchronously,
+    - fetches are deduplicated: threads waiting for a fetch in progress use its outcome
+      instead of fetching again, and keys are not fetched more than once per minimum refresh
+      interval so that a slow or flapping identity provider or tokens with random key ids do
+      not stall every request.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.fetch_lock = threading.Lock()
+        self.state = JWKSState()
+
+    @staticmethod
+    def get_url():
+        """Returns the url of the JWKS."""
+        return simplejwt_settings.api_settings.JWK_URL
+
+    def clear(self):
+        """Drop the keys and reset the counters."""
+        with self.lock:
+            self.state = JWKSState()
+
+    def get_stats(self):
+        """Returns the counters of the cache and the age of the keys in seconds."""
+        with self.lock:
+            state = self.state
+            return {
+                "fetches": state.fetches,
+                "failures": state.failures,
+                "age": None
+                if state.fetched_at is None
+                else self.clock() - state.fetched_at,
+            }
+
+    def fetch(self):
+        """Returns the signing keys published at the url of the JWKS by key id."""
+        url = self.get_url()
+        try:
+            with urllib.request.urlopen(  # nosec
+                url, timeout=settings.JWT_JWKS_TIMEOUT
+            ) as response:
+                key_set = PyJWKSet.from_dict(json.load(response))
+        except (OSError, ValueError, PyJWKError, PyJWKSetError) as exc:
+            raise PyJWKClientError(
+                f"Fail to fetch data from the url, err: {exc!s}"
+            ) from exc
+        return {
+            key.key_id: key
+            for key in key_set.keys
+            if key.public_key_use in ["sig", None]
+        }
+
+    def refresh(self, attempts):
+        """
+        Fetch the keys, unless another attempt was made since the number of attempts passed
+        in argument was observed or less than the minimum refresh interval ago: only one
+        thread fetches keys at a time and the threads waiting for it use its outcome.
+        """
+        with self.fetch_lock:
+            with self.lock:
+                state = self.state
+                if state.attempts != attempts or (
+                    state.attempted_at is not None
+                    and self.clock() - state.attempted_at
+                    < settings.JWT_JWKS_MIN_REFRESH_INTERVAL
+                ):
+                    return
+                state.attempted_at = self.clock()
+
+            try:
+                keys = self.fetch()
+            except PyJWKClientError:
+                with self.lock:
+                    state.attempts += 1
+                    state.failures += 1
+                raise
+
+            with self.lock:
+                state.keys = keys
+                state.fetched_at = self.clock()
+                state.attempts += 1
+                state.fetches += 1
+
+    def revalidate(self, attempts):
+        """Fetch the keys in a background thread, unless it is already running."""
+        with self.lock:
+            if self.state.is_revalidating:
+                return
+            self.state.is_revalidating = True
+
+        def run():
+            try:
+                self.refresh(attempts)
+            except PyJWKClientError as exc:
+                logger.warning("Stale JWKS could not be revalidated: %s", exc)
+            finally:
+                with self.lock:
+                    self.state.is_revalidating = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def get_signing_key(self, kid):
+        """Returns the signing key matching the key id passed in argument."""
+        now = self.clock()
+        with self.lock:
+            state = self.state
+            keys, fetched_at, attempts = state.keys, state.fetched_at, state.attempts
+
+        ttl = settings.JWT_JWKS_CACHE_TTL
+        max_age = ttl + settings.JWT_JWKS_STALE_TTL
+        if keys is None or now - fetched_at >= max_age or kid not in keys:
+            self.refresh(attempts)
+            with self.lock:
+                keys, fetched_at = self.state.keys, self.state.fetched_at
+        elif now - fetched_at >= ttl:
+            self.revalidate(attempts)
+
+        if keys is None or self.clock() - fetched_at >= max_age:
+            raise PyJWKClientError("The JWKS could not be fetched")
+        try:
+            return keys[kid]
+        except KeyError as exc:
+            raise PyJWKClientError(
+                f'Unable to find a signing key that matches: "{kid!s}"'
+            ) from exc
+
+    def get_signing_key_from_jwt(self, token):
+        """Returns the signing key matching the key id in the header of a token."""
+        return self.get_signing_key(jwt.get_unverified_header(token).get("kid"))
+
+    def warm_up(self):
+        """
+        Fetch the keys before the first request, e.g. when a worker boots. Failures are
+        logged and left to requests to retry.
+        """
+        if not self.get_url():
+            return
+        with self.lock:
+            attempts = self.state.attempts
+        try:
+            self.refresh(attempts)
+        except PyJWKClientError as exc:
+            logger.warning("JWKS could not be fetched to warm up: %s", exc)
+
+
+jwks_cache = JWKSCache()
+
+
+class JWKSCacheTokenBackend(TokenBackend):
+    """Token backend verifying signatures with the keys of the JWKS cache."""
+
+    instance = None
+    instance_settings = None
+
+    def get_verifying_key(self, token):
+        """Returns the key of the JWKS cache matching the key id of the token."""
+        if self.algorithm.startswith("HS"):
+            return self.prepared_signing_key
+
+        try:
+            return jwks_cache.get_signing_key_from_jwt(token).key
+        except PyJWKClientError as exc:
+            raise TokenBackendError(_("Token is invalid")) from exc
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Returns the backend built from the current Simple JWT settings, building it again
+        only when the settings are replaced.
+        """
+        api_settings = simplejwt_settings.api_settings
+        if cls.instance is None or cls.instance_settings is not api_settings:
+            cls.instance = cls(
+                api_settings.ALGORITHM,
+                api_settings.SIGNING_KEY,
+                api_settings.VERIFYING_KEY,
+                api_settings.AUDIENCE,
+                api_settings.ISSUER,
+                None,
+                api_settings.LEEWAY,
+                api_settings.JSON_ENCODER,
+            )
+            cls.instance_settings = api_settings
+        return cls.instance
@@ -0,0 +1,82 @@
+"""
+Bounded LRU cache in the memory of the process, used as local tier by Magnify's caches
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class LRUCache:
+    """
+    Cache values in the memory of the process, evicting the least recently used ones beyond
+    the size set by the setting whose name is passed in argument, and count hits and misses
+    to help sizing it. The cache is disabled when its size is 0.
+
+    Values can be cached until an expiry date, after which they are not handed back anymore.
+    """
+
+    def __init__(self, size_setting):
+        self.size_setting = size_setting
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get_max_size(self):
+        """Returns the maximum number of values, read from settings."""
+        return getattr(settings, self.size_setting)
+
+    def get(self, key, deadline=None):
+        """
+        Returns the value cached under the key passed in argument, or None if it is missing or
+        if it expires before the deadline passed in argument.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if deadline is None or expires_at is None or expires_at > deadline:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.entries[key]
+            self.misses += 1
+        return None
+
+    def set(self, key, value, expires_at=None):
+        """
+        Cache a value under the key passed in argument and returns the keys of the least
+        recently used values evicted to make room for it.
+        """
+        max_size = self.get_max_size()
+        if not max_size:
+            return []
+
+        evicted_keys = []
+        with self.lock:
+            self.entries[key] = (value, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > max_size:
+                evicted_keys.append(self.entries.popitem(last=False)[0])
+        return evicted_keys
+
+    def delete(self, key):
+        """Drop the value cached under the key passed in argument if any."""
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def get_stats(self):
+        """Returns the counters of the cache."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self.entries),
+                "max_size": self.get_max_size(),
+            }
+
+    def clear(self):
+        """Drop all the values and reset the counters."""
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
@@ -0,0 +1,22 @@
+"""Rebuild the effective accesses of users to resources."""
+from django.core.management.base import BaseCommand
+
+from magnify.apps.core.models import EffectiveResourceAccess
+
+
+class Command(BaseCommand):
+    """
+    Recompute the effective accesses of all users to all resources from resource accesses and
+    group memberships.
+
+    Effective accesses are kept in sync by signals so this command is only needed after
+    changes that bypass them, like bulk updates or raw SQL, or to populate them initially.
+    """
+
+    help = __doc__
+
+    def handle(self, *args, **options):
+        """Rebuild all effective accesses."""
+        EffectiveResourceAccess.objects.rebuild()
+        count = EffectiveResourceAccess.objects.count()
+        self.stdout.write(f"{count:d} effective resource access(es) rebuilt.")
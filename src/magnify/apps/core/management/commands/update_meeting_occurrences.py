@@ -0,0 +1,36 @@
+"""Materialize the occurrences of meetings in database up to the horizon."""
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from magnify.apps.core.models import Meeting
+from magnify.apps.core.utils import get_occurrences_horizon
+
+
+class Command(BaseCommand):
+    """
+    Materialize the occurrences of meetings that were never materialized and extend the
+    occurrences of recurrences that go beyond their materialized occurrences up to the horizon.
+
+    This command is meant to be run periodically (e.g. daily) so that the horizon keeps rolling.
+    """
+
+    help = __doc__
+
+    def handle(self, *args, **options):
+        """Extend occurrences of all meetings that are late compared to the horizon."""
+        horizon = get_occurrences_horizon()
+        meetings = Meeting.objects.filter(
+            Q(occurrences_until__isnull=True)
+            | Q(occurrences_until__lt=horizon)
+            & (
+                Q(recurring_until__isnull=True)
+                | Q(recurring_until__gt=F("occurrences_until"))
+            )
+        )
+
+        count = 0
+        for meeting in meetings.iterator():
+            meeting.extend_occurrences(until=horizon)
+            count += 1
+
+        self.stdout.write(f"Occurrences updated for {count:d} meeting(s).")
@@ -0,0 +1,17 @@
+"""Middlewares for Magnify's core app."""
+from .authorization import memoize_roles
+
+
+class RolesMemoMiddleware:
+    """
+    Memoize the roles of users on resources for the duration of each request, so that
+    permissions and serializers checking the role of the same user on the same resource
+    share a single query.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with memoize_roles():
+            return self.get_response(request)
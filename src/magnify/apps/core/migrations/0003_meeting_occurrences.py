@@ -0,0 +1,65 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:25
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0002_alter_user_email"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="meeting",
+            name="occurrences_until",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="Date up to which occurrences are materialized in database.",
+                null=True,
+            ),
+        ),
+        migrations.CreateModel(
+            name="MeetingOccurrence",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        help_text="primary key for the record as UUID",
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="id",
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                ("end", models.DateTimeField()),
+                (
+                    "meeting",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="occurrences",
+                        to="core.meeting",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Meeting occurrence",
+                "verbose_name_plural": "Meeting occurrences",
+                "db_table": "magnify_meeting_occurrence",
+                "ordering": ("start",),
+                "indexes": [
+                    models.Index(
+                        fields=["start", "end"], name="meeting_occurrence_range"
+                    ),
+                    models.Index(
+                        fields=["meeting", "start"], name="meeting_occurrence_start"
+                    ),
+                ],
+            },
+        ),
+    ]
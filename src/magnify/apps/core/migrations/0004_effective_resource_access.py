@@ -0,0 +1,98 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:52
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+ROLES = ["member", "administrator", "owner"]
+
+
+def populate_effective_resource_accesses(apps, schema_editor):
+    """Compute the effective accesses of users from existing resource accesses."""
+    ResourceAccess = apps.get_model("core", "ResourceAccess")
+    EffectiveResourceAccess = apps.get_model("core", "EffectiveResourceAccess")
+
+    roles = {}
+    for user_field in ("user", "group__members", "group__administrators"):
+        for user_id, resource_id, role in ResourceAccess.objects.filter(
+            **{f"{user_field:s}__isnull": False}
+        ).values_list(user_field, "resource_id", "role"):
+            key = (user_id, resource_id)
+            roles[key] = max(roles.get(key, role), role, key=ROLES.index)
+
+    EffectiveResourceAccess.objects.bulk_create(
+        (
+            EffectiveResourceAccess(user_id=user_id, resource_id=resource_id, role=role)
+            for (user_id, resource_id), role in roles.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0003_meeting_occurrences"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EffectiveResourceAccess",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        help_text="primary key for the record as UUID",
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="id",
+                    ),
+                ),
+                (
+                    "role",
+                    models.CharField(
+                        choices=[
+                            ("member", "Member"),
+                            ("administrator", "Administrator"),
+                            ("owner", "Owner"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "resource",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="effective_accesses",
+                        to="core.resource",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="effective_accesses",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Effective resource access",
+                "verbose_name_plural": "Effective resource accesses",
+                "db_table": "magnify_effective_resource_access",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="effectiveresourceaccess",
+            constraint=models.UniqueConstraint(
+                fields=("user", "resource"),
+                name="effective_resource_access_unique_user_resource",
+            ),
+        ),
+        migrations.RunPython(
+            populate_effective_resource_accesses, migrations.RunPython.noop
+        ),
+    ]
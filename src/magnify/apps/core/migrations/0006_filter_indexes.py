@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0005_ordering_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="effectiveresourceaccess",
+            index=models.Index(
+                fields=["user", "role", "resource"], name="effective_access_user_role"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="meeting",
+            index=models.Index(
+                condition=models.Q(("recurrence__isnull", True)),
+                fields=["start", "end"],
+                name="meeting_single_range",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="meeting",
+            index=models.Index(
+                condition=models.Q(("recurrence__isnull", False)),
+                fields=["start", "recurring_until"],
+                name="meeting_recurring_range",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="meeting",
+            index=models.Index(fields=["room", "start"], name="meeting_room_start"),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(fields=["jwt_sub"], name="user_jwt_sub"),
+        ),
+    ]
@@ -0,0 +1,161 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:39
+from calendar import monthrange
+from datetime import date, timedelta
+from itertools import count
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+UTC = ZoneInfo("UTC")
+
+# Defaults of the settings at the time of this migration, which must not depend on them
+DEFAULT_RETENTION_DAYS = 365
+DEFAULT_HORIZON_DAYS = 365
+
+
+def get_nth_week_number(original_date):
+    """Returns the number of the week within the month for the date passed in argument."""
+    first_day = original_date.replace(day=1)
+    first_week_last_day = 7 - first_day.weekday()
+    if original_date.day < first_week_last_day:
+        return 1
+    nb_weeks = 1 + (original_date.day - first_week_last_day) // 7
+    if first_day.weekday() <= original_date.weekday():
+        nb_weeks += 1
+    return nb_weeks
+
+
+def get_date_of_weekday_in_nth_week(year, month, nth_week, week_day):
+    """Returns the date corresponding to the nth weekday of a month."""
+    first_day = date(year, month, 1)
+    return first_day + timedelta(
+        days=(week_day - first_day.weekday()) % 7, weeks=nth_week - 1
+    )
+
+
+def iter_local_occurrences(meeting):
+    """
+    Lazily yields the occurrences of a recurring meeting in its local timezone, walked one
+    after the other from its start with the same rules as the recurrence rules of the app at
+    the time of this migration, which are not available on historical models.
+    """
+    start = meeting.start.astimezone(meeting.timezone)
+    if meeting.recurrence == "daily":
+        for index in count():
+            yield start + timedelta(days=meeting.frequency * index)
+
+    elif meeting.recurrence == "weekly":
+        weekdays = sorted({int(day) for day in meeting.weekdays or ""})
+        for index in count():
+            period_start = start + timedelta(weeks=meeting.frequency * index)
+            for weekday in weekdays:
+                if index or weekday >= start.weekday():
+                    yield period_start + timedelta(days=weekday - start.weekday())
+
+    else:
+        months = meeting.frequency * (12 if meeting.recurrence == "yearly" else 1)
+        nth_day = meeting.recurrence == "monthly" and meeting.monthly_type == "nth_day"
+        current, day = start.date(), start.day
+        while True:
+            yield start.replace(year=current.year, month=current.month, day=current.day)
+            year, month = divmod(12 * current.year + current.month - 1 + months, 12)
+            if nth_day:
+                current = get_date_of_weekday_in_nth_week(
+                    year, month + 1, get_nth_week_number(current), current.weekday()
+                )
+            else:
+                # The day clipped to the end of a month stays clipped afterwards
+                day = min(day, monthrange(year, month + 1)[1])
+                current = date(year, month + 1, day)
+
+
+def get_occurrences(meeting, since, until):
+    """
+    Returns the start of the occurrences of a meeting between the dates passed in argument,
+    as computed by `Meeting.get_occurrences` which is not available on historical models.
+    """
+    if not meeting.recurrence:
+        return [meeting.start] if meeting.start <= until else []
+
+    if meeting.recurring_until and meeting.recurring_until < until:
+        until = meeting.recurring_until
+    occurrences = []
+    for occurrence in iter_local_occurrences(meeting):
+        occurrence = occurrence.astimezone(UTC)
+        if occurrence > until:
+            break
+        if occurrence >= since:
+            occurrences.append(occurrence)
+    return occurrences
+
+
+def materialize_occurrences(apps, schema_editor):
+    """
+    Record that occurrences already materialized start with their meeting, and materialize
+    the occurrences of meetings that were never materialized, within the retention and the
+    horizon, so that filtering meetings by date range does not depend on a manual command.
+    """
+    meeting_model = apps.get_model("core", "Meeting")
+    occurrence_model = apps.get_model("core", "MeetingOccurrence")
+
+    meeting_model.objects.filter(occurrences_until__isnull=False).update(
+        occurrences_from=F("start")
+    )
+
+    now = timezone.now()
+    retention = now - timedelta(
+        days=getattr(
+            settings, "MEETING_OCCURRENCES_RETENTION_DAYS", DEFAULT_RETENTION_DAYS
+        )
+    )
+    horizon = now + timedelta(
+        days=getattr(settings, "MEETING_OCCURRENCES_HORIZON_DAYS", DEFAULT_HORIZON_DAYS)
+    )
+    for meeting in meeting_model.objects.filter(
+        occurrences_until__isnull=True
+    ).iterator():
+        since = (
+            retention
+            if meeting.recurrence and meeting.start < retention
+            else meeting.start
+        )
+        until = (
+            meeting.recurring_until
+            if meeting.recurring_until
+            and (not meeting.recurrence or meeting.recurring_until < horizon)
+            else horizon
+        )
+        duration = meeting.end - meeting.start
+        occurrence_model.objects.bulk_create(
+            (
+                occurrence_model(meeting=meeting, start=start, end=start + duration)
+                for start in get_occurrences(meeting, since, until)
+            ),
+            batch_size=1000,
+        )
+        meeting_model.objects.filter(pk=meeting.pk).update(
+            occurrences_from=since, occurrences_until=until
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0006_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="meeting",
+            name="occurrences_from",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="Date from which occurrences are materialized in database.",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(materialize_occurrences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0007_meeting_occurrences_from"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="calendar_key",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Secret changed to revoke the urls of the calendar of the user.",
+                max_length=32,
+                verbose_name="calendar key",
+            ),
+        ),
+    ]
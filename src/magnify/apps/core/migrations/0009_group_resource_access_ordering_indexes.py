@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0008_user_calendar_key"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="resourceaccess",
+            options={
+                "ordering": ("resource", "role"),
+                "verbose_name": "Resource access",
+                "verbose_name_plural": "Resource accesses",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="group",
+            index=models.Index(fields=["name", "id"], name="group_ordering"),
+        ),
+        migrations.AddIndex(
+            model_name="resourceaccess",
+            index=models.Index(
+                fields=["resource", "role", "id"], name="resource_access_ordering"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0009_group_resource_access_ordering_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="resourceaccess",
+            index=models.Index(
+                fields=["user", "role"], name="resource_access_user_role"
+            ),
+        ),
+    ]
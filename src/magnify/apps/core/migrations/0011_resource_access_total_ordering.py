@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:43
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0010_resource_access_user_role"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="resourceaccess",
+            options={
+                "ordering": ("resource", "role", "id"),
+                "verbose_name": "Resource access",
+                "verbose_name_plural": "Resource accesses",
+            },
+        ),
+    ]
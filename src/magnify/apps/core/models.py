@@ -1,26 +1,40 @@
 """
 Declare and configure the models for the customers part
 """
+# pylint: disable=too-many-lines
 import uuid
-from datetime import timedelta
-from zoneinfo import ZoneInfo
+from collections import namedtuple
+from itertools import takewhile
 
 from django.conf import settings
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.auth.models import PermissionsMixin, UserManager
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.core.validators import RegexValidator
-from django.db import models
-from django.db.models import F, Q
+from django.db import models, transaction
+from django.db.models import (
+    Exists,
+    ExpressionWrapper,
+    F,
+    Max,
+    Min,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Value,
+)
 from django.utils import timezone as util_timezone
 from django.utils.functional import lazy
 from django.utils.text import capfirst, slugify
 from django.utils.translation import gettext_lazy as _
 
-from dateutil.relativedelta import relativedelta
 from timezone_field import TimeZoneField
 
-from .utils import get_date_of_weekday_in_nth_week, get_nth_week_number
+from .authorization import clear_roles_memo, role_for
+from .cache import occurrences_cache
+from .recurrence import DAYS, MONTHS, WEEKS, RecurrenceRule
+from .utils import get_occurrences_horizon, get_occurrences_retention
 
 
 class RoleChoices(models.TextChoices):
@@ -40,6 +54,11 @@ class RoleChoices(models.TextChoices):
         """Check if a role is owner."""
         return role == cls.OWNER
 
+    @classmethod
+    def get_highest(cls, *roles):
+        """Return the highest of the roles passed as arguments, ignoring empty roles."""
+        return max((role for role in roles if role), key=cls.values.index, default=None)
+
 
 class BaseModel(models.Model):
     """Make `save` call `full_clean`.
@@ -128,6 +147,14 @@ class User(BaseModel, AbstractBaseUser, PermissionsMixin):
         ),
     )
     date_joined = models.DateTimeField(_("date joined"), default=util_timezone.now)
+    calendar_key = models.CharField(
+        _("calendar key"),
+        max_length=32,
+        blank=True,
+        default="",
+        editable=False,
+        help_text=_("Secret changed to revoke the urls of the calendar of the user."),
+    )
 
     objects = UserManager()
 
@@ -140,6 +167,10 @@ class User(BaseModel, AbstractBaseUser, PermissionsMixin):
         ordering = ("username",)
         verbose_name = _("User")
         verbose_name_plural = _("Users")
+        indexes = [
+            # Backs the lookup of users authenticated by their OIDC subject on each request
+            models.Index(fields=["jwt_sub"], name="user_jwt_sub"),
+        ]
 
     def clean(self):
         """Normalize the email field."""
@@ -193,6 +224,10 @@ class Group(BaseModel):
         ordering = ("name",)
         verbose_name = _("Group")
         verbose_name_plural = _("Groups")
+        indexes = [
+            # Backs the ordering of groups and their pagination with cursors
+            models.Index(fields=["name", "id"], name="group_ordering"),
+        ]
 
     def __str__(self):
         return self.name
@@ -203,6 +238,26 @@ class Group(BaseModel):
         super().clean_fields(exclude=exclude)
 
 
+class ResourceQuerySet(models.QuerySet):
+    """Custom queryset for resources."""
+
+    def annotate_user_role(self, user):
+        """
+        Annotate resources with the role of the user passed as argument, as `user_role`, so
+        that it is not looked up for each resource.
+        """
+        if not user or not user.is_authenticated:
+            return self.annotate(user_role=Value(None, output_field=models.CharField()))
+
+        return self.annotate(
+            user_role=Subquery(
+                EffectiveResourceAccess.objects.filter(
+                    resource=OuterRef("pk"), user=user
+                ).values("role")[:1]
+            )
+        )
+
+
 class Resource(BaseModel):
     """Model to define access control"""
 
@@ -224,6 +279,8 @@ class Resource(BaseModel):
         Label, blank=True, related_name="is_resource_label_of"
     )
 
+    objects = ResourceQuerySet.as_manager()
+
     class Meta:
         db_table = "magnify_resource"
         verbose_name = _("Resource")
@@ -239,20 +296,7 @@ class Resource(BaseModel):
         """
         Determine the role of a given user in this resource taking into account group ownership.
         """
-        if not user or not user.is_authenticated:
-            return None
-
-        role = None
-        for access in self.accesses.filter(
-            Q(user=user) | Q(group__members=user) | Q(group__administrators=user)
-        ):
-            if access.role == RoleChoices.OWNER:
-                return RoleChoices.OWNER
-            if access.role == RoleChoices.ADMIN:
-                role = RoleChoices.ADMIN
-            if access.role == RoleChoices.MEMBER and role != RoleChoices.ADMIN:
-                role = RoleChoices.MEMBER
-        return role
+        return role_for(user, self.pk)
 
     def is_administrator(self, user):
         """
@@ -287,8 +331,18 @@ class ResourceAccess(BaseModel):
 
     class Meta:
         db_table = "magnify_resource_access"
+        ordering = ("resource", "role", "id")
         verbose_name = _("Resource access")
         verbose_name_plural = _("Resource accesses")
+        indexes = [
+            # Backs the ordering of resource accesses and their pagination with cursors, and
+            # the lookup of the accesses to a resource with a role
+            models.Index(
+                fields=["resource", "role", "id"], name="resource_access_ordering"
+            ),
+            # Backs the lookup of the resources on which a user has a role
+            models.Index(fields=["user", "role"], name="resource_access_user_role"),
+        ]
         constraints = [
             # Uniqueness
             models.UniqueConstraint(
@@ -325,6 +379,10 @@ class ResourceAccess(BaseModel):
             ),
         ]
 
+    # Resource of the access as loaded from the database, of which the effective accesses must
+    # also be recomputed if the access is moved to another resource
+    loaded_resource_id = None
+
     def __str__(self):
         person = self.user or self.group
         role = capfirst(self.get_role_display())
@@ -343,7 +401,15 @@ class ResourceAccess(BaseModel):
             ).only("pk")
             if len(accesses) == 1 and accesses[0].pk == self.pk:
                 raise PermissionDenied("A resource should keep at least one owner.")
-        return super().save(*args, **kwargs)
+        super().save(*args, **kwargs)
+        self.loaded_resource_id = self.resource_id
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Keep track of the resource as loaded from the database."""
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_resource_id = instance.resource_id
+        return instance
 
     def delete(self, *args, **kwargs):
         """Disallow deleting the last of the Mohicans."""
@@ -358,6 +424,111 @@ class ResourceAccess(BaseModel):
         return super().delete(*args, **kwargs)
 
 
+class EffectiveResourceAccessManager(models.Manager):
+    """Manager to keep the effective accesses of users to resources in sync."""
+
+    def rebuild(self, resources=None, users=None):
+        """
+        Recompute the effective accesses of users to resources from their own accesses and the
+        accesses of the groups of which they are members or administrators.
+
+        The computation can be limited to some resources and/or users by passing lists or
+        querysets of their ids.
+
+        Concurrent rebuilds of the same resources are serialized by locking the resources, so
+        that each one computes roles from the accesses committed by the previous one. Rows
+        inserted concurrently for other resources, e.g. when rebuilding the accesses of users,
+        are updated instead of failing on the uniqueness of users and resources.
+        """
+        accesses = ResourceAccess.objects.all()
+        stale_accesses = self.all()
+        if resources is not None:
+            accesses = accesses.filter(resource__in=resources)
+            stale_accesses = stale_accesses.filter(resource__in=resources)
+        if users is not None:
+            stale_accesses = stale_accesses.filter(user__in=users)
+
+        with transaction.atomic():
+            if resources is not None:
+                # Lock in a consistent order to avoid deadlocks between rebuilds
+                list(
+                    Resource.objects.select_for_update()
+                    .filter(pk__in=resources)
+                    .order_by("pk")
+                    .values_list("pk", flat=True)
+                )
+
+            roles = {}
+            for user_field in ("user", "group__members", "group__administrators"):
+                # Filter in one call so that all conditions apply to the same join
+                lookups = {f"{user_field:s}__isnull": False}
+                if users is not None:
+                    lookups[f"{user_field:s}__in"] = users
+                for user_id, resource_id, role in accesses.filter(
+                    **lookups
+                ).values_list(user_field, "resource_id", "role"):
+                    key = (user_id, resource_id)
+                    roles[key] = RoleChoices.get_highest(roles.get(key), role)
+
+            stale_accesses.delete()
+            self.bulk_create(
+                (
+                    self.model(user_id=user_id, resource_id=resource_id, role=role)
+                    for (user_id, resource_id), role in roles.items()
+                ),
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=["user", "resource"],
+                update_fields=["role"],
+            )
+        clear_roles_memo()
+
+
+class EffectiveResourceAccess(BaseModel):
+    """
+    Highest role of a user on a resource, whether granted to the user or to groups of which
+    the user is a member or an administrator. Rows are denormalized from resource accesses
+    and group memberships and kept in sync by signals.
+    """
+
+    resource = models.ForeignKey(
+        Resource,
+        on_delete=models.CASCADE,
+        related_name="effective_accesses",
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="effective_accesses",
+    )
+    role = models.CharField(max_length=20, choices=RoleChoices.choices)
+
+    objects = EffectiveResourceAccessManager()
+
+    class Meta:
+        db_table = "magnify_effective_resource_access"
+        verbose_name = _("Effective resource access")
+        verbose_name_plural = _("Effective resource accesses")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "resource"],
+                name="effective_resource_access_unique_user_resource",
+            ),
+        ]
+        indexes = [
+            # Backs the lookup of the resources a user administrates
+            models.Index(
+                fields=["user", "role", "resource"], name="effective_access_user_role"
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{capfirst(self.get_role_display()):s} role for user {self.user_id!s} "
+            f"on resource {self.resource_id!s}"
+        )
+
+
 class Room(Resource):
     """Model for one room"""
 
@@ -384,6 +555,10 @@ class Room(Resource):
         ordering = ("name",)
         verbose_name = _("Room")
         verbose_name_plural = _("Rooms")
+        indexes = [
+            # Backs the ordering of rooms and their pagination with cursors
+            models.Index(fields=["name", "resource"], name="room_ordering"),
+        ]
 
     def __str__(self):
         return capfirst(self.name)
@@ -410,6 +585,106 @@ class Room(Resource):
         return f"{settings.JITSI_ROOM_PREFIX}{self.id!s}".replace("-", "")
 
 
+class MeetingQuerySet(models.QuerySet):
+    """Custom queryset for meetings."""
+
+    def accessible_to(self, user, include_public=False):
+        """
+        Filter meetings to which the user passed as argument is related, as owner, guest or
+        member or administrator of a guest group, and public meetings if requested.
+
+        Each relation is looked up in a correlated subquery instead of joining the guests and
+        members of groups so that meetings are not duplicated and no DISTINCT is required.
+        """
+        access_clause = Q(owner=user) | self.get_guest_clause(user)
+        if include_public:
+            access_clause |= Q(is_public=True)
+        return self.filter(access_clause)
+
+    def annotate_user_is_guest(self, user):
+        """
+        Annotate meetings with whether the user passed as argument is a guest, as
+        `user_is_guest`, so that it is not looked up for each meeting.
+        """
+        if not user or not user.is_authenticated:
+            return self.annotate(
+                user_is_guest=Value(False, output_field=models.BooleanField())
+            )
+
+        return self.annotate(
+            user_is_guest=ExpressionWrapper(
+                self.get_guest_clause(user), output_field=models.BooleanField()
+            )
+        )
+
+    def prefetch_accesses(self):
+        """Prefetch the accesses of meetings along with their user or group."""
+        return self.prefetch_related(
+            Prefetch(
+                "accesses",
+                queryset=MeetingAccess.objects.select_related("user", "group"),
+            )
+        )
+
+    @staticmethod
+    def get_guest_clause(user):
+        """
+        Return a clause matching meetings of which the user passed as argument is a guest,
+        either directly or via a group.
+        """
+        accesses = MeetingAccess.objects.filter(meeting=OuterRef("pk"))
+        return (
+            Exists(accesses.filter(user=user))
+            | Exists(accesses.filter(group__members=user))
+            | Exists(accesses.filter(group__administrators=user))
+        )
+
+    def occurring_between(self, start, end):
+        """
+        Filter meetings occurring between the start and end dates passed as arguments, with the
+        same rules as `Meeting.get_occurrences`: a meeting without recurrence should overlap the
+        period, and a recurring meeting should have an occurrence starting in the period.
+
+        Occurrences of recurring meetings are looked up in the occurrences materialized in
+        database. Meetings of which occurrences were not materialized yet, or not as far back or
+        as far as the period, are included if their recurrence may reach the period.
+        """
+        return self.filter(
+            Q(recurrence__isnull=True, end__gte=start, start__lte=end)
+            | Q(
+                Exists(
+                    MeetingOccurrence.objects.filter(
+                        meeting=OuterRef("pk"), start__gte=start, start__lte=end
+                    )
+                )
+                | Q(occurrences_until__isnull=True, start__lte=end)
+                & (Q(recurring_until__gte=start) | Q(recurring_until__isnull=True))
+                | Q(occurrences_until__lt=end, start__lte=end)
+                & (
+                    Q(recurring_until__isnull=True)
+                    | Q(
+                        recurring_until__gt=F("occurrences_until"),
+                        recurring_until__gte=start,
+                    )
+                )
+                | Q(
+                    occurrences_from__gt=start,
+                    start__lt=F("occurrences_from"),
+                    start__lte=end,
+                )
+                & (Q(recurring_until__gte=start) | Q(recurring_until__isnull=True)),
+                recurrence__isnull=False,
+            )
+        )
+
+
+# Recurrence of a meeting as loaded from the database, and recurrence rule compiled from its
+# recurrence fields along with the values it was compiled from
+MeetingRecurrenceState = namedtuple(
+    "MeetingRecurrenceState", ["loaded", "compiled"], defaults=[None, None]
+)
+
+
 class Meeting(BaseModel):
     """Model for one meeting or a collection of meetings defined recursively."""
 
@@ -480,12 +755,59 @@ class Meeting(BaseModel):
     monthly_type = models.CharField(
         max_length=10, choices=MONTHLY_TYPE_CHOICES, default=DATE_DAY
     )
+    occurrences_from = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("Date from which occurrences are materialized in database."),
+    )
+    occurrences_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("Date up to which occurrences are materialized in database."),
+    )
+
+    objects = MeetingQuerySet.as_manager()
+
+    # Fields on which the occurrences of the meeting depend
+    RECURRENCE_FIELDS = (
+        "start",
+        "end",
+        "timezone",
+        "recurrence",
+        "frequency",
+        "recurring_until",
+        "nb_occurrences",
+        "weekdays",
+        "monthly_type",
+    )
+    MAX_REPORTED_CONFLICTS = 10
+    # Replaced as a whole, never mutated, so that copies of a meeting do not share it
+    _recurrence_state = MeetingRecurrenceState()
 
     class Meta:
         db_table = "magnify_meeting"
         ordering = ("-start", "name")
         verbose_name = _("Meeting")
         verbose_name_plural = _("Meetings")
+        indexes = [
+            # Backs the ordering of meetings and their pagination with cursors
+            models.Index(fields=["-start", "name", "id"], name="meeting_ordering"),
+            # Back the filtering of meetings by period. Partial indexes are not supported
+            # on MySQL, where Django skips creating them.
+            models.Index(
+                fields=["start", "end"],
+                condition=Q(recurrence__isnull=True),
+                name="meeting_single_range",
+            ),
+            models.Index(
+                fields=["start", "recurring_until"],
+                condition=Q(recurrence__isnull=False),
+                name="meeting_recurring_range",
+            ),
+            models.Index(fields=["room", "start"], name="meeting_room_start"),
+        ]
         constraints = [
             models.CheckConstraint(
                 check=Q(end__gte=F("start")),
@@ -513,6 +835,22 @@ class Meeting(BaseModel):
     def __str__(self):
         return capfirst(self.name)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Keep track of the recurrence as loaded from the database."""
+        instance = super().from_db(db, field_names, values)
+        loaded_values = dict(zip(field_names, values))
+        # The instance is created here, so its private state is set by the class itself
+        # pylint: disable-next=protected-access
+        instance._recurrence_state = MeetingRecurrenceState(
+            loaded=tuple(loaded_values.get(field) for field in cls.RECURRENCE_FIELDS)
+        )
+        return instance
+
+    def get_recurrence(self):
+        """Return the values of the fields on which the occurrences of the meeting depend."""
+        return tuple(getattr(self, field) for field in self.RECURRENCE_FIELDS)
+
     @property
     def jitsi_name(self):
         """The name used as Jitsi room for this meeting."""
@@ -556,22 +894,20 @@ class Meeting(BaseModel):
                 if self.recurring_until:
                     if self.recurring_until < self.start:
                         self.recurring_until = self.start
-                    all_occurrences = self.get_occurrences(
-                        self.start, self.recurring_until
-                    )
-                    self.nb_occurrences = len(all_occurrences)
+                    self.nb_occurrences = self.count_occurrences(self.recurring_until)
                     # Correct the date of end of recurrence
-                    self.recurring_until = all_occurrences[-1]
+                    self.recurring_until = self.get_nth_occurrence(
+                        self.nb_occurrences - 1
+                    )
                     if self.nb_occurrences <= 1:
                         self.reset_recurrence()
 
                 elif self.nb_occurrences is not None:
                     if self.nb_occurrences <= 1:
                         self.reset_recurrence()
-                    next_occurrence = self.start
-                    for _i in range(self.nb_occurrences - 1):
-                        next_occurrence = self.next_occurrence(next_occurrence)
-                    self.recurring_until = next_occurrence
+                    self.recurring_until = self.get_nth_occurrence(
+                        self.nb_occurrences - 1
+                    )
 
                 # Infinite recurrence... do nothing
 
@@ -580,79 +916,262 @@ class Meeting(BaseModel):
         else:
             self.reset_recurrence()
 
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
-    def next_occurrence(self, current_datetime):
+            # Materialize occurrences again only if the recurrence changed
+            recurrence = self.get_recurrence()
+            if recurrence != self._recurrence_state.loaded:
+                self.update_occurrences()
+            self._recurrence_state = self._recurrence_state._replace(loaded=recurrence)
+
+        occurrences_cache.invalidate(self)
+
+    def delete(self, *args, **kwargs):
+        """Drop the occurrences of the meeting from the cache when deleting it."""
+        occurrences_cache.invalidate(self)
+        return super().delete(*args, **kwargs)
+
+    def get_conflicts(self):
         """
-        This method takes as assumption that the current date passed in argument
-        IS a valid occurrence. If it is not the case, it will return an irrelevant date.
+        Returns the occurrences of other meetings of the room that overlap upcoming occurrences
+        of this meeting, as materialized in database.
 
-        Returns the next occurrence without consideration for the end of the recurrence.
+        Occurrences of the room are only looked up in the range of dates that the upcoming
+        occurrences may overlap, given the duration of the longest meeting of the room, so that
+        the cost does not depend on the history of the room.
         """
-        current_datetime_tz = current_datetime.astimezone(self.timezone)
-        if self.recurrence == Meeting.DAILY:
-            return (current_datetime_tz + timedelta(days=self.frequency)).astimezone(
-                ZoneInfo("UTC")
-            )
+        now = util_timezone.now()
+        upcoming = self.occurrences.filter(end__gt=now)
+        bounds = upcoming.aggregate(first=Min("start"), last=Max("end"))
+        longest = (
+            Meeting.objects.filter(room_id=self.room_id)
+            .exclude(pk=self.pk)
+            .aggregate(longest=Max(F("end") - F("start")))["longest"]
+        )
+        if bounds["first"] is None or longest is None:
+            return MeetingOccurrence.objects.none()
 
-        if self.recurrence == Meeting.WEEKLY:
-            increment = 1
-            # Look in the current week
-            weekday = current_datetime.astimezone(self.timezone).weekday()
-            while weekday + increment <= 6:
-                if str(weekday + increment) in self.weekdays:
-                    return (current_datetime_tz + timedelta(days=increment)).astimezone(
-                        ZoneInfo("UTC")
+        return (
+            MeetingOccurrence.objects.filter(
+                Exists(
+                    upcoming.filter(
+                        start__lt=OuterRef("end"), end__gt=OuterRef("start")
                     )
-                increment += 1
-            # Skip the weeks not covered by frequency
-            next_datetime_tz = (
-                current_datetime_tz
-                + timedelta(days=increment)
-                + timedelta(weeks=self.frequency - 1)
-            )
-
-            # Look in this week and be sure to find
-            weekday = -1
-            increment = 1
-            while weekday + increment <= 6:
-                if str(weekday + increment) in self.weekdays:
-                    return (
-                        next_datetime_tz + timedelta(days=increment - 1)
-                    ).astimezone(ZoneInfo("UTC"))
-                increment += 1
-
-            raise RuntimeError(
-                "You should have found the next weekly occurrence by now."
+                ),
+                meeting__room_id=self.room_id,
+                start__gte=bounds["first"] - longest,
+                start__lt=bounds["last"],
+                end__gt=now,
             )
+            .exclude(meeting_id=self.pk)
+            .order_by("start")
+        )
 
-        if self.recurrence == Meeting.MONTHLY:
-            next_datetime_tz = current_datetime_tz + relativedelta(
-                months=self.frequency
+    def check_conflicts(self, user):
+        """
+        Raise a validation error if upcoming occurrences of the meeting overlap occurrences
+        of other meetings of the room. The first conflicts are listed if they belong to
+        meetings that the user passed in argument can see, so that the bookings of a room do
+        not leak through the conflicts of a meeting that the user moves in it.
+        """
+        conflicts = self.get_conflicts()
+        visible_conflicts = conflicts.filter(
+            meeting__in=Meeting.objects.accessible_to(user, include_public=True)
+        )
+        errors = [
+            ValidationError(
+                _("The room is already booked from %(start)s to %(end)s."),
+                params={
+                    "start": occurrence.start.isoformat(),
+                    "end": occurrence.end.isoformat(),
+                },
             )
-            if self.monthly_type == Meeting.DATE_DAY:
-                return next_datetime_tz.astimezone(ZoneInfo("UTC"))
-
-            if self.monthly_type == Meeting.NTH_DAY:
-                weekday = current_datetime_tz.weekday()
-                week_number = get_nth_week_number(current_datetime_tz.date())
-                next_date = get_date_of_weekday_in_nth_week(
-                    next_datetime_tz.year, next_datetime_tz.month, week_number, weekday
+            for occurrence in visible_conflicts[: self.MAX_REPORTED_CONFLICTS]
+        ]
+        if not errors and conflicts.exists():
+            errors.append(
+                ValidationError(
+                    _("The room is already booked by meetings you can not see.")
                 )
-                return current_datetime_tz.replace(
-                    year=next_date.year, month=next_date.month, day=next_date.day
-                ).astimezone(ZoneInfo("UTC"))
+            )
+        if errors:
+            raise ValidationError({"conflicts": errors})
+
+    def update_occurrences(self):
+        """
+        Synchronize the occurrences materialized in database with the recurrence of the
+        meeting, from the retention date if the recurrence started earlier, up to the date of
+        end of recurrence or to the horizon if it comes first.
+        """
+        since = self._get_occurrences_since(get_occurrences_retention())
+        until = self._get_occurrences_until(get_occurrences_horizon())
+        duration = self.end - self.start
+        expected = {
+            start: start + duration for start in self.get_occurrences(since, until)
+        }
+        existing = dict(self.occurrences.values_list("start", "end"))
+
+        stale = [start for start, end in existing.items() if expected.get(start) != end]
+        if len(stale) == len(existing):
+            self.occurrences.all().delete()
+        elif stale:
+            self.occurrences.filter(start__in=stale).delete()
+
+        MeetingOccurrence.objects.bulk_create(
+            MeetingOccurrence(meeting=self, start=start, end=end)
+            for start, end in expected.items()
+            if existing.get(start) != end
+        )
+        self._set_occurrences_range(since, until)
 
-            raise RuntimeError(
-                "You should have found the next monthly occurrence by now."
+    def extend_occurrences(self, until=None):
+        """
+        Materialize the occurrences of a recurrence that are later than the ones already
+        materialized, up to the date passed in argument or to the horizon.
+        """
+        if self.occurrences_until is None:
+            self.update_occurrences()
+            return
+
+        until = self._get_occurrences_until(until or get_occurrences_horizon())
+        if until <= self.occurrences_until:
+            return
+
+        duration = self.end - self.start
+        MeetingOccurrence.objects.bulk_create(
+            MeetingOccurrence(meeting=self, start=start, end=start + duration)
+            for start in takewhile(
+                lambda occurrence: occurrence <= until,
+                self.iter_occurrences(after=self.occurrences_until),
             )
+        )
+        self._set_occurrences_range(self.occurrences_from, until)
+
+    def _get_occurrences_since(self, retention):
+        """
+        Returns the date from which occurrences should be materialized: the retention date
+        passed in argument skips the history of old recurrences so that saving a meeting does
+        not depend on its age, but the single occurrence of a meeting without recurrence is
+        always kept.
+        """
+        if self.recurrence and self.start < retention:
+            return retention
+        return self.start
+
+    def _get_occurrences_until(self, horizon):
+        """
+        Returns the date up to which occurrences should be materialized: the horizon passed in
+        argument caps recurrences so that saving a meeting does not depend on its number of
+        occurrences, but the single occurrence of a meeting without recurrence is always kept.
+        """
+        if self.recurring_until and (
+            not self.recurrence or self.recurring_until < horizon
+        ):
+            return self.recurring_until
+        return horizon
+
+    def _set_occurrences_range(self, since, until):
+        """Record the range of dates in which occurrences are materialized without saving again."""
+        self.occurrences_from, self.occurrences_until = since, until
+        Meeting.objects.filter(pk=self.pk).update(
+            occurrences_from=since, occurrences_until=until
+        )
+
+    def compile_recurrence_rule(self):
+        """Returns a new recurrence rule compiled from the recurrence fields of the meeting."""
+        unit, frequency = {
+            Meeting.DAILY: (DAYS, self.frequency),
+            Meeting.WEEKLY: (WEEKS, self.frequency),
+            Meeting.MONTHLY: (MONTHS, self.frequency),
+            Meeting.YEARLY: (MONTHS, 12 * (self.frequency or 0)),
+        }.get(self.recurrence, (None, self.frequency))
+        return RecurrenceRule(
+            start=self.start,
+            timezone=self.timezone,
+            unit=unit,
+            frequency=frequency,
+            weekdays=sum(1 << int(day) for day in set(self.weekdays or "")),
+            nth_day=self.recurrence == Meeting.MONTHLY
+            and self.monthly_type == Meeting.NTH_DAY,
+        )
+
+    def get_recurrence_rule(self):
+        """
+        Returns the recurrence rule of the meeting. The rule is compiled once and reused until
+        one of the recurrence fields changes.
+        """
+        key = (
+            self.start,
+            self.timezone,
+            self.recurrence,
+            self.frequency,
+            self.weekdays,
+            self.monthly_type,
+        )
+        compiled = self._recurrence_state.compiled
+        if compiled is None or compiled[0] != key:
+            compiled = (key, self.compile_recurrence_rule())
+            self._recurrence_state = self._recurrence_state._replace(compiled=compiled)
+        return compiled[1]
+
+    def next_occurrence(self, current_datetime):
+        """
+        This method takes as assumption that the current date passed in argument
+        IS a valid occurrence. If it is not the case, it will return an irrelevant date.
+
+        Returns the next occurrence without consideration for the end of the recurrence.
+        """
+        return self.get_recurrence_rule().next_occurrence(current_datetime)
+
+    def get_nth_occurrence(self, index):
+        """
+        Returns the occurrence at the index passed in argument, 0 being the start of the meeting,
+        without consideration for the end of the recurrence.
+        """
+        return self.get_recurrence_rule().get_nth_occurrence(index)
+
+    def count_occurrences(self, until):
+        """
+        Returns the number of occurrences that are not later than the date passed in argument,
+        without consideration for the end of the recurrence.
+        """
+        return self.get_recurrence_rule().count_occurrences(until)
 
-        if self.recurrence == Meeting.YEARLY:
-            return (
-                current_datetime_tz + relativedelta(years=self.frequency)
-            ).astimezone(ZoneInfo("UTC"))
+    def seek_occurrence(self, moment):
+        """
+        Returns an occurrence computed arithmetically from the start of the recurrence, that is
+        not later than the first occurrence at or after the moment passed in argument.
+        """
+        return self.get_recurrence_rule().seek_occurrence(moment)
 
-        raise RuntimeError("Non recurrent meetings don't have next occurences.")
+    def iter_occurrences(self, after=None, limit=None):
+        """
+        Lazily yields the occurrences of this meeting in chronological order.
+
+        Only occurrences strictly later than the `after` date are yielded if it is passed, and
+        the iteration stops after `limit` occurrences if it is passed. Beware that infinite
+        recurrences never stop yielding occurrences if no limit is passed.
+        """
+        if limit is not None and limit <= 0:
+            return
+
+        if not self.recurrence:
+            if after is None or self.start > after:
+                yield self.start
+            return
+
+        rule = self.get_recurrence_rule()
+        index = 0 if after is None else rule.get_occurrence_index(after)
+        count = 0
+        for new_start in rule.iter_occurrences(index):
+            if self.recurring_until and new_start > self.recurring_until:
+                return
+            if after is None or new_start > after:
+                yield new_start
+                count += 1
+                if count == limit:
+                    return
 
     def get_occurrences(self, start, end):
         """
@@ -663,12 +1182,13 @@ class Meeting(BaseModel):
             if self.recurring_until and self.recurring_until < end:
                 end = self.recurring_until
 
+            rule = self.get_recurrence_rule()
             occurrences = []
-            new_start = self.start
-            while new_start <= end:
+            for new_start in rule.iter_occurrences(rule.get_occurrence_index(start)):
+                if new_start > end:
+                    break
                 if new_start >= start:
                     occurrences.append(new_start)
-                new_start = self.next_occurrence(new_start)
             return occurrences
 
         # check if event is in the period
@@ -738,3 +1258,33 @@ class MeetingAccess(BaseModel):
         if self.user:
             return f"{self.user.name:s} is guest in meeting {self.meeting.id!s}"
         return f"Users in group {self.group.name} are guests in meeting {self.meeting.id!s}"
+
+
+class MeetingOccurrence(BaseModel):
+    """
+    Occurrence of a meeting materialized in database to allow filtering meetings by date range.
+    Occurrences are kept in sync with the recurrence of their meeting when it is saved.
+    """
+
+    meeting = models.ForeignKey(
+        Meeting,
+        on_delete=models.CASCADE,
+        related_name="occurrences",
+    )
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+
+    class Meta:
+        db_table = "magnify_meeting_occurrence"
+        ordering = ("start",)
+        verbose_name = _("Meeting occurrence")
+        verbose_name_plural = _("Meeting occurrences")
+        indexes = [
+            models.Index(fields=["start", "end"], name="meeting_occurrence_range"),
+            models.Index(fields=["meeting", "start"], name="meeting_occurrence_start"),
+        ]
+
+    def __str__(self):
+        return (
+            f"Occurrence of meeting {self.meeting_id!s} on {self.start.isoformat():s}"
+        )
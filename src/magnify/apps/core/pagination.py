@@ -0,0 +1,213 @@
+"""Pagination classes for Magnify's core app API."""
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+PAGE, CURSOR = "page", "cursor"
+
+
+# pylint: disable=abstract-method
+class KeysetPagination(BasePagination):
+    """
+    Paginate querysets with opaque cursors holding the position of the first or last item of
+    the current page in the ordering of the queryset, with the primary key as tiebreaker.
+
+    Contrary to page numbers, pages are looked up by filtering on the ordering fields so the
+    cost of a page does not depend on its depth, and items are not counted.
+    Fields on which the queryset is ordered must not be nullable.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    page_size = api_settings.PAGE_SIZE
+
+    def __init__(self):
+        self.base_url = None
+        self.ordering = None
+        self.fields = None
+        self.next_position = None
+        self.previous_position = None
+
+    @staticmethod
+    def get_ordering(queryset):
+        """
+        Return the ordering of the queryset, or of its model if the queryset is not ordered
+        explicitly, as a list of (field name, descending) tuples, ending with the primary key
+        to make it total.
+        """
+        names = queryset.query.order_by
+        if not names and queryset.query.default_ordering:
+            names = queryset.model._meta.ordering
+        pk_name = queryset.model._meta.pk.name
+        ordering = [
+            (
+                pk_name if name.lstrip("-") == "pk" else name.lstrip("-"),
+                name.startswith("-"),
+            )
+            for name in names
+        ]
+        if pk_name not in (name for name, _descending in ordering):
+            ordering.append((pk_name, False))
+        return ordering
+
+    def decode_cursor(self, request):
+        """Return the position and direction encoded in the cursor of a request."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            values = cursor["p"]
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = [
+                field.to_python(value) for field, value in zip(self.fields, values)
+            ]
+            return position, bool(cursor.get("r"))
+        except Exception as error:  # pylint: disable=broad-except
+            raise NotFound(self.invalid_cursor_message) from error
+
+    def encode_cursor(self, position, reverse):
+        """Return the url of the page starting after or ending before a position."""
+        cursor = {"p": position, "r": 1} if reverse else {"p": position}
+        encoded = base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    @staticmethod
+    def order_queryset(queryset, ordering):
+        """Order a queryset following a list of (field name, descending) tuples."""
+        return queryset.order_by(
+            *(f"-{name:s}" if descending else name for name, descending in ordering)
+        )
+
+    @staticmethod
+    def get_keyset_clause(ordering, position):
+        """
+        Return a clause matching items positioned after a position in an ordering, expanded
+        as a disjunction with one term per field of the ordering: the field is after the
+        position and all the previous fields are equal to it. Each term can be looked up in
+        the index backing the ordering.
+        """
+        clause = Q()
+        for index, (name, descending) in enumerate(ordering):
+            equal = {
+                previous_name: value
+                for (previous_name, _descending), value in zip(
+                    ordering[:index], position
+                )
+            }
+            lookup = "lt" if descending else "gt"
+            clause |= Q(**equal, **{f"{name:s}__{lookup:s}": position[index]})
+        return clause
+
+    def get_position(self, item):
+        """Return the position of an item in the ordering, serialized without loss."""
+        return [field.value_to_string(item) for field in self.fields]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return the page of items following (or preceding) the cursor of the request."""
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset)
+        self.fields = [
+            queryset.model._meta.get_field(name) for name, _descending in self.ordering
+        ]
+        position, reverse = self.decode_cursor(request)
+
+        # Walk the ordering backwards to get the page preceding the cursor
+        ordering = [(name, descending != reverse) for name, descending in self.ordering]
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_clause(ordering, position))
+        queryset = self.order_queryset(queryset, ordering)
+
+        items = list(queryset[: self.page_size + 1])
+        has_more = len(items) > self.page_size
+        items = items[: self.page_size]
+        if reverse:
+            items.reverse()
+
+        self.next_position = self.previous_position = None
+        if items:
+            if has_more if not reverse else position is not None:
+                self.next_position = self.get_position(items[-1])
+            if has_more if reverse else position is not None:
+                self.previous_position = self.get_position(items[0])
+        return items
+
+    def get_paginated_response(self, data):
+        """Return a page with links to the next and previous pages."""
+        return Response(
+            {
+                "next": None
+                if self.next_position is None
+                else self.encode_cursor(self.next_position, False),
+                "previous": None
+                if self.previous_position is None
+                else self.encode_cursor(self.previous_position, True),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        """Describe paginated responses."""
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+# pylint: disable=abstract-method
+class Pagination(BasePagination):
+    """
+    Paginate with page numbers or with cursors as selected by the "pagination" query
+    parameter of each request, defaulting to the `API_PAGINATION` setting.
+    """
+
+    pagination_query_param = "pagination"
+
+    def __init__(self):
+        self.paginator = None
+
+    def get_mode(self, request):
+        """Return the pagination mode selected for a request."""
+        mode = request.query_params.get(self.pagination_query_param)
+        if mode not in (PAGE, CURSOR):
+            mode = settings.API_PAGINATION
+        if request.query_params.get(KeysetPagination.cursor_query_param):
+            mode = CURSOR
+        return mode
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Delegate pagination to the paginator of the mode selected. Page numbers follow the
+        same total ordering as cursors, so that items sharing the values of the ordering
+        fields are not repeated or skipped from one page to another.
+        """
+        if self.get_mode(request) == CURSOR:
+            self.paginator = KeysetPagination()
+        else:
+            self.paginator = PageNumberPagination()
+            queryset = KeysetPagination.order_queryset(
+                queryset, KeysetPagination.get_ordering(queryset)
+            )
+        return self.paginator.paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        """Delegate the response to the paginator of the mode selected."""
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        """Describe paginated responses with page numbers, the default mode."""
+        return PageNumberPagination().get_paginated_response_schema(schema)
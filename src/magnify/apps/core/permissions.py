@@ -3,6 +3,7 @@ from django.conf import settings
 
 from rest_framework import permissions
 
+from .authorization import role_for
 from .models import RoleChoices
 
 
@@ -92,12 +93,12 @@ class RoomPermissions(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        user = request.user
+        role = role_for(request.user, obj.pk)
 
         if request.method == "DELETE":
-            return obj.is_owner(user)
+            return RoleChoices.check_owner_role(role)
 
-        return obj.is_administrator(user)
+        return RoleChoices.check_administrator_role(role)
 
 
 class ResourceAccessPermission(permissions.BasePermission):
@@ -117,4 +118,4 @@ class ResourceAccessPermission(permissions.BasePermission):
         if request.method == "DELETE" and obj.role == RoleChoices.OWNER:
             return obj.user == user
 
-        return obj.resource.is_administrator(user)
+        return RoleChoices.check_administrator_role(role_for(user, obj.resource_id))
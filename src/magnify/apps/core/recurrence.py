@@ -0,0 +1,330 @@
+"""
+Recurrence rules compiled from meetings to compute their occurrences
+"""
+from calendar import monthrange
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, tzinfo
+from zoneinfo import ZoneInfo
+
+from dateutil.relativedelta import relativedelta
+
+from .utils import (
+    get_date_of_weekday_in_nth_week,
+    get_day_after_months,
+    get_nth_week_number,
+)
+
+UTC = ZoneInfo("UTC")
+
+DAYS, WEEKS, MONTHS = "days", "weeks", "months"
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """
+    Immutable recurrence of a meeting, compiled once so that computing occurrences does not
+    parse the fields of the meeting again for each occurrence.
+
+    Recurrences repeat every `frequency` units of time (days, weeks or months). Yearly
+    recurrences are compiled as recurrences every 12 months. A rule without unit describes a
+    meeting without recurrence.
+    """
+
+    start: datetime
+    timezone: tzinfo
+    unit: str = None
+    frequency: int = 1
+    # Bitmask of the weekdays of weekly recurrences, monday being the lowest bit
+    weekdays: int = 0
+    # Whether monthly recurrences happen on the nth weekday of the month
+    nth_day: bool = False
+
+    start_local: datetime = field(init=False, repr=False, compare=False)
+    # Time added from one occurrence to the next one for daily and monthly recurrences
+    step: object = field(init=False, repr=False, compare=False)
+    # Sorted weekdays and time from each weekday to the next occurrence of weekly recurrences
+    weekdays_list: tuple = field(init=False, repr=False, compare=False)
+    weekday_offsets: tuple = field(init=False, repr=False, compare=False)
+    # Whether occurrences of a monthly recurrence on the nth weekday must be walked
+    is_walked: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Precompute what is needed to compute occurrences."""
+        start_local = self.start.astimezone(self.timezone)
+        object.__setattr__(self, "start_local", start_local)
+        object.__setattr__(
+            self,
+            "step",
+            relativedelta(months=self.frequency)
+            if self.unit == MONTHS
+            else timedelta(days=self.frequency or 0),
+        )
+
+        weekdays = tuple(day for day in range(7) if self.weekdays >> day & 1)
+        object.__setattr__(self, "weekdays_list", weekdays)
+        object.__setattr__(
+            self,
+            "weekday_offsets",
+            tuple(
+                timedelta(
+                    days=next(
+                        (day - weekday for day in weekdays if day > weekday),
+                        7 * self.frequency - weekday + weekdays[0],
+                    )
+                )
+                for weekday in range(7)
+            )
+            if weekdays
+            else None,
+        )
+
+        # The nth weekday of a month only stays the same from one month to the other if it
+        # exists in all months and if it is numbered consistently by `get_nth_week_number`,
+        # which is not the case for sundays.
+        start_date = start_local.date()
+        object.__setattr__(
+            self,
+            "is_walked",
+            self.nth_day
+            and (start_date.weekday() == 6 or get_nth_week_number(start_date) > 4),
+        )
+
+    def next_occurrence(self, current_datetime):
+        """
+        This method takes as assumption that the current date passed in argument
+        IS a valid occurrence. If it is not the case, it will return an irrelevant date.
+
+        Returns the next occurrence without consideration for the end of the recurrence. The
+        date of the next occurrence is stepped from the date of the current occurrence and the
+        local time of the meeting is kept, as by `get_nth_occurrence`, even if the current
+        occurrence was shifted by a daylight saving time change.
+        """
+        if self.unit is None:
+            raise RuntimeError("Non recurrent meetings don't have next occurences.")
+
+        current_date = current_datetime.astimezone(self.timezone).date()
+        if self.unit == WEEKS:
+            if self.weekday_offsets is None:
+                raise RuntimeError(
+                    "You should have found the next weekly occurrence by now."
+                )
+            next_date = current_date + self.weekday_offsets[current_date.weekday()]
+        elif self.nth_day:
+            next_month = current_date + self.step
+            next_date = get_date_of_weekday_in_nth_week(
+                next_month.year,
+                next_month.month,
+                get_nth_week_number(current_date),
+                current_date.weekday(),
+            )
+        else:
+            # The day clipped to the end of a month stays clipped afterwards
+            next_date = current_date + self.step
+
+        return datetime.combine(next_date, self.start_local.timetz()).astimezone(UTC)
+
+    def get_occurrence_index(self, moment):
+        """
+        Returns the index of an occurrence, computed arithmetically from the start of the
+        recurrence, that is not later than the first occurrence at or after the moment passed
+        in argument.
+        """
+        start_date = self.start_local.date()
+        moment_date = moment.astimezone(self.timezone).date()
+        if self.unit is None or moment_date <= start_date or self.is_walked:
+            return 0
+
+        if self.unit == DAYS:
+            return (moment_date - start_date).days // self.frequency
+
+        if self.unit == WEEKS:
+            # Periods start on the monday of the week of the first occurrence
+            start_weekday = start_date.weekday()
+            nb_periods = (
+                moment_date - start_date + timedelta(days=start_weekday)
+            ).days // (7 * self.frequency)
+            if nb_periods == 0:
+                return 0
+            nb_first_period = len([w for w in self.weekdays_list if w >= start_weekday])
+            return nb_first_period + (nb_periods - 1) * len(self.weekdays_list)
+
+        return (
+            12 * (moment_date.year - start_date.year)
+            + moment_date.month
+            - start_date.month
+        ) // self.frequency
+
+    def iter_local_occurrences(self, index=0):
+        """
+        Lazily yields the occurrences of the recurrence in its local timezone, computed
+        arithmetically one after the other from the occurrence at the index passed in argument,
+        without consideration for the end of the recurrence.
+
+        Monthly recurrences on a nth weekday that can not be computed (see `is_walked`) are not
+        supported.
+        """
+        if self.unit == DAYS:
+            return self._iter_local_days(index)
+        if self.unit == WEEKS:
+            return self._iter_local_weeks(index)
+        if self.unit == MONTHS and not self.is_walked:
+            return self._iter_local_months(index)
+        raise RuntimeError("This recurrence can not be computed arithmetically.")
+
+    def _iter_local_days(self, index):
+        """Lazily yields the local occurrences of a daily recurrence from an index."""
+        occurrence = self.start_local + self.step * index
+        while True:
+            yield occurrence
+            occurrence += self.step
+
+    def _iter_local_weeks(self, index):
+        """Lazily yields the local occurrences of a weekly recurrence from an index."""
+        # Each period holds as many occurrences as there are weekdays, except the first
+        # one that starts on the weekday of the first occurrence
+        start_weekday = self.start_local.weekday()
+        offsets = [timedelta(days=w - start_weekday) for w in self.weekdays_list]
+        first_period = [offset for offset in offsets if offset.days >= 0]
+        period = timedelta(weeks=self.frequency)
+        if index < len(first_period):
+            nb_periods, position = 0, index
+            offsets_list = first_period
+        else:
+            nb_periods, position = divmod(index - len(first_period), len(offsets))
+            nb_periods += 1
+            offsets_list = offsets
+        period_start = self.start_local + period * nb_periods
+        while True:
+            for offset in offsets_list[position:]:
+                yield period_start + offset
+            offsets_list, position = offsets, 0
+            period_start += period
+
+    def _iter_local_months(self, index):
+        """Lazily yields the local occurrences of a monthly recurrence from an index."""
+        start_date = self.start_local.date()
+        months = 12 * start_date.year + start_date.month - 1 + index * self.frequency
+        week_number = get_nth_week_number(start_date)
+        day = get_day_after_months(start_date, self.frequency, index)
+        while True:
+            year, month = divmod(months, 12)
+            if self.nth_day:
+                next_date = get_date_of_weekday_in_nth_week(
+                    year, month + 1, week_number, start_date.weekday()
+                )
+            else:
+                # The day clipped to the end of a month stays clipped afterwards
+                day = min(day, monthrange(year, month + 1)[1])
+                next_date = date(year, month + 1, day)
+            yield self.start_local.replace(
+                year=next_date.year, month=next_date.month, day=next_date.day
+            )
+            months += self.frequency
+
+    def get_nth_occurrence(self, index):
+        """
+        Returns the occurrence at the index passed in argument, 0 being the start of the
+        recurrence, without consideration for the end of the recurrence.
+
+        The occurrence is computed arithmetically except for monthly recurrences on a nth
+        weekday that can not be computed (see `is_walked`), which are walked.
+        """
+        if index == 0:
+            return self.start
+        if self.unit is None:
+            raise RuntimeError("Non recurrent meetings don't have next occurences.")
+
+        if self.is_walked:
+            occurrence = self.start
+            for _i in range(index):
+                occurrence = self.next_occurrence(occurrence)
+            return occurrence
+
+        return next(self.iter_local_occurrences(index)).astimezone(UTC)
+
+    def iter_occurrences(self, index=0):
+        """
+        Lazily yields the occurrences of the recurrence from the occurrence at the index passed
+        in argument, without consideration for the end of the recurrence.
+
+        Occurrences are computed arithmetically one after the other, except for monthly
+        recurrences on a nth weekday that can not be computed (see `is_walked`), which are
+        walked.
+        """
+        if self.is_walked:
+            occurrence = self.get_nth_occurrence(index)
+            while True:
+                yield occurrence
+                occurrence = self.next_occurrence(occurrence)
+
+        for occurrence in self.iter_local_occurrences(index):
+            yield occurrence.astimezone(UTC)
+
+    def count_occurrences(self, until):
+        """
+        Returns the number of occurrences that are not later than the date passed in argument,
+        without consideration for the end of the recurrence.
+
+        The count is computed arithmetically and only completed by walking the few occurrences
+        of the last period of the recurrence.
+        """
+        if until < self.start:
+            return 0
+        if self.unit is None:
+            return 1
+
+        index = self.get_occurrence_index(until)
+        occurrence = self.get_nth_occurrence(index)
+        if occurrence > until:
+            return index
+        while (next_occurrence := self.next_occurrence(occurrence)) <= until:
+            index += 1
+            occurrence = next_occurrence
+        return index + 1
+
+    def seek_occurrence(self, moment):
+        """
+        Returns an occurrence computed arithmetically from the start of the recurrence, that is
+        not later than the first occurrence at or after the moment passed in argument.
+
+        Iterating with `next_occurrence` from the returned occurrence yields the same dates as
+        iterating from the start of the recurrence, but the cost does not depend on the age of
+        the recurrence anymore. The local time of the meeting is kept even if it was skipped by
+        a daylight saving time change in between.
+        """
+        return self.get_nth_occurrence(self.get_occurrence_index(moment))
+
+
+def expand_occurrences(meetings, start, end):
+    """
+    Returns the occurrences of all the meetings passed in argument between the start and end
+    dates, in a dictionary indexed by meeting id, with the same rules as
+    `Meeting.get_occurrences`.
+
+    Occurrences of each recurrence are computed arithmetically from the range of their indexes
+    in the period instead of walking the recurrence one occurrence after the other. Meetings
+    without recurrence and monthly recurrences on a nth weekday that must be walked are
+    expanded one by one. The local time of the meetings is kept even if it was skipped by a
+    daylight saving time change.
+    """
+    occurrences = {}
+    for meeting in meetings:
+        rule = meeting.get_recurrence_rule()
+        if rule.unit is None or rule.is_walked:
+            occurrences[meeting.pk] = meeting.get_occurrences(start, end)
+            continue
+
+        until = end
+        if meeting.recurring_until and meeting.recurring_until < until:
+            until = meeting.recurring_until
+
+        occurrences[meeting.pk] = dates = []
+        index = rule.get_occurrence_index(start)
+        for occurrence in rule.iter_local_occurrences(index):
+            occurrence = occurrence.astimezone(UTC)
+            if occurrence > until:
+                break
+            if occurrence >= start:
+                dates.append(occurrence)
+    return occurrences
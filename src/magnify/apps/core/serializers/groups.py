@@ -5,8 +5,10 @@ from rest_framework import serializers
 
 from magnify.apps.core import models
 
+from .mixins import SparseFieldsetsSerializerMixin
 
-class GroupSerializer(serializers.ModelSerializer):
+
+class GroupSerializer(SparseFieldsetsSerializerMixin, serializers.ModelSerializer):
     """Serialize Group model for the API."""
 
     class Meta:
@@ -1,14 +1,18 @@
 """Meeting serializers for the core Magnify app."""
+from django.conf import settings
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import exceptions, serializers
 from timezone_field.rest_framework import TimeZoneSerializerField
 
 from magnify.apps.core import models
+from magnify.apps.core.cache import occurrences_cache
 from magnify.apps.core.utils import generate_token
 
 from .. import forms
 from .groups import LiteGroupSerializer
+from .mixins import SparseFieldsetsSerializerMixin
 from .users import UserSerializer
 
 
@@ -40,9 +44,11 @@ class NestedMeetingAccessSerializer(MeetingAccessSerializer):
     group = LiteGroupSerializer(read_only=True)
 
 
-class MeetingSerializer(serializers.ModelSerializer):
+class MeetingSerializer(SparseFieldsetsSerializerMixin, serializers.ModelSerializer):
     """Serialize Meeting model for the API."""
 
+    computed_fields = ["guests", "jitsi", "occurrences", "next_occurrences"]
+
     timezone = TimeZoneSerializerField(use_pytz=False, required=False)
 
     class Meta:
@@ -66,8 +72,54 @@ class MeetingSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "owner"]
         extra_kwargs = {"recurring_until": {"required": False}}
 
+    def get_period(self):
+        """
+        Return the time range in which occurrences are requested in query string, parsed once
+        for all serialized meetings, or None if it was not requested.
+        """
+        if "period" not in self.context:
+            filter_form = forms.MeetingFilterForm(
+                data=self.context["request"].query_params
+            )
+            self.context["period"] = (
+                (filter_form.cleaned_data["from"], filter_form.cleaned_data["to"])
+                if filter_form.is_valid()
+                else None
+            )
+        return self.context["period"]
+
+    def get_next_occurrences_filter(self):
+        """
+        Return the date after which next occurrences are requested in query string and their
+        number, parsed once for all serialized meetings, or None if they were not requested.
+        """
+        if "next_occurrences_filter" not in self.context:
+            next_form = forms.MeetingNextOccurrencesForm(
+                data=self.context["request"].query_params
+            )
+            self.context["next_occurrences_filter"] = (
+                (
+                    next_form.cleaned_data["after"] or timezone.now(),
+                    next_form.cleaned_data["next"],
+                )
+                if next_form.is_valid()
+                else None
+            )
+        return self.context["next_occurrences_filter"]
+
+    def get_guests(self, instance):
+        """Serialize the guests of a meeting, using its accesses if they were prefetched."""
+        accesses = instance.accesses.all()
+        if "accesses" not in getattr(instance, "_prefetched_objects_cache", {}):
+            accesses = accesses.select_related("user", "group")
+        return NestedMeetingAccessSerializer(
+            accesses,
+            context=self.context,
+            many=True,
+        ).data
+
     def to_representation(self, instance):
-        """Add occurrences when precalculated."""
+        """Add occurrences or next occurrences when requested."""
         output = super().to_representation(instance)
 
         request = self.context.get("request")
@@ -75,31 +127,52 @@ class MeetingSerializer(serializers.ModelSerializer):
             return output
 
         user = request.user
-        is_owner = user == instance.owner
-
-        if is_owner or instance.is_guest(user):
-            guests_serializer = NestedMeetingAccessSerializer(
-                instance.accesses.select_related("user", "group").all(),
-                context=self.context,
-                many=True,
-            )
-            output["guests"] = guests_serializer.data
-
-        output["jitsi"] = {
-            "meeting": instance.jitsi_name,
-            "token": generate_token(user, instance.jitsi_name, is_admin=is_owner),
-        }
+        is_owner = user.pk == instance.owner_id
+
+        if self.is_requested("guests"):
+            try:
+                is_guest = instance.user_is_guest
+            except AttributeError:
+                is_guest = instance.is_guest(user)
+            if is_owner or is_guest:
+                output["guests"] = self.get_guests(instance)
+
+        if self.is_requested("jitsi"):
+            output["jitsi"] = {"meeting": instance.jitsi_name}
+            if settings.JITSI_TOKEN_IN_PAYLOADS:
+                output["jitsi"]["token"] = generate_token(
+                    user, instance.jitsi_name, is_admin=is_owner
+                )
 
         # Retrieve meeting occurrences if requested in query string
-        filter_form = forms.MeetingFilterForm(data=request.query_params)
-        if filter_form.is_valid():
+        period = self.get_period() if self.is_requested("occurrences") else None
+        if period:
             # Compute occurrences for time range
-            filter_from = filter_form.cleaned_data["from"]
-            filter_to = filter_form.cleaned_data["to"]
+            filter_from, filter_to = period
+            # Occurrences may have been expanded for all serialized meetings at once
+            occurrences = self.context.get("occurrences") or {}
             output["occurrences"] = {
                 "from": filter_from,
                 "to": filter_to,
-                "dates": instance.get_occurrences(filter_from, filter_to),
+                "dates": occurrences[instance.pk]
+                if instance.pk in occurrences
+                else occurrences_cache.get_occurrences(
+                    instance, filter_from, filter_to
+                ),
+            }
+
+        # Retrieve the next occurrences of the meeting if requested in query string
+        next_occurrences_filter = (
+            self.get_next_occurrences_filter()
+            if self.is_requested("next_occurrences")
+            else None
+        )
+        if next_occurrences_filter:
+            after, limit = next_occurrences_filter
+            output["next_occurrences"] = {
+                "after": after,
+                "next": limit,
+                "dates": list(instance.iter_occurrences(after=after, limit=limit)),
             }
 
         return output
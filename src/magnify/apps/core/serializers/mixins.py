@@ -0,0 +1,53 @@
+"""Mixins shared by the serializers of the core Magnify app."""
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+class SparseFieldsetsSerializerMixin:
+    """
+    Let clients restrict the fields of serialized objects by passing a comma separated list
+    of field names to include in the "fields" query parameter, or to exclude in the "omit"
+    query parameter.
+
+    Sections added in `to_representation` are listed in `computed_fields` and should only be
+    computed if `is_requested` returns True for them. Fieldsets only apply to the objects
+    serialized in response to a safe request, not to the objects nested in them.
+    """
+
+    fields_query_param = "fields"
+    omit_query_param = "omit"
+    computed_fields = []
+
+    @classmethod
+    def is_field_requested(cls, request, name):
+        """Return whether a field is requested by the query string of a request."""
+        if request is None or request.method not in SAFE_METHODS:
+            return True
+
+        fields = request.query_params.get(cls.fields_query_param)
+        if fields and name not in fields.split(","):
+            return False
+
+        omit = request.query_params.get(cls.omit_query_param)
+        return not (omit and name in omit.split(","))
+
+    def is_root(self):
+        """Return whether objects are serialized at the root of the response."""
+        return self.parent is None or (
+            isinstance(self.parent, serializers.ListSerializer)
+            and self.parent.parent is None
+        )
+
+    def is_requested(self, name):
+        """Return whether a field is requested for the objects serialized."""
+        return not self.is_root() or self.is_field_requested(
+            self.context.get("request"), name
+        )
+
+    def get_fields(self):
+        """Remove the fields that were not requested."""
+        return {
+            name: field
+            for name, field in super().get_fields().items()
+            if self.is_requested(name)
+        }
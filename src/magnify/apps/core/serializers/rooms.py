@@ -1,12 +1,15 @@
 """Serializers for the core Magnify app."""
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import exceptions, serializers
 
 from magnify.apps.core import models
+from magnify.apps.core.authorization import role_for
 from magnify.apps.core.utils import generate_token
 
 from .groups import LiteGroupSerializer
+from .mixins import SparseFieldsetsSerializerMixin
 from .users import UserSerializer
 
 
@@ -28,7 +31,9 @@ class ResourceAccessSerializerMixin:
             self.instance
             and (
                 data["role"] == models.RoleChoices.OWNER
-                and not self.instance.resource.is_owner(user)
+                and not models.RoleChoices.check_owner_role(
+                    role_for(user, self.instance.resource_id)
+                )
                 or self.instance.role == models.RoleChoices.OWNER
                 and not self.instance.user == user
             )
@@ -36,7 +41,9 @@ class ResourceAccessSerializerMixin:
             # Create
             not self.instance
             and data.get("role") == models.RoleChoices.OWNER
-            and not data["resource"].is_owner(user)
+            and not models.RoleChoices.check_owner_role(
+                role_for(user, data["resource"].pk)
+            )
         ):
             raise exceptions.PermissionDenied(
                 "Only owners of a room can assign other users as owners."
@@ -48,7 +55,7 @@ class ResourceAccessSerializerMixin:
         request = self.context.get("request", None)
         user = getattr(request, "user", None)
 
-        if not (user and user.is_authenticated and resource.is_administrator(user)):
+        if not models.RoleChoices.check_administrator_role(role_for(user, resource.pk)):
             raise exceptions.PermissionDenied(
                 _("You must be administrator or owner of a room to add accesses to it.")
             )
@@ -81,14 +88,23 @@ class NestedResourceAccessSerializer(ResourceAccessSerializer):
     group = LiteGroupSerializer(read_only=True)
 
 
-class RoomSerializer(serializers.ModelSerializer):
+class RoomSerializer(SparseFieldsetsSerializerMixin, serializers.ModelSerializer):
     """Serialize Room model for the API."""
 
+    computed_fields = ["accesses", "is_administrable", "jitsi"]
+    # Fields that can only be serialized knowing the role of the user on the room
+    role_fields = ["configuration", *computed_fields]
+
     class Meta:
         model = models.Room
         fields = ["id", "name", "slug", "configuration", "is_public"]
         read_only_fields = ["id", "slug"]
 
+    @classmethod
+    def is_role_requested(cls, request):
+        """Return whether the fields requested depend on the role of the user."""
+        return any(cls.is_field_requested(request, name) for name in cls.role_fields)
+
     def to_representation(self, instance):
         """
         Add users and groups only for administrator users.
@@ -97,29 +113,37 @@ class RoomSerializer(serializers.ModelSerializer):
         output = super().to_representation(instance)
         request = self.context.get("request")
 
-        if not request:
+        if not request or not any(self.is_requested(name) for name in self.role_fields):
             return output
 
         user = request.user
-        role = instance.get_role(user)
+        try:
+            role = instance.user_role
+        except AttributeError:
+            role = role_for(user, instance.pk)
         is_admin = models.RoleChoices.check_administrator_role(role)
 
-        if role is not None:
+        if role is not None and self.is_requested("accesses"):
+            accesses = instance.accesses.all()
+            if "accesses" not in getattr(instance, "_prefetched_objects_cache", {}):
+                accesses = accesses.select_related("group", "user")
             access_serializer = NestedResourceAccessSerializer(
-                instance.accesses.select_related("resource", "group", "user").all(),
+                accesses,
                 context=self.context,
                 many=True,
             )
             output["accesses"] = access_serializer.data
 
         if not is_admin:
-            del output["configuration"]
-
-        if role is not None or instance.is_public:
-            output["jitsi"] = {
-                "room": instance.jitsi_name,
-                "token": generate_token(user, instance.jitsi_name, is_admin=is_admin),
-            }
-        output["is_administrable"] = is_admin
+            output.pop("configuration", None)
+
+        if (role is not None or instance.is_public) and self.is_requested("jitsi"):
+            output["jitsi"] = {"room": instance.jitsi_name}
+            if settings.JITSI_TOKEN_IN_PAYLOADS:
+                output["jitsi"]["token"] = generate_token(
+                    user, instance.jitsi_name, is_admin=is_admin
+                )
+        if self.is_requested("is_administrable"):
+            output["is_administrable"] = is_admin
 
         return output
@@ -6,8 +6,10 @@ from timezone_field.rest_framework import TimeZoneSerializerField
 
 from magnify.apps.core import models, utils
 
+from .mixins import SparseFieldsetsSerializerMixin
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UserSerializer(SparseFieldsetsSerializerMixin, serializers.ModelSerializer):
     """Serialize User model for the API."""
 
     timezone = TimeZoneSerializerField(use_pytz=False, required=False)
@@ -31,7 +33,7 @@ class UserSerializer(serializers.ModelSerializer):
 
         # remove "email" field if instance is not the logged-in user
         if self.context["request"].user != instance:
-            del result["email"]
+            result.pop("email", None)
 
         return result
 
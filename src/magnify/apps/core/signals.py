@@ -0,0 +1,92 @@
+"""
+Signal receivers keeping the effective accesses of users to resources in sync with resource
+accesses and group memberships, and the users cached by the authentication in sync with the
+database.
+"""
+# pylint: disable=unused-argument
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from rest_framework_simplejwt.settings import api_settings
+
+from .authentication import DelegatedJWTAuthentication
+from .models import EffectiveResourceAccess, Group, Resource, ResourceAccess, User
+
+GROUP_CHANGES = ("post_add", "post_remove", "post_clear")
+
+
+@receiver(post_save, sender=ResourceAccess)
+def resource_access_saved(sender, instance, **kwargs):
+    """
+    Recompute the effective accesses to the resource of a saved access, and to the resource
+    it was moved from if any.
+    """
+    resources = {instance.resource_id, instance.loaded_resource_id} - {None}
+    EffectiveResourceAccess.objects.rebuild(resources=resources)
+
+
+@receiver(post_delete, sender=ResourceAccess)
+def resource_access_deleted(sender, instance, origin=None, **kwargs):
+    """
+    Recompute the effective accesses to the resource of a deleted access, unless the access
+    is deleted along with its user or its resource: their effective accesses are deleted in
+    cascade and must not be recreated before the deletion completes.
+    """
+    origin_model = getattr(origin, "model", type(origin))
+    if issubclass(origin_model, (User, Resource)):
+        return
+    EffectiveResourceAccess.objects.rebuild(resources=[instance.resource_id])
+
+
+@receiver(m2m_changed, sender=ResourceAccess)
+def resource_users_added(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Recompute the effective accesses to resources when accesses are added via related
+    managers, which bulk create them without sending `post_save` (removing accesses sends
+    `post_delete` for each of them).
+    """
+    if action != "post_add":
+        return
+    EffectiveResourceAccess.objects.rebuild(
+        resources=pk_set if reverse else [instance.pk]
+    )
+
+
+@receiver(m2m_changed, sender=Group.members.through)
+@receiver(m2m_changed, sender=Group.administrators.through)
+def group_users_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Recompute the effective accesses of users to the resources of groups of which they
+    become or cease to be members or administrators.
+    """
+    if action not in GROUP_CHANGES:
+        return
+
+    if reverse:
+        users, groups = [instance.pk], pk_set
+    else:
+        users, groups = pk_set, [instance.pk]
+
+    EffectiveResourceAccess.objects.rebuild(
+        resources=None
+        if groups is None
+        else ResourceAccess.objects.filter(group__in=groups).values("resource_id"),
+        users=users,
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """
+    Drop a saved or deleted user from the cache of the delegated JWT authentication, so that
+    the next request authenticates it from the database.
+    """
+    user_id = getattr(instance, api_settings.USER_ID_FIELD, None)
+    if user_id is None:
+        return
+    caches[settings.JWT_USER_SYNC_CACHE_ALIAS].delete(
+        DelegatedJWTAuthentication.get_sync_key(user_id)
+    )
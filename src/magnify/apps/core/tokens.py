@@ -1,10 +1,222 @@
 """Tokens for Magnify's core app."""
+import hashlib
+import hmac
+import json
+import threading
+from calendar import timegm
+from datetime import timedelta
+from json.encoder import encode_basestring_ascii
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from jwt.algorithms import HMACAlgorithm
+from jwt.utils import base64url_encode
 from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import Token
 
+from .jwks import JWKSCacheTokenBackend, jwks_cache
+from .lru import LRUCache
+
 
 class BearerToken(Token):
     """Bearer token as emitted by Keycloak OIDC for example."""
 
     token_type = "Bearer"  # nosec
     lifetime = api_settings.ACCESS_TOKEN_LIFETIME
+
+    def get_token_backend(self):
+        """Verify signatures with the keys of the JWKS cache when a JWKS url is set."""
+        if jwks_cache.get_url():
+            return JWKSCacheTokenBackend.get_instance()
+        return super().get_token_backend()
+
+
+def dumps(value):
+    """Serialize a value to JSON exactly like PyJWT does for the claims of a payload."""
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    return json.dumps(value, separators=(",", ":"))
+
+
+class JitsiTokenFactory:
+    """
+    Sign the Jitsi tokens of users in rooms with the parts that only depend on settings
+    computed once: the encoded header, the static claims, the context of guests and the
+    HMAC key.
+
+    Tokens are byte-identical to the tokens PyJWT encodes from the payload returned by
+    `magnify.apps.core.utils.create_token_payload`: claims are serialized in the same order
+    and with the same separators.
+    """
+
+    algorithm = "HS256"
+    instance = None
+
+    def __init__(self, configuration):
+        self.configuration = configuration
+        self.expiration = timedelta(
+            seconds=int(configuration["jitsi_token_expiration_seconds"])
+        )
+
+        issuer = configuration["jitsi_app_id"]
+        if not isinstance(issuer, str):
+            raise TypeError("Issuer (iss) must be a string.")
+
+        header = {"typ": "JWT", "alg": self.algorithm}
+        self.header_segment = base64url_encode(
+            json.dumps(header, separators=(",", ":"), sort_keys=True).encode()
+        )
+        self.static_claims = (
+            f',"aud":"jitsi","iss":{dumps(issuer):s}'
+            f',"sub":{dumps(configuration["jitsi_xmpp_domain"]):s},"room":'
+        )
+        self.avatar = dumps(configuration.get("jitsi_guest_avatar"))
+        self.guest_context = (
+            f',"context":{{"user":{{"avatar":{self.avatar:s}'
+            f',"name":{dumps(configuration.get("jitsi_guest_username")):s}'
+            ',"email":""}}}'
+        )
+
+        key = HMACAlgorithm(HMACAlgorithm.SHA256).prepare_key(
+            configuration["jitsi_secret_key"]
+        )
+        self.hmac = hmac.new(key, digestmod=hashlib.sha256)
+
+    def create_token(self, user, room, is_admin=False):
+        """
+        Returns the token giving access to the room passed in argument and the date at which
+        it expires.
+        """
+        issued_at = timezone.now()
+        expires_at = issued_at + self.expiration
+
+        if user.is_authenticated:
+            context = (
+                f',"context":{{"user":{{"avatar":{self.avatar:s}'
+                f',"name":{dumps(user.username):s},"email":{dumps(user.email):s}}}}}}}'
+            )
+        else:
+            context = self.guest_context
+
+        payload = (
+            f'{{"exp":{timegm(expires_at.utctimetuple()):d}'
+            f',"iat":{timegm(issued_at.utctimetuple()):d}'
+            f',"moderator":{dumps(is_admin or user.is_staff):s}'
+            f"{self.static_claims:s}{dumps(room):s}{context:s}"
+        )
+        signing_input = b".".join(
+            (self.header_segment, base64url_encode(payload.encode()))
+        )
+
+        signature = self.hmac.copy()
+        signature.update(signing_input)
+        token = b".".join((signing_input, base64url_encode(signature.digest())))
+        return token.decode(), expires_at
+
+    @classmethod
+    def get_instance(cls):
+        """
+        Returns the factory built from the current Jitsi settings, building it again only
+        when the settings are replaced.
+        """
+        configuration = settings.JITSI_CONFIGURATION
+        if cls.instance is None or cls.instance.configuration is not configuration:
+            cls.instance = cls(configuration)
+        return cls.instance
+
+
+class JitsiTokensCache:
+    """
+    Cache the Jitsi tokens signed for users in rooms in two tiers: a local LRU cache in the
+    memory of the process in front of an optional Django cache shared by all processes.
+
+    Tokens are cached under the inputs they are generated from and handed back as long as
+    more than a fraction of their lifetime remains, so that a client always gets a token
+    valid long enough to join the room. The cache is disabled unless a size or a shared
+    cache is configured.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = LRUCache("JITSI_TOKEN_CACHE_SIZE")
+        self.shared_hits = self.misses = 0
+
+    @staticmethod
+    def is_enabled():
+        """Returns whether tokens should be cached."""
+        return bool(settings.JITSI_TOKEN_CACHE_SIZE or settings.JITSI_TOKEN_CACHE_ALIAS)
+
+    @staticmethod
+    def get_shared_key(key):
+        """Returns the key of a token in the shared tier, not exposing the secret key."""
+        fingerprint = hashlib.sha256(repr(key).encode()).hexdigest()
+        return f"jitsi-token:{fingerprint:s}"
+
+    @staticmethod
+    def get_min_remaining_seconds():
+        """Returns the number of seconds a token must remain valid to be handed back."""
+        return settings.JITSI_TOKEN_CACHE_MIN_REMAINING * int(
+            settings.JITSI_CONFIGURATION["jitsi_token_expiration_seconds"]
+        )
+
+    def get_stats(self):
+        """Returns the counters of the cache to help sizing it."""
+        local_stats = self.local.get_stats()
+        with self.lock:
+            return {
+                "local_hits": local_stats["hits"],
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "local_size": local_stats["size"],
+                "local_max_size": local_stats["max_size"],
+            }
+
+    def get(self, key):
+        """
+        Returns the token cached for the inputs passed in argument if it remains valid long
+        enough, or None.
+        """
+        deadline = timezone.now().timestamp() + self.get_min_remaining_seconds()
+
+        token = self.local.get(key, deadline=deadline)
+        if token is not None:
+            return token
+
+        if settings.JITSI_TOKEN_CACHE_ALIAS:
+            entry = caches[settings.JITSI_TOKEN_CACHE_ALIAS].get(
+                self.get_shared_key(key)
+            )
+            if entry is not None and entry[1] > deadline:
+                self.local.set(key, *entry)
+                with self.lock:
+                    self.shared_hits += 1
+                return entry[0]
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, token, expires_at):
+        """Cache a token signed for the inputs passed in argument until it is too old."""
+        entry = (token, expires_at.timestamp())
+        self.local.set(key, *entry)
+
+        if settings.JITSI_TOKEN_CACHE_ALIAS:
+            timeout = (
+                entry[1] - timezone.now().timestamp() - self.get_min_remaining_seconds()
+            )
+            if timeout > 0:
+                caches[settings.JITSI_TOKEN_CACHE_ALIAS].set(
+                    self.get_shared_key(key), entry, timeout
+                )
+
+    def clear(self):
+        """Drop all the tokens of the local tier and reset the counters."""
+        self.local.clear()
+        with self.lock:
+            self.shared_hits = self.misses = 0
+
+
+jitsi_tokens_cache = JitsiTokensCache()
@@ -42,6 +42,16 @@ urlpatterns = [
         api.get_frontend_configuration,
         name="api-configuration",
     ),
+    path(
+        "cache-stats/",
+        api.get_cache_stats,
+        name="api-cache-stats",
+    ),
+    path(
+        "calendars/<str:token>.ics",
+        api.get_user_calendar,
+        name="user-calendar",
+    ),
     path(
         "accounts/token-refresh/",
         jwt_views.TokenRefreshView.as_view(),
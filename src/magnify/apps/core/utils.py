@@ -1,14 +1,28 @@
 """
 Utils that can be useful throughout Magnify's core app
 """
+import heapq
+from calendar import monthrange
 from datetime import date, timedelta
+from math import gcd
 
 from django.conf import settings
 from django.utils import timezone
 
-import jwt
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from .tokens import JitsiTokenFactory, jitsi_tokens_cache
+
+# Jitsi settings from which tokens are generated
+JITSI_TOKEN_SETTINGS = (
+    "jitsi_app_id",
+    "jitsi_guest_avatar",
+    "jitsi_guest_username",
+    "jitsi_secret_key",
+    "jitsi_token_expiration_seconds",
+    "jitsi_xmpp_domain",
+)
+
 
 def get_date_of_weekday_in_nth_week(year, month, nth_week, week_day):
     """
@@ -44,6 +58,72 @@ def get_nth_week_number(original_date):
     return nb_weeks
 
 
+def get_day_after_months(original_date, months, nb_periods):
+    """
+    Returns the day of the month reached when adding a number of months to the date passed in
+    argument a number of times in a row, one period after the other. Each step clips the day to
+    the length of the month reached and, like with chained `relativedelta`, the clipping carries
+    over to the following periods.
+    e.g. January 31, 2023 + 1 month is February 28, 2023, and + 1 month again is March 28,
+    2023 so:
+
+    > get_day_after_months(date(2023, 1, 31), 1, 2)
+    28
+    """
+    day = original_date.day
+    if day <= 28:
+        return day
+
+    month_index = original_date.year * 12 + original_date.month - 1
+    # The months of the year reached repeat every `cycle` periods. Only February can shorten
+    # the day again after a first cycle, depending on leap years that repeat every 400 years.
+    cycle = 12 // gcd(months, 12)
+    has_february = any(
+        (month_index + period * months) % 12 == 1 for period in range(1, cycle + 1)
+    )
+    for period in range(1, min(nb_periods, 400 * cycle if has_february else cycle) + 1):
+        year, month = divmod(month_index + period * months, 12)
+        day = min(day, monthrange(year, month + 1)[1])
+        if day == 28:
+            break
+    return day
+
+
+def get_occurrences_horizon():
+    """
+    Returns the date up to which the occurrences of infinite recurrences are materialized
+    in database.
+    """
+    return timezone.now() + timedelta(days=settings.MEETING_OCCURRENCES_HORIZON_DAYS)
+
+
+def get_occurrences_retention():
+    """
+    Returns the date from which the occurrences of recurrences are materialized in database
+    when their recurrence changes.
+    """
+    return timezone.now() - timedelta(days=settings.MEETING_OCCURRENCES_RETENTION_DAYS)
+
+
+def merge_intervals(intervals_lists):
+    """
+    Returns the union of the time intervals passed in argument as a list of disjoint
+    `(start, end)` intervals in chronological order. Intervals that overlap or touch each
+    other are merged.
+
+    Intervals are passed as several lists, each of them sorted by start date (e.g. the
+    occurrences of a meeting): they are merged in O(n log k) with a heap and swept once.
+    """
+    merged = []
+    for start, end in heapq.merge(*intervals_lists):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
 def create_token_payload(user, room, is_admin=False):
     """Create the payload so that it contains each information jitsi requires"""
     expiration_seconds = int(
@@ -71,15 +151,35 @@ def create_token_payload(user, room, is_admin=False):
     return token_payload
 
 
+def get_token_cache_key(user, room, is_admin=False):
+    """Returns the inputs from which the token of a user in a room is generated."""
+    return (
+        room,
+        is_admin or user.is_staff,
+        user.username if user.is_authenticated else None,
+        user.email if user.is_authenticated else None,
+        *(settings.JITSI_CONFIGURATION.get(name) for name in JITSI_TOKEN_SETTINGS),
+    )
+
+
 def generate_token(user, room, is_admin=False):
-    """Generate the access token that will give access to the room"""
-    token_payload = create_token_payload(user, room, is_admin=is_admin)
-    token = jwt.encode(
-        token_payload,
-        settings.JITSI_CONFIGURATION["jitsi_secret_key"],
-        algorithm="HS256",
+    """
+    Generate the access token that will give access to the room, or hand back a token
+    generated for the same inputs when tokens are cached.
+    """
+    cache_key = None
+    if jitsi_tokens_cache.is_enabled():
+        cache_key = get_token_cache_key(user, room, is_admin=is_admin)
+        token = jitsi_tokens_cache.get(cache_key)
+        if token is not None:
+            return token
+
+    token, expires_at = JitsiTokenFactory.get_instance().create_token(
+        user, room, is_admin=is_admin
     )
 
+    if cache_key is not None:
+        jitsi_tokens_cache.set(cache_key, token, expires_at)
     return token
 
 
@@ -0,0 +1,162 @@
+"""
+Tests for room busy intervals API endpoint in Magnify's core app.
+"""
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from magnify.apps.core.factories import MeetingFactory, RoomFactory, UserFactory
+
+
+class BusyRoomsApiTestCase(APITestCase):
+    """Test requests on magnify's core app room busy intervals API endpoint."""
+
+    def test_api_room_busy_anonymous(self):
+        """
+        Anonymous users should get busy intervals merged from the meetings of a room without
+        any meeting payload.
+        """
+        room = RoomFactory(is_public=True)
+        MeetingFactory(  # Daily from 9:00 to 10:00
+            room=room,
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 7, 10, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            recurring_until=None,
+            timezone=ZoneInfo("UTC"),
+            is_public=True,
+        )
+        MeetingFactory(  # Overlaps the daily meeting of July 8
+            room=room,
+            start=datetime(2022, 7, 8, 9, 30, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 8, 11, 0, tzinfo=ZoneInfo("UTC")),
+            is_public=True,
+        )
+        MeetingFactory(  # Touches the daily meeting of July 9
+            room=room,
+            start=datetime(2022, 7, 9, 8, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 9, 9, 0, tzinfo=ZoneInfo("UTC")),
+            is_public=True,
+        )
+        MeetingFactory(  # Private meetings make the room busy without being disclosed
+            room=room,
+            start=datetime(2022, 7, 8, 14, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 8, 15, 0, tzinfo=ZoneInfo("UTC")),
+            is_public=False,
+        )
+
+        response = self.client.get(
+            f"/api/rooms/{room.id!s}/busy/?"
+            "from=2022-07-08T00:00:00Z&to=2022-07-09T23:59:00Z"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "from": "2022-07-08T00:00:00Z",
+                "to": "2022-07-09T23:59:00Z",
+                "busy": [
+                    ["2022-07-08T09:00:00Z", "2022-07-08T11:00:00Z"],
+                    ["2022-07-08T14:00:00Z", "2022-07-08T15:00:00Z"],
+                    ["2022-07-09T08:00:00Z", "2022-07-09T10:00:00Z"],
+                ],
+            },
+        )
+
+    def test_api_room_busy_authenticated_related(self):
+        """Private meetings related to the authenticated user should make the room busy."""
+        user = UserFactory()
+        jwt_token = AccessToken.for_user(user)
+        room = RoomFactory(is_public=True)
+        MeetingFactory(
+            room=room,
+            start=datetime(2022, 7, 8, 14, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 8, 15, 0, tzinfo=ZoneInfo("UTC")),
+            is_public=False,
+            owner=user,
+        )
+
+        response = self.client.get(
+            f"/api/rooms/{room.id!s}/busy/?"
+            "from=2022-07-08T00:00:00Z&to=2022-07-09T23:59:00Z",
+            HTTP_AUTHORIZATION=f"Bearer {jwt_token}",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["busy"],
+            [["2022-07-08T14:00:00Z", "2022-07-08T15:00:00Z"]],
+        )
+
+    def test_api_room_busy_overlap(self):
+        """
+        Occurrences still running at the start of the period should make the room busy, but
+        not the ones that end when the period starts or start when it ends.
+        """
+        room = RoomFactory(is_public=True)
+        MeetingFactory(  # Daily from 23:00 to 1:00
+            room=room,
+            start=datetime(2022, 7, 1, 23, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 2, 1, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            recurring_until=None,
+            timezone=ZoneInfo("UTC"),
+            is_public=False,
+        )
+        MeetingFactory(  # Ends when the period starts
+            room=room,
+            start=datetime(2022, 7, 8, 8, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 8, 10, 0, tzinfo=ZoneInfo("UTC")),
+        )
+        MeetingFactory(  # Starts when the period ends
+            room=room,
+            start=datetime(2022, 7, 8, 20, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 8, 21, 0, tzinfo=ZoneInfo("UTC")),
+        )
+        MeetingFactory(  # Started the day before and still running
+            room=room,
+            start=datetime(2022, 7, 7, 12, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 8, 11, 0, tzinfo=ZoneInfo("UTC")),
+        )
+
+        response = self.client.get(
+            f"/api/rooms/{room.id!s}/busy/?"
+            "from=2022-07-08T10:00:00Z&to=2022-07-08T20:00:00Z"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["busy"],
+            [["2022-07-07T12:00:00Z", "2022-07-08T11:00:00Z"]],
+        )
+
+        response = self.client.get(
+            f"/api/rooms/{room.id!s}/busy/?"
+            "from=2022-07-09T00:30:00Z&to=2022-07-09T12:00:00Z"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["busy"],
+            [["2022-07-08T23:00:00Z", "2022-07-09T01:00:00Z"]],
+        )
+
+    def test_api_room_busy_filter_required(self):
+        """The "from" and "to" filters are required."""
+        room = RoomFactory(is_public=True)
+
+        response = self.client.get(f"/api/rooms/{room.id!s}/busy/")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            {
+                "errors": {
+                    "from": ["This field is required."],
+                    "to": ["This field is required."],
+                }
+            },
+        )
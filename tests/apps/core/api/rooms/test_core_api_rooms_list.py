@@ -112,3 +112,40 @@ class ListRoomsApiTestCase(APITestCase):
         content = response.json()
         self.assertEqual(len(content["results"]), 1)
         self.assertEqual(content["results"][0]["id"], str(room.id))
+
+    def test_api_rooms_list_authenticated_constant_queries(self):
+        """
+        The number of queries to list rooms should not depend on the number of rooms, their
+        accesses or the role of the user on them.
+        """
+        user = UserFactory()
+        jwt_token = AccessToken.for_user(user)
+        group = GroupFactory(members=[user])
+
+        for role in ["member", "administrator", "owner"]:
+            RoomFactory(users=[(user, role), UserFactory()], groups=[GroupFactory()])
+        RoomFactory(groups=[(group, "administrator")])
+
+        # Authentication, count for pagination, rooms with the role of the user, accesses
+        with self.assertNumQueries(4):
+            response = self.client.get(
+                "/api/rooms/", HTTP_AUTHORIZATION=f"Bearer {jwt_token}"
+            )
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(len(results), 4)
+        self.assertEqual(
+            sorted(result["is_administrable"] for result in results),
+            [False, True, True, True],
+        )
+        self.assertEqual(
+            sorted(len(result["accesses"]) for result in results), [1, 3, 3, 3]
+        )
+
+        RoomFactory.create_batch(3, users=[user, UserFactory()])
+        with self.assertNumQueries(4):
+            response = self.client.get(
+                "/api/rooms/", HTTP_AUTHORIZATION=f"Bearer {jwt_token}"
+            )
+        self.assertEqual(len(response.json()["results"]), 7)
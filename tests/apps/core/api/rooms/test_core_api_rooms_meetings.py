@@ -419,3 +419,43 @@ class MeetingsRoomsApiTestCase(APITestCase):
             },
         )
         mock_token.assert_called_once()
+
+    def test_api_room_meetings_authenticated_constant_queries(self, _mock_token):
+        """
+        The number of queries to list the meetings of a room should not depend on the number
+        of meetings, their guests or the relation of the user to them.
+        """
+        user = UserFactory()
+        jwt_token = AccessToken.for_user(user)
+        group = GroupFactory(members=[user])
+        room = RoomFactory()
+        start = datetime(2022, 7, 12, 9, 0, tzinfo=ZoneInfo("UTC"))
+        end = datetime(2022, 7, 12, 10, 0, tzinfo=ZoneInfo("UTC"))
+
+        def create_meetings():
+            MeetingFactory(room=room, start=start, end=end, owner=user)
+            MeetingFactory(
+                room=room, start=start, end=end, users=[user], is_public=False
+            )
+            MeetingFactory(room=room, start=start, end=end, groups=[group])
+            MeetingFactory(room=room, start=start, end=end, is_public=True)
+
+        create_meetings()
+        url = (
+            f"/api/rooms/{room.id!s}/meetings/?"
+            "from=2022-07-11T00:00:00Z&to=2022-07-17T23:59:00Z"
+        )
+
+        # Authentication, room, meetings, accesses
+        with self.assertNumQueries(4):
+            response = self.client.get(url, HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()
+        self.assertEqual(len(results), 4)
+        self.assertEqual(sum("guests" in result for result in results), 3)
+
+        create_meetings()
+        with self.assertNumQueries(4):
+            response = self.client.get(url, HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+        self.assertEqual(len(response.json()), 8)
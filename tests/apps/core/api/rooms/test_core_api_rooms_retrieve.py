@@ -260,7 +260,7 @@ class RetrieveRoomsApiTestCase(APITestCase):
         group_access = GroupResourceAccessFactory(resource=room, group=group)
         jwt_token = AccessToken.for_user(user)
 
-        with self.assertNumQueries(4):
+        with self.assertNumQueries(3):
             response = self.client.get(
                 f"/api/rooms/{room.id!s}/", HTTP_AUTHORIZATION=f"Bearer {jwt_token}"
             )
@@ -353,7 +353,7 @@ class RetrieveRoomsApiTestCase(APITestCase):
         )
         jwt_token = AccessToken.for_user(user)
 
-        with self.assertNumQueries(4):
+        with self.assertNumQueries(3):
             response = self.client.get(
                 f"/api/rooms/{room.id!s}/", HTTP_AUTHORIZATION=f"Bearer {jwt_token}"
             )
@@ -437,7 +437,7 @@ class RetrieveRoomsApiTestCase(APITestCase):
         group_access = GroupResourceAccessFactory(resource=room, group=group)
         jwt_token = AccessToken.for_user(user)
 
-        with self.assertNumQueries(4):
+        with self.assertNumQueries(3):
             response = self.client.get(
                 f"/api/rooms/{room.id!s}/", HTTP_AUTHORIZATION=f"Bearer {jwt_token}"
             )
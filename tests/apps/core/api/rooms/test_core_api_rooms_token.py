@@ -0,0 +1,149 @@
+"""
+Tests for the room token API endpoint in Magnify's core app.
+"""
+from unittest import mock
+
+from django.test.utils import override_settings
+
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from magnify.apps.core.factories import RoomFactory, UserFactory
+
+
+@mock.patch("magnify.apps.core.utils.generate_token", return_value="the token")
+class TokenRoomsApiTestCase(APITestCase):
+    """Test requests on magnify's core app room token API endpoint."""
+
+    def test_api_rooms_token_anonymous_public(self, mock_token):
+        """Anonymous users should get a token for a public room."""
+        room = RoomFactory(is_public=True)
+
+        # Room with the role of the user
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/rooms/{room.id!s}/token/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {"room": str(room.id).replace("-", ""), "token": "the token"},
+        )
+        mock_token.assert_called_once_with(
+            mock.ANY, str(room.id).replace("-", ""), is_admin=False
+        )
+
+    def test_api_rooms_token_anonymous_private(self, mock_token):
+        """Anonymous users should not get a token for a private room."""
+        room = RoomFactory(is_public=False)
+
+        response = self.client.get(f"/api/rooms/{room.slug:s}/token/")
+
+        self.assertEqual(response.status_code, 401)
+        mock_token.assert_not_called()
+
+    def test_api_rooms_token_authenticated_unrelated_private(self, mock_token):
+        """Authenticated users should not get a token for a private room they are not in."""
+        room = RoomFactory(is_public=False)
+        jwt_token = AccessToken.for_user(UserFactory())
+
+        response = self.client.get(
+            f"/api/rooms/{room.id!s}/token/", HTTP_AUTHORIZATION=f"Bearer {jwt_token}"
+        )
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(
+            response.json(), {"detail": "You must be related to this room to join it."}
+        )
+        mock_token.assert_not_called()
+
+    def test_api_rooms_token_authenticated_member_private(self, mock_token):
+        """Members of a private room should get a token that is not moderator."""
+        user = UserFactory()
+        room = RoomFactory(is_public=False, users=[(user, "member")])
+        jwt_token = AccessToken.for_user(user)
+
+        # Authentication, room with the role of the user
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                f"/api/rooms/{room.id!s}/token/",
+                HTTP_AUTHORIZATION=f"Bearer {jwt_token}",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["token"], "the token")
+        mock_token.assert_called_once_with(
+            user, str(room.id).replace("-", ""), is_admin=False
+        )
+
+    def test_api_rooms_token_authenticated_administrator(self, mock_token):
+        """Administrators of a room should get a moderator token."""
+        user = UserFactory()
+        room = RoomFactory(is_public=False, users=[(user, "administrator")])
+        jwt_token = AccessToken.for_user(user)
+
+        response = self.client.get(
+            f"/api/rooms/{room.id!s}/token/", HTTP_AUTHORIZATION=f"Bearer {jwt_token}"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        mock_token.assert_called_once_with(
+            user, str(room.id).replace("-", ""), is_admin=True
+        )
+
+    @override_settings(ALLOW_UNREGISTERED_ROOMS=True)
+    def test_api_rooms_token_unregistered_allowed(self, mock_token):
+        """Anybody should get a moderator token for an unregistered room when allowed."""
+        response = self.client.get("/api/rooms/unregistered-room/token/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), {"room": "unregistered-room", "token": "the token"}
+        )
+        mock_token.assert_called_once_with(mock.ANY, "unregistered-room", is_admin=True)
+
+    @override_settings(ALLOW_UNREGISTERED_ROOMS=False)
+    def test_api_rooms_token_unregistered_not_allowed(self, mock_token):
+        """Unregistered rooms should return a 404 when they are not allowed."""
+        response = self.client.get("/api/rooms/unregistered-room/token/")
+
+        self.assertEqual(response.status_code, 404)
+        mock_token.assert_not_called()
+
+    @override_settings(JITSI_TOKEN_IN_PAYLOADS=False)
+    def test_api_rooms_token_not_in_payloads(self, mock_token):
+        """
+        Rooms listed or retrieved should not include a token when tokens are only issued by
+        the token endpoint.
+        """
+        user = UserFactory()
+        room = RoomFactory(is_public=False, users=[user])
+        jwt_token = AccessToken.for_user(user)
+
+        with mock.patch(
+            "magnify.apps.core.serializers.rooms.generate_token"
+        ) as mock_serializer_token:
+            response = self.client.get(
+                "/api/rooms/", HTTP_AUTHORIZATION=f"Bearer {jwt_token}"
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                response.json()["results"][0]["jitsi"],
+                {"room": str(room.id).replace("-", "")},
+            )
+
+            response = self.client.get(
+                f"/api/rooms/{room.id!s}/", HTTP_AUTHORIZATION=f"Bearer {jwt_token}"
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                response.json()["jitsi"], {"room": str(room.id).replace("-", "")}
+            )
+
+            response = self.client.get("/api/rooms/unregistered-room/")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                response.json(), {"id": None, "jitsi": {"room": "unregistered-room"}}
+            )
+
+        mock_serializer_token.assert_not_called()
+        mock_token.assert_not_called()
@@ -3,6 +3,9 @@ Tests for Rooms API endpoints in Magnify's core app: update
 """
 import random
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import AccessToken
 
@@ -175,3 +178,29 @@ class UpdateRoomsApiTestCase(APITestCase):
         other_room.refresh_from_db()
         self.assertEqual(other_room.name, "Old name")
         self.assertEqual(other_room.slug, "old-name")
+
+    def test_api_rooms_update_role_looked_up_once(self):
+        """
+        The role of the user should be looked up once for permissions and serialization of
+        the room updated.
+        """
+        user = UserFactory()
+        room = RoomFactory(users=[(user, "administrator")])
+        jwt_token = AccessToken.for_user(user)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(
+                f"/api/rooms/{room.id!s}/",
+                {"name": "New name"},
+                format="json",
+                HTTP_AUTHORIZATION=f"Bearer {jwt_token}",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["is_administrable"])
+        role_queries = [
+            query
+            for query in context.captured_queries
+            if 'FROM "magnify_effective_resource_access"' in query["sql"]
+        ]
+        self.assertEqual(len(role_queries), 1)
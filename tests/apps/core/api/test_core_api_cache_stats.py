@@ -0,0 +1,50 @@
+"""
+Tests for API endpoint for the counters of caches.
+"""
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from magnify.apps.core.factories import UserFactory
+
+
+class CacheStatsTestCase(APITestCase):
+    """Test requests on magnify's core app cache stats endpoint."""
+
+    def test_api_get_cache_stats_anonymous(self):
+        """Anonymous users should not be allowed to get the counters of caches."""
+        response = self.client.get("/api/cache-stats/")
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_api_get_cache_stats_authenticated(self):
+        """Authenticated users who are not staff should not get the counters of caches."""
+        jwt_token = AccessToken.for_user(UserFactory())
+
+        response = self.client.get(
+            "/api/cache-stats/", HTTP_AUTHORIZATION=f"Bearer {jwt_token}"
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_api_get_cache_stats_staff(self):
+        """Staff users should get the counters of the caches of the process."""
+        jwt_token = AccessToken.for_user(UserFactory(is_staff=True))
+
+        response = self.client.get(
+            "/api/cache-stats/", HTTP_AUTHORIZATION=f"Bearer {jwt_token}"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        stats = response.json()
+        for name in ["occurrences", "jitsi_tokens"]:
+            self.assertEqual(
+                set(stats[name]),
+                {"local_hits", "shared_hits", "misses", "local_size", "local_max_size"},
+            )
+        self.assertEqual(
+            set(stats["validated_tokens"]), {"hits", "misses", "size", "max_size"}
+        )
+        self.assertEqual(set(stats["jwks"]), {"fetches", "failures", "age"})
+        self.assertEqual(
+            set(stats["user_sync"]), {"created", "updated", "skipped", "skipped_ratio"}
+        )
@@ -0,0 +1,322 @@
+"""
+Tests for the iCalendar feeds API endpoints in Magnify's core app.
+"""
+from datetime import datetime
+from io import StringIO
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.core.management import call_command
+
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from magnify.apps.core import ical
+from magnify.apps.core.factories import GroupFactory, MeetingFactory, UserFactory
+
+
+@mock.patch(
+    "django.utils.timezone.now",
+    return_value=datetime(2022, 7, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+)
+class CalendarsApiTestCase(APITestCase):
+    """Test requests on magnify's core app iCalendar feeds API endpoints."""
+
+    @staticmethod
+    def get_calendar_url(user):
+        """Return the url of the calendar of a user."""
+        return f"/api/calendars/{ical.get_calendar_token(user):s}.ics"
+
+    def get_calendar(self, user, **extra):
+        """Fetch the calendar of a user and return its content lines."""
+        response = self.client.get(self.get_calendar_url(user), **extra)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        return b"".join(response.streaming_content).decode().split("\r\n")
+
+    def test_api_calendars_url_anonymous(self, _mock_now):
+        """Anonymous users should not be allowed to get a calendar url."""
+        response = self.client.get("/api/users/me/calendar/")
+        self.assertEqual(response.status_code, 401)
+
+    def test_api_calendars_url_authenticated(self, _mock_now):
+        """Authenticated users should get the url of their own calendar."""
+        user = UserFactory()
+        jwt_token = AccessToken.for_user(user)
+
+        response = self.client.get(
+            "/api/users/me/calendar/", HTTP_AUTHORIZATION=f"Bearer {jwt_token}"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), {"url": f"http://testserver{self.get_calendar_url(user)}"}
+        )
+
+    def test_api_calendars_invalid_token(self, _mock_now):
+        """A calendar should not be served for a token that was not signed by us."""
+        response = self.client.get(f"/api/calendars/{UserFactory().id!s}.ics")
+        self.assertEqual(response.status_code, 404)
+
+    def test_api_calendars_events(self, _mock_now):
+        """
+        The calendar should contain one event with its recurrence rule for each meeting
+        related to the user.
+        """
+        user = UserFactory()
+        group = GroupFactory(members=[user])
+        weekly = MeetingFactory(
+            owner=user,
+            name="Weekly, review; at 9",
+            start=datetime(2022, 7, 4, 7, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 4, 8, 0, tzinfo=ZoneInfo("UTC")),
+            timezone=ZoneInfo("Europe/Paris"),
+            recurrence="weekly",
+            frequency=2,
+            weekdays="03",
+            recurring_until=None,
+        )
+        monthly = MeetingFactory(
+            groups=[group],
+            name="Monthly",
+            start=datetime(2022, 7, 19, 9, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 19, 10, 0, tzinfo=ZoneInfo("UTC")),
+            timezone=ZoneInfo("UTC"),
+            recurrence="monthly",
+            frequency=1,
+            monthly_type="nth_day",
+            nb_occurrences=3,
+        )
+        MeetingFactory()  # Not related to the user
+
+        lines = self.get_calendar(user)
+
+        self.assertEqual(
+            lines[:4],
+            [
+                "BEGIN:VCALENDAR",
+                "VERSION:2.0",
+                "PRODID:-//Magnify//Meetings//EN",
+                "CALSCALE:GREGORIAN",
+            ],
+        )
+        self.assertEqual(lines[-2:], ["END:VCALENDAR", ""])
+        self.assertIn(
+            "\r\n".join(
+                [
+                    "BEGIN:VEVENT",
+                    f"UID:{weekly.id!s}",
+                    "DTSTAMP:20220701T090000Z",
+                    "DTSTART;TZID=Europe/Paris:20220704T090000",
+                    "DTEND;TZID=Europe/Paris:20220704T100000",
+                    "SUMMARY:Weekly\\, review\\; at 9",
+                    "RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH",
+                    "END:VEVENT",
+                ]
+            ),
+            "\r\n".join(lines),
+        )
+        self.assertIn(
+            "\r\n".join(
+                [
+                    "BEGIN:VEVENT",
+                    f"UID:{monthly.id!s}",
+                    "DTSTAMP:20220701T090000Z",
+                    "DTSTART;TZID=UTC:20220719T090000",
+                    "DTEND;TZID=UTC:20220719T100000",
+                    "SUMMARY:Monthly",
+                    "RRULE:FREQ=MONTHLY;BYDAY=3TU;COUNT=3",
+                    "END:VEVENT",
+                ]
+            ),
+            "\r\n".join(lines),
+        )
+        self.assertEqual(lines.count("BEGIN:VEVENT"), 2)
+        self.assertEqual(
+            [line for line in lines if line.startswith("TZID:")],
+            ["TZID:Europe/Paris", "TZID:UTC"],
+        )
+        self.assertIn(
+            "\r\n".join(
+                [
+                    "BEGIN:STANDARD",
+                    "DTSTART:20221030T030000",
+                    "TZOFFSETFROM:+0200",
+                    "TZOFFSETTO:+0100",
+                    "TZNAME:CET",
+                    "END:STANDARD",
+                ]
+            ),
+            "\r\n".join(lines),
+        )
+
+    def test_api_calendars_recurrence_rules(self, _mock_now):
+        """
+        Recurrences should be described by the same rules as the API: by an RRULE when it
+        yields the same dates, and by listing their occurrences otherwise.
+        """
+        user = UserFactory()
+        # The day is clipped to the end of shorter months and stays clipped
+        clipped = MeetingFactory(
+            owner=user,
+            start=datetime(2022, 8, 31, 7, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 8, 31, 8, 0, tzinfo=ZoneInfo("UTC")),
+            timezone=ZoneInfo("UTC"),
+            recurrence="monthly",
+            frequency=1,
+            monthly_type="date_day",
+            nb_occurrences=4,
+        )
+        # The occurrences of the first sunday of a month are walked
+        walked = MeetingFactory(
+            owner=user,
+            start=datetime(2022, 7, 3, 7, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 3, 8, 0, tzinfo=ZoneInfo("UTC")),
+            timezone=ZoneInfo("UTC"),
+            recurrence="monthly",
+            frequency=1,
+            monthly_type="nth_day",
+            nb_occurrences=3,
+        )
+
+        calendar = "\r\n".join(self.get_calendar(user))
+
+        events = {}
+        for event in calendar.split("BEGIN:VEVENT")[1:]:
+            uid = event.split("\r\n", maxsplit=2)[1]
+            events[uid] = event.split("END:VEVENT", maxsplit=1)[0]
+        self.assertNotIn("RRULE", events[f"UID:{clipped.id!s}"])
+        self.assertIn(
+            "RDATE;TZID=UTC:20220930T070000,20221030T070000,20221130T070000",
+            events[f"UID:{clipped.id!s}"],
+        )
+        self.assertNotIn("RRULE", events[f"UID:{walked.id!s}"])
+        rdates = ",".join(
+            f"{occurrence:%Y%m%dT%H%M%S}"
+            for occurrence in walked.get_occurrences(
+                walked.start, walked.recurring_until
+            )[1:]
+        )
+        self.assertIn(f"RDATE;TZID=UTC:{rdates:s}", events[f"UID:{walked.id!s}"])
+
+    def test_api_calendars_reset_url(self, _mock_now):
+        """Posting to the calendar url endpoint should revoke the urls returned so far."""
+        user = UserFactory()
+        jwt_token = AccessToken.for_user(user)
+        url = self.get_calendar_url(user)
+
+        response = self.client.post(
+            "/api/users/me/calendar/", HTTP_AUTHORIZATION=f"Bearer {jwt_token}"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+        self.assertEqual(
+            response.json(), {"url": f"http://testserver{self.get_calendar_url(user)}"}
+        )
+        self.assertNotEqual(self.get_calendar_url(user), url)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.get_calendar(user)
+
+    def test_api_calendars_fold_long_lines(self, _mock_now):
+        """Content lines longer than 75 octets should be folded."""
+        user = UserFactory()
+        MeetingFactory(owner=user, name="é" * 50)
+
+        lines = self.get_calendar(user)
+
+        summary = next(i for i, line in enumerate(lines) if line.startswith("SUMMARY"))
+        self.assertTrue(all(len(line.encode()) <= 75 for line in lines))
+        self.assertEqual(lines[summary] + lines[summary + 1][1:], "SUMMARY:" + "é" * 50)
+
+    def test_api_calendars_etag(self, _mock_now):
+        """
+        Polling an unchanged calendar should return a 304 response without building it,
+        and any change to its meetings should change its etag.
+        """
+        user = UserFactory()
+        meeting = MeetingFactory(owner=user)
+        url = self.get_calendar_url(user)
+
+        etag = self.client.get(url)["ETag"]
+
+        with mock.patch.object(ical, "iter_calendar") as mock_iter_calendar:
+            # The token and the meetings
+            with self.assertNumQueries(2):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        mock_iter_calendar.assert_not_called()
+
+        meeting.name = "renamed"
+        meeting.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        MeetingFactory(users=[user])
+        self.assertNotEqual(self.client.get(url)["ETag"], response["ETag"])
+
+    def test_api_calendars_etag_next_day(self, mock_now):
+        """
+        The etag of a calendar should not change from one day to the next, until the
+        occurrences of the infinite recurrences it lists are extended.
+        """
+        user = UserFactory()
+        # The day is clipped to the end of shorter months so its occurrences are listed
+        meeting = MeetingFactory(
+            owner=user,
+            start=datetime(2022, 8, 31, 7, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 8, 31, 8, 0, tzinfo=ZoneInfo("UTC")),
+            timezone=ZoneInfo("UTC"),
+            recurrence="monthly",
+            frequency=1,
+            monthly_type="date_day",
+            recurring_until=None,
+        )
+        url = self.get_calendar_url(user)
+        response = self.client.get(url)
+        etag = response["ETag"]
+        calendar = b"".join(response.streaming_content).decode()
+
+        # The occurrences are listed up to the materialized ones
+        rdates = calendar.split("RDATE;TZID=UTC:", 1)[1].split("\r\n", 1)[0]
+        rdates = rdates.replace("\r\n ", "").split(",")
+        self.assertEqual(rdates[0], "20220930T070000")
+        self.assertLessEqual(
+            datetime.strptime(rdates[-1], "%Y%m%dT%H%M%S").replace(
+                tzinfo=ZoneInfo("UTC")
+            ),
+            meeting.occurrences_until,
+        )
+
+        mock_now.return_value = datetime(2022, 7, 2, 9, 0, tzinfo=ZoneInfo("UTC"))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        mock_now.return_value = datetime(2023, 7, 2, 9, 0, tzinfo=ZoneInfo("UTC"))
+        call_command("update_meeting_occurrences", stdout=StringIO())
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_api_calendars_streamed(self, _mock_now):
+        """
+        The calendar should be streamed from the database with a constant number of queries
+        whatever the number of meetings.
+        """
+        user = UserFactory()
+        MeetingFactory.create_batch(
+            3, owner=user, timezone=ZoneInfo("Europe/Paris"), recurrence=None
+        )
+        MeetingFactory.create_batch(
+            2, users=[user], timezone=ZoneInfo("UTC"), recurrence=None
+        )
+
+        # The token, the etag, the timezones and the meetings
+        with self.assertNumQueries(4):
+            calendar = "\r\n".join(self.get_calendar(user))
+
+        self.assertEqual(calendar.count("BEGIN:VEVENT"), 5)
+        self.assertEqual(calendar.count("BEGIN:VTIMEZONE"), 2)
+        self.assertLess(calendar.index("TZID:Europe/Paris"), calendar.index("TZID:UTC"))
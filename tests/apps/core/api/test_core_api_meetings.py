@@ -6,6 +6,8 @@ from datetime import datetime
 from unittest import mock
 from zoneinfo import ZoneInfo
 
+from django.test.utils import override_settings
+
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import AccessToken
@@ -384,6 +386,140 @@ class MeetingsApiTestCase(APITestCase):
             [str(meeting.id) for meeting in meetings],
         )
 
+    @mock.patch(
+        "django.utils.timezone.now",
+        return_value=datetime(2022, 7, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+    )
+    def test_api_meetings_list_authenticated_filter_materialized_occurrences(
+        self, _mock_now
+    ):
+        """
+        Recurring meetings should be filtered on their occurrences materialized in database
+        and not only on the start and end of their recurrence.
+        """
+        user = UserFactory()
+        jwt_token = AccessToken.for_user(user)
+
+        # 2022-07-04 is a Monday
+        included = MeetingFactory(
+            start=datetime(2022, 7, 4, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="weekly",
+            weekdays="01",
+            nb_occurrences=10,
+            owner=user,
+            timezone=ZoneInfo("UTC"),
+        )
+        # No occurrence on Tuesdays and Wednesdays although the recurrence spans the period
+        MeetingFactory(
+            start=datetime(2022, 7, 4, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="weekly",
+            weekdays="04",
+            nb_occurrences=10,
+            owner=user,
+            timezone=ZoneInfo("UTC"),
+        )
+
+        response = self.client.get(
+            "/api/meetings/?from=2022-07-12T00:00:00Z&to=2022-07-13T23:59:00Z",
+            HTTP_AUTHORIZATION=f"Bearer {jwt_token}",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([result["id"] for result in results], [str(included.id)])
+
+    def test_api_meetings_list_authenticated_occurrences_expanded_at_once(self):
+        """
+        Occurrences of the listed meetings should be expanded in one pass for the whole page
+        and not meeting by meeting.
+        """
+        user = UserFactory()
+        jwt_token = AccessToken.for_user(user)
+
+        MeetingFactory(
+            start=datetime(2022, 7, 4, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="weekly",
+            weekdays="02",
+            recurring_until=None,
+            owner=user,
+            timezone=ZoneInfo("UTC"),
+        )
+        MeetingFactory(
+            start=datetime(2022, 7, 12, 9, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 12, 10, 0, tzinfo=ZoneInfo("UTC")),
+            owner=user,
+            timezone=ZoneInfo("UTC"),
+        )
+
+        with mock.patch.object(
+            Meeting,
+            "get_occurrences",
+            side_effect=Meeting.get_occurrences,
+            autospec=True,
+        ) as mock_get_occurrences:
+            response = self.client.get(
+                "/api/meetings/?from=2022-07-11T00:00:00Z&to=2022-07-17T23:59:00Z",
+                HTTP_AUTHORIZATION=f"Bearer {jwt_token}",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(
+            [result["occurrences"]["dates"] for result in results],
+            [
+                ["2022-07-12T09:00:00Z"],
+                ["2022-07-11T09:00:00Z", "2022-07-13T09:00:00Z"],
+            ],
+        )
+        # Only the meeting without recurrence is expanded on its own
+        self.assertEqual(mock_get_occurrences.call_count, 1)
+
+    def test_api_meetings_list_authenticated_constant_queries(self):
+        """
+        The number of queries to list meetings should not depend on the number of meetings,
+        their guests or the relation of the user to them.
+        """
+        user = UserFactory()
+        jwt_token = AccessToken.for_user(user)
+        group = GroupFactory(members=[user])
+        start = datetime(2022, 7, 12, 9, 0, tzinfo=ZoneInfo("UTC"))
+        end = datetime(2022, 7, 12, 10, 0, tzinfo=ZoneInfo("UTC"))
+
+        def create_meetings():
+            MeetingFactory(start=start, end=end, owner=user, users=[UserFactory()])
+            MeetingFactory(start=start, end=end, users=[user, UserFactory()])
+            MeetingFactory(
+                start=start,
+                end=end,
+                groups=[group],
+                recurrence="daily",
+                recurring_until=None,
+            )
+
+        create_meetings()
+        url = (
+            "/api/meetings/?from=2022-07-11T00:00:00Z&to=2022-07-17T23:59:00Z"
+            "&after=2022-07-01T00:00:00Z&next=2"
+        )
+
+        # Authentication, count for pagination, meetings, accesses
+        with self.assertNumQueries(4):
+            response = self.client.get(url, HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(len(results), 3)
+        self.assertEqual(sorted(len(result["guests"]) for result in results), [1, 1, 2])
+        self.assertEqual(
+            sorted(len(result["next_occurrences"]["dates"]) for result in results),
+            [1, 1, 2],
+        )
+
+        create_meetings()
+        with self.assertNumQueries(4):
+            response = self.client.get(url, HTTP_AUTHORIZATION=f"Bearer {jwt_token}")
+        self.assertEqual(len(response.json()["results"]), 6)
+
     def test_api_meetings_list_authenticated_filter_required(self):
         """The "from" and "to" filters are required for list requests."""
         user = UserFactory()
@@ -587,7 +723,7 @@ class MeetingsApiTestCase(APITestCase):
         )
         access_group = MeetingAccess.objects.create(meeting=meeting, group=group)
 
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(3):
             response = self.client.get(
                 f"/api/meetings/{meeting.id!s}/",
                 HTTP_AUTHORIZATION=f"Bearer {jwt_token}",
@@ -688,7 +824,7 @@ class MeetingsApiTestCase(APITestCase):
             meeting=meeting, group=other_group
         )
 
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(3):
             response = self.client.get(
                 f"/api/meetings/{meeting.id!s}/",
                 HTTP_AUTHORIZATION=f"Bearer {jwt_token}",
@@ -778,7 +914,7 @@ class MeetingsApiTestCase(APITestCase):
         group = GroupFactory()
         access_group = MeetingAccess.objects.create(meeting=meeting, group=group)
 
-        with self.assertNumQueries(4):
+        with self.assertNumQueries(3):
             response = self.client.get(
                 f"/api/meetings/{meeting.id!s}/",
                 HTTP_AUTHORIZATION=f"Bearer {jwt_token}",
@@ -873,6 +1009,87 @@ class MeetingsApiTestCase(APITestCase):
             },
         )
 
+    def test_api_meetings_retrieve_next_occurrences(self):
+        """
+        When retrieving a meeting detail, it should be possible to request the next occurrences
+        after a date via querystring parameters.
+        """
+        user = UserFactory()
+        jwt_token = AccessToken.for_user(user)
+
+        meeting = MeetingFactory(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 7, 10, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            recurring_until=None,
+            nb_occurrences=None,
+            owner=user,
+            timezone=ZoneInfo("Europe/Paris"),
+        )
+
+        response = self.client.get(
+            f"/api/meetings/{meeting.id!s}/?after=2030-07-07T09:00:00Z&next=3",
+            HTTP_AUTHORIZATION=f"Bearer {jwt_token}",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["next_occurrences"],
+            {
+                "after": "2030-07-07T09:00:00Z",
+                "next": 3,
+                "dates": [
+                    "2030-07-08T09:00:00Z",
+                    "2030-07-09T09:00:00Z",
+                    "2030-07-10T09:00:00Z",
+                ],
+            },
+        )
+        self.assertNotIn("occurrences", response.json())
+
+    @mock.patch(
+        "django.utils.timezone.now",
+        return_value=datetime(2030, 7, 7, 9, 30, tzinfo=ZoneInfo("UTC")),
+    )
+    def test_api_meetings_retrieve_next_occurrences_default_after(self, _mock_now):
+        """The next occurrences should be computed from now if no date is passed."""
+        user = UserFactory()
+        jwt_token = AccessToken.for_user(user)
+
+        meeting = MeetingFactory(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 7, 10, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            recurring_until=None,
+            nb_occurrences=None,
+            owner=user,
+            timezone=ZoneInfo("Europe/Paris"),
+        )
+
+        response = self.client.get(
+            f"/api/meetings/{meeting.id!s}/?next=1",
+            HTTP_AUTHORIZATION=f"Bearer {jwt_token}",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["next_occurrences"]["dates"], ["2030-07-08T09:00:00Z"]
+        )
+
+    def test_api_meetings_retrieve_next_occurrences_invalid(self):
+        """The number of next occurrences requested should be limited."""
+        user = UserFactory()
+        jwt_token = AccessToken.for_user(user)
+        meeting = MeetingFactory(owner=user)
+
+        response = self.client.get(
+            f"/api/meetings/{meeting.id!s}/?next=101",
+            HTTP_AUTHORIZATION=f"Bearer {jwt_token}",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("next_occurrences", response.json())
+
     # Create
 
     def test_api_meetings_create_anonymous(self):
@@ -1288,3 +1505,83 @@ class MeetingsApiTestCase(APITestCase):
 
         self.assertEqual(response.status_code, 204)
         self.assertFalse(Meeting.objects.exists())
+
+    # Token
+
+    @mock.patch("magnify.apps.core.utils.generate_token", return_value="the token")
+    def test_api_meetings_token_anonymous_public(self, mock_token):
+        """Anonymous users should get a token for a public meeting."""
+        meeting = MeetingFactory(is_public=True)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/meetings/{meeting.id!s}/token/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), {"meeting": meeting.jitsi_name, "token": "the token"}
+        )
+        mock_token.assert_called_once_with(mock.ANY, meeting.jitsi_name, is_admin=False)
+
+    @mock.patch("magnify.apps.core.utils.generate_token", return_value="the token")
+    def test_api_meetings_token_authenticated_private(self, mock_token):
+        """
+        Authenticated users should not get a token for a private meeting to which they are
+        not related.
+        """
+        meeting = MeetingFactory(is_public=False)
+        jwt_token = AccessToken.for_user(UserFactory())
+
+        response = self.client.get(
+            f"/api/meetings/{meeting.id!s}/token/",
+            HTTP_AUTHORIZATION=f"Bearer {jwt_token}",
+        )
+
+        self.assertEqual(response.status_code, 404)
+        mock_token.assert_not_called()
+
+    @mock.patch("magnify.apps.core.utils.generate_token", return_value="the token")
+    def test_api_meetings_token_guests(self, mock_token):
+        """Guests of a private meeting should get a token that is not moderator."""
+        user = UserFactory()
+        meeting = MeetingFactory(is_public=False, users=[user])
+        jwt_token = AccessToken.for_user(user)
+
+        # Authentication, meeting
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                f"/api/meetings/{meeting.id!s}/token/",
+                HTTP_AUTHORIZATION=f"Bearer {jwt_token}",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        mock_token.assert_called_once_with(user, meeting.jitsi_name, is_admin=False)
+
+    @mock.patch("magnify.apps.core.utils.generate_token", return_value="the token")
+    def test_api_meetings_token_owner(self, mock_token):
+        """Owners of a meeting should get a moderator token."""
+        user = UserFactory()
+        meeting = MeetingFactory(is_public=False, owner=user)
+        jwt_token = AccessToken.for_user(user)
+
+        response = self.client.get(
+            f"/api/meetings/{meeting.id!s}/token/",
+            HTTP_AUTHORIZATION=f"Bearer {jwt_token}",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        mock_token.assert_called_once_with(user, meeting.jitsi_name, is_admin=True)
+
+    @override_settings(JITSI_TOKEN_IN_PAYLOADS=False)
+    @mock.patch("magnify.apps.core.serializers.meetings.generate_token")
+    def test_api_meetings_token_not_in_payloads(self, mock_token):
+        """
+        Meetings retrieved should not include a token when tokens are only issued by the
+        token endpoint.
+        """
+        meeting = MeetingFactory(is_public=True)
+
+        response = self.client.get(f"/api/meetings/{meeting.id!s}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["jitsi"], {"meeting": meeting.jitsi_name})
+        mock_token.assert_not_called()
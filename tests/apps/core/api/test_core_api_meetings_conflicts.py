@@ -0,0 +1,181 @@
+"""
+Tests for the detection of conflicts between meetings of a room in Magnify's core app.
+"""
+from datetime import datetime
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.test.utils import override_settings
+
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from magnify.apps.core.factories import MeetingFactory, RoomFactory, UserFactory
+from magnify.apps.core.models import Meeting
+
+
+@override_settings(MEETING_CONFLICTS_CHECK=True)
+@mock.patch(
+    "django.utils.timezone.now",
+    return_value=datetime(2022, 7, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+)
+class MeetingsConflictsApiTestCase(APITestCase):
+    """Test the opt-in detection of conflicts when creating or updating meetings."""
+
+    def setUp(self):
+        """
+        Book a room every monday from 9:00 to 10:00 from July 4, 2022, in a private meeting
+        to which the user is invited.
+        """
+        super().setUp()
+        self.user = UserFactory()
+        self.room = RoomFactory()
+        now_patcher = mock.patch(
+            "django.utils.timezone.now",
+            return_value=datetime(2022, 7, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+        )
+        now_patcher.start()
+        self.addCleanup(now_patcher.stop)
+        self.weekly = MeetingFactory(
+            room=self.room,
+            start=datetime(2022, 7, 4, 9, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 4, 10, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="weekly",
+            weekdays="0",
+            recurring_until=None,
+            timezone=ZoneInfo("UTC"),
+            is_public=False,
+            users=[self.user],
+        )
+
+    def create_meeting(self, start, end, **kwargs):
+        """Try creating a meeting in the room via the API."""
+        return self.client.post(
+            "/api/meetings/",
+            {
+                "name": "my meeting",
+                "room": str(self.room.id),
+                "start": start,
+                "end": end,
+                "timezone": "UTC",
+                **kwargs,
+            },
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}",
+        )
+
+    def test_api_meetings_conflicts_create(self, _mock_now):
+        """Creating a meeting overlapping an occurrence in the room should be refused."""
+        response = self.create_meeting("2022-07-18T09:30:00Z", "2022-07-18T11:00:00Z")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            {
+                "conflicts": [
+                    "The room is already booked from 2022-07-18T09:00:00+00:00 "
+                    "to 2022-07-18T10:00:00+00:00."
+                ]
+            },
+        )
+        self.assertEqual(Meeting.objects.count(), 1)
+
+    def test_api_meetings_conflicts_create_recurring(self, _mock_now):
+        """All conflicting occurrences of a recurring meeting should be reported."""
+        response = self.create_meeting(
+            "2022-07-05T09:00:00Z",
+            "2022-07-05T10:00:00Z",
+            recurrence="daily",
+            nb_occurrences=10,
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            {
+                "conflicts": [
+                    "The room is already booked from 2022-07-11T09:00:00+00:00 "
+                    "to 2022-07-11T10:00:00+00:00."
+                ]
+            },
+        )
+        self.assertFalse(Meeting.objects.filter(name="my meeting").exists())
+
+    def test_api_meetings_conflicts_create_hidden(self, _mock_now):
+        """
+        Conflicts with meetings that the user can not see should be reported without
+        disclosing when the room is booked.
+        """
+        self.weekly.accesses.all().delete()
+
+        response = self.create_meeting("2022-07-18T09:30:00Z", "2022-07-18T11:00:00Z")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            {"conflicts": ["The room is already booked by meetings you can not see."]},
+        )
+        self.assertEqual(Meeting.objects.count(), 1)
+
+        # Public meetings can be seen by all users
+        self.weekly.is_public = True
+        self.weekly.save()
+
+        response = self.create_meeting("2022-07-18T09:30:00Z", "2022-07-18T11:00:00Z")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            {
+                "conflicts": [
+                    "The room is already booked from 2022-07-18T09:00:00+00:00 "
+                    "to 2022-07-18T10:00:00+00:00."
+                ]
+            },
+        )
+
+    def test_api_meetings_conflicts_create_touching(self, _mock_now):
+        """Meetings that only touch each other should not be in conflict."""
+        response = self.create_meeting("2022-07-18T10:00:00Z", "2022-07-18T11:00:00Z")
+        self.assertEqual(response.status_code, 201)
+
+        # Other rooms and meetings without room are not concerned
+        response = self.create_meeting(
+            "2022-07-18T09:00:00Z", "2022-07-18T10:00:00Z", room=None
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_api_meetings_conflicts_update(self, _mock_now):
+        """Moving a meeting over an occurrence in the room should be refused."""
+        meeting = MeetingFactory(
+            owner=self.user,
+            room=self.room,
+            start=datetime(2022, 7, 19, 9, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 19, 10, 0, tzinfo=ZoneInfo("UTC")),
+        )
+
+        response = self.client.patch(
+            f"/api/meetings/{meeting.id!s}/",
+            {"start": "2022-07-25T08:00:00Z", "end": "2022-07-25T09:30:00Z"},
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            list(response.json()), ["conflicts"], msg="Conflicts should be reported"
+        )
+        meeting.refresh_from_db()
+        self.assertEqual(
+            meeting.start, datetime(2022, 7, 19, 9, 0, tzinfo=ZoneInfo("UTC"))
+        )
+        self.assertEqual(
+            list(meeting.occurrences.values_list("start", flat=True)),
+            [datetime(2022, 7, 19, 9, 0, tzinfo=ZoneInfo("UTC"))],
+        )
+
+    @override_settings(MEETING_CONFLICTS_CHECK=False)
+    def test_api_meetings_conflicts_disabled(self, _mock_now):
+        """Conflicts should not be checked unless activated."""
+        response = self.create_meeting("2022-07-18T09:30:00Z", "2022-07-18T11:00:00Z")
+        self.assertEqual(response.status_code, 201)
@@ -0,0 +1,209 @@
+"""
+Tests for the pagination of API endpoints in Magnify's core app.
+"""
+from datetime import datetime
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.test.utils import override_settings
+
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from magnify.apps.core.factories import MeetingFactory, RoomFactory, UserFactory
+from magnify.apps.core.models import Meeting, ResourceAccess, Room
+from magnify.apps.core.pagination import KeysetPagination
+
+
+@mock.patch.object(KeysetPagination, "page_size", 2)
+class PaginationApiTestCase(APITestCase):
+    """Test pagination of list requests with page numbers or cursors."""
+
+    def setUp(self):
+        """Authenticate a user for all requests."""
+        super().setUp()
+        self.user = UserFactory()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def walk(self, url, link="next"):
+        """Follow the links of paginated responses and return the ids of all pages."""
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            content = response.json()
+            self.assertNotIn("count", content)
+            pages.append([item["id"] for item in content["results"]])
+            url = content[link]
+        return pages
+
+    def walk_pages(self, url):
+        """Follow the links of page numbers and return the ids of all pages."""
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            content = response.json()
+            pages.append([item["id"] for item in content["results"]])
+            url = content["next"]
+        return pages
+
+    def test_api_pagination_cursor_rooms(self):
+        """
+        Rooms should be paginated with cursors when requested, following their ordering by
+        name, in both directions.
+        """
+        rooms = [
+            RoomFactory(name=name, users=[self.user])
+            for name in ["b", "a", "e", "c", "d"]
+        ]
+        expected = [str(room.id) for room in sorted(rooms, key=lambda room: room.name)]
+
+        pages = self.walk("/api/rooms/?pagination=cursor")
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(sum(pages, []), expected)
+
+        # Walk back from the last page
+        last_page = self.client.get("/api/rooms/?pagination=cursor")
+        while last_page.json()["next"]:
+            last_page = self.client.get(last_page.json()["next"])
+        previous_pages = self.walk(last_page.json()["previous"], link="previous")
+        self.assertEqual(previous_pages, pages[-2::-1])
+
+    def test_api_pagination_cursor_meetings(self):
+        """
+        Meetings should be paginated with cursors following their ordering by start date
+        descending, then by name, with the primary key as tiebreaker.
+        """
+        starts = [
+            datetime(2022, 7, day, 9, 0, 0, 123456, tzinfo=ZoneInfo("UTC"))
+            for day in (7, 8, 8, 8, 9)
+        ]
+        for start in starts:
+            MeetingFactory(owner=self.user, start=start, end=start, name="same")
+
+        pages = self.walk(
+            "/api/meetings/?from=2022-07-01T00:00:00Z&to=2022-07-31T00:00:00Z"
+            "&pagination=cursor"
+        )
+
+        self.assertEqual(
+            sum(pages, []),
+            [
+                str(pk)
+                for pk in Meeting.objects.order_by("-start", "name", "id").values_list(
+                    "id", flat=True
+                )
+            ],
+        )
+
+    def test_api_pagination_cursor_resource_accesses(self):
+        """
+        Resource accesses should be paginated with cursors following their ordering by
+        resource, then by role, with the primary key as tiebreaker.
+        """
+        for _i in range(2):
+            RoomFactory(
+                users=[
+                    (self.user, "administrator"),
+                    (UserFactory(), "member"),
+                    (UserFactory(), "owner"),
+                ]
+            )
+
+        pages = self.walk("/api/resource-accesses/?pagination=cursor")
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 2])
+        self.assertEqual(
+            sum(pages, []),
+            [
+                str(pk)
+                for pk in ResourceAccess.objects.order_by(
+                    "resource", "role", "id"
+                ).values_list("id", flat=True)
+            ],
+        )
+
+    def test_api_pagination_cursor_queryset_ordering(self):
+        """
+        Cursors should follow the ordering applied to the queryset, if any, rather than the
+        ordering of the model.
+        """
+        self.assertEqual(
+            KeysetPagination.get_ordering(Room.objects.order_by("-slug")),
+            [("slug", True), ("resource", False)],
+        )
+        self.assertEqual(
+            KeysetPagination.get_ordering(Meeting.objects.order_by("name", "-pk")),
+            [("name", False), ("id", True)],
+        )
+        self.assertEqual(
+            KeysetPagination.get_ordering(Meeting.objects.all()),
+            [("start", True), ("name", False), ("id", False)],
+        )
+        self.assertEqual(
+            KeysetPagination.get_ordering(Meeting.objects.order_by()),
+            [("id", False)],
+        )
+
+    @mock.patch.object(PageNumberPagination, "page_size", 2)
+    def test_api_pagination_page_total_ordering(self):
+        """
+        Page numbers should follow the ordering with the primary key as tiebreaker, so that
+        items sharing the values of the ordering fields are neither repeated nor skipped.
+        """
+        room = RoomFactory(users=[(self.user, "administrator")])
+        for _i in range(4):
+            ResourceAccess.objects.create(resource=room, user=UserFactory())
+
+        pages = self.walk_pages("/api/resource-accesses/")
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(
+            sum(pages, []),
+            [
+                str(pk)
+                for pk in ResourceAccess.objects.order_by(
+                    "resource", "role", "id"
+                ).values_list("id", flat=True)
+            ],
+        )
+
+    def test_api_pagination_cursor_no_count(self):
+        """Paginating with cursors should not count items."""
+        RoomFactory.create_batch(3, users=[self.user])
+
+        # Authentication, rooms, accesses
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/rooms/?pagination=cursor")
+        self.assertEqual(len(response.json()["results"]), 2)
+
+    @override_settings(API_PAGINATION="cursor")
+    def test_api_pagination_setting(self):
+        """The pagination mode by default should be configurable."""
+        RoomFactory.create_batch(3, users=[self.user])
+
+        content = self.client.get("/api/rooms/").json()
+        self.assertIn("cursor=", content["next"])
+        self.assertNotIn("count", content)
+
+        content = self.client.get("/api/rooms/?pagination=page").json()
+        self.assertEqual(content["count"], 3)
+
+    def test_api_pagination_page_default(self):
+        """Pagination should use page numbers by default."""
+        RoomFactory.create_batch(3, users=[self.user])
+
+        content = self.client.get("/api/rooms/").json()
+        self.assertEqual(content["count"], 3)
+        self.assertIsNone(content["next"])
+
+    def test_api_pagination_cursor_invalid(self):
+        """An invalid cursor should return a 404."""
+        response = self.client.get("/api/rooms/?cursor=invalid")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"detail": "Invalid cursor"})
+        self.assertFalse(Room.objects.exists())
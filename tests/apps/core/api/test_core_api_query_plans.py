@@ -0,0 +1,235 @@
+"""
+Check the query plans of the main API endpoints in Magnify's core app.
+"""
+import json
+from datetime import datetime, timedelta
+from itertools import islice
+from unittest import skipUnless
+from zoneinfo import ZoneInfo
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from magnify.apps.core.models import (
+    EffectiveResourceAccess,
+    Group,
+    Meeting,
+    MeetingAccess,
+    MeetingOccurrence,
+    Resource,
+    ResourceAccess,
+    RoleChoices,
+    Room,
+    User,
+)
+
+# Tables that the main endpoints should only look up via indexes
+CHECKED_TABLES = {
+    Meeting._meta.db_table,
+    MeetingAccess._meta.db_table,
+    MeetingOccurrence._meta.db_table,
+    Resource._meta.db_table,
+    ResourceAccess._meta.db_table,
+    EffectiveResourceAccess._meta.db_table,
+    Room._meta.db_table,
+    User._meta.db_table,
+}
+
+PERIOD = "from=2022-01-10T00:00:00Z&to=2022-02-10T00:00:00Z"
+
+
+def iter_plan_nodes(plan):
+    """Yield the nodes of a query plan returned by `EXPLAIN (FORMAT JSON)`."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+@skipUnless(
+    connection.vendor == "postgresql", "Query plans are only checked on PostgreSQL."
+)
+class QueryPlansApiTestCase(APITestCase):
+    """
+    Explain the queries made by the main endpoints on a seeded database and make sure none
+    of them scans a big table sequentially.
+    """
+
+    nb_users = 1000
+    nb_groups = 50
+    nb_rooms = 5000
+    nb_meetings = 50000
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Seed a database in which the user of the requests is related to a small share of the
+        rooms and meetings, directly or via groups, then refresh the statistics of tables.
+        """
+        super().setUpTestData()
+        users = User.objects.bulk_create(
+            User(
+                username=f"plan-{i:d}",
+                email=f"plan-{i:d}@example.com",
+                jwt_sub=f"plan-{i:d}",
+            )
+            for i in range(cls.nb_users)
+        )
+        cls.user = users[0]
+        groups = Group.objects.bulk_create(
+            Group(name=f"plan-{i:d}", token=f"plan-{i:d}") for i in range(cls.nb_groups)
+        )
+        Group.members.through.objects.bulk_create(
+            Group.members.through(group=group, user=user)
+            for i, group in enumerate(groups)
+            for user in islice(users, 1 + i * 10, 21 + i * 10)
+        )
+        Group.administrators.through.objects.bulk_create(
+            [Group.administrators.through(group=groups[0], user=cls.user)]
+        )
+
+        # Rooms are saved one by one because multi-table inheritance prevents bulk creation
+        resources = Resource.objects.bulk_create(
+            Resource(is_public=bool(i % 2)) for i in range(cls.nb_rooms)
+        )
+        rooms = []
+        for i, resource in enumerate(resources):
+            room = Room(resource=resource, name=f"plan-{i:d}", slug=f"plan-{i:d}")
+            room.save_base(raw=True)
+            rooms.append(room)
+        cls.room = rooms[0]
+        ResourceAccess.objects.bulk_create(
+            [
+                ResourceAccess(
+                    resource=resource,
+                    user=users[1 + i % (cls.nb_users - 1)],
+                    role=RoleChoices.OWNER,
+                )
+                for i, resource in enumerate(resources)
+            ]
+            + [
+                ResourceAccess(resource=resource, group=groups[i % cls.nb_groups])
+                for i, resource in enumerate(resources[::5])
+            ]
+            + [
+                ResourceAccess(resource=resource, user=cls.user, role=RoleChoices.ADMIN)
+                for resource in resources[:20]
+            ]
+        )
+        EffectiveResourceAccess.objects.rebuild()
+
+        start = datetime(2022, 1, 3, 9, 0, tzinfo=ZoneInfo("UTC"))
+        meetings = Meeting.objects.bulk_create(
+            (
+                Meeting(
+                    name=f"plan-{i:d}",
+                    room=rooms[i % cls.nb_rooms],
+                    owner=users[i % cls.nb_users],
+                    start=start + timedelta(hours=i // 10),
+                    end=start + timedelta(hours=i // 10 + 1),
+                    timezone=ZoneInfo("UTC"),
+                    is_public=not i % 3,
+                    **(
+                        {}
+                        if i % 10
+                        else {
+                            "recurrence": Meeting.DAILY,
+                            "frequency": 1,
+                            "nb_occurrences": 4,
+                            "recurring_until": start + timedelta(hours=i // 10, days=3),
+                            "occurrences_until": start
+                            + timedelta(hours=i // 10, days=3),
+                        }
+                    ),
+                )
+                for i in range(cls.nb_meetings)
+            ),
+            batch_size=1000,
+        )
+        MeetingOccurrence.objects.bulk_create(
+            (
+                MeetingOccurrence(
+                    meeting=meeting,
+                    start=meeting.start + timedelta(days=day),
+                    end=meeting.end + timedelta(days=day),
+                )
+                for meeting in meetings[::10]
+                for day in range(4)
+            ),
+            batch_size=1000,
+        )
+        MeetingAccess.objects.bulk_create(
+            [
+                MeetingAccess(meeting=meeting, user=users[1 + i % (cls.nb_users - 1)])
+                for i, meeting in enumerate(meetings[1::10])
+            ]
+            + [
+                MeetingAccess(meeting=meeting, group=groups[i % cls.nb_groups])
+                for i, meeting in enumerate(meetings[2::20])
+            ],
+            batch_size=1000,
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def setUp(self):
+        """Authenticate the user of the requests."""
+        super().setUp()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def get_sequential_scans(self, url):
+        """
+        Request an url and return the tables scanned sequentially by the queries it made,
+        with the queries scanning them.
+
+        On tables of this size, PostgreSQL may legitimately find a sequential scan cheaper
+        than a few index lookups, so queries are explained with sequential scans disabled:
+        the planner then only falls back to one when no index can serve the query.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        scans = []
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+            try:
+                for query in context.captured_queries:
+                    if not query["sql"].startswith("SELECT"):
+                        continue
+                    cursor.execute(f"EXPLAIN (FORMAT JSON) {query['sql']:s}")
+                    plan = cursor.fetchone()[0]
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    scans.extend(
+                        (node["Relation Name"], query["sql"])
+                        for node in iter_plan_nodes(plan[0]["Plan"])
+                        if node["Node Type"] == "Seq Scan"
+                        and node["Relation Name"] in CHECKED_TABLES
+                    )
+            finally:
+                cursor.execute("RESET enable_seqscan")
+        return scans
+
+    def test_api_query_plans_no_sequential_scan(self):
+        """The main endpoints should only look up big tables via indexes."""
+        meeting = Meeting.objects.filter(owner=self.user).first()
+        urls = [
+            "/api/rooms/",
+            "/api/rooms/?pagination=cursor",
+            f"/api/rooms/{self.room.pk!s}/",
+            f"/api/rooms/{self.room.pk!s}/meetings/?{PERIOD:s}",
+            f"/api/rooms/{self.room.pk!s}/busy/?{PERIOD:s}",
+            f"/api/meetings/?{PERIOD:s}",
+            f"/api/meetings/?{PERIOD:s}&pagination=cursor",
+            f"/api/meetings/{meeting.pk!s}/",
+            "/api/resource-accesses/",
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.get_sequential_scans(url), [])
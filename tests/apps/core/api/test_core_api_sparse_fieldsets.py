@@ -0,0 +1,182 @@
+"""
+Tests for sparse fieldsets on the API endpoints of Magnify's core app.
+"""
+from datetime import datetime
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from magnify.apps.core.factories import (
+    GroupFactory,
+    MeetingFactory,
+    RoomFactory,
+    UserFactory,
+)
+
+PERIOD = "from=2022-07-01T00:00:00Z&to=2022-07-31T23:59:00Z"
+START = datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC"))
+END = datetime(2022, 7, 7, 10, 0, tzinfo=ZoneInfo("UTC"))
+
+
+class SparseFieldsetsApiTestCase(APITestCase):
+    """Test restricting the fields of serialized objects with query parameters."""
+
+    def setUp(self):
+        """Authenticate a user for all requests."""
+        super().setUp()
+        self.user = UserFactory()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    @mock.patch("magnify.apps.core.serializers.rooms.generate_token")
+    def test_api_sparse_fieldsets_rooms_fields(self, mock_token):
+        """
+        Listing rooms with only a few fields should neither look up accesses and roles nor
+        generate tokens.
+        """
+        RoomFactory.create_batch(3, users=[(self.user, "administrator")])
+
+        # Authentication, count for pagination, rooms
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/rooms/?fields=id,name,slug")
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(len(results), 3)
+        for room in results:
+            self.assertEqual(list(room), ["id", "name", "slug"])
+        mock_token.assert_not_called()
+
+    @mock.patch("magnify.apps.core.serializers.rooms.generate_token")
+    def test_api_sparse_fieldsets_rooms_omit(self, mock_token):
+        """
+        Omitting accesses and Jitsi credentials should keep the fields depending on the role
+        of the user without querying accesses or generating tokens.
+        """
+        room = RoomFactory(users=[(self.user, "administrator")])
+
+        # Authentication, room with the role of the user
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/api/rooms/{room.id!s}/?omit=accesses,jitsi")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "id": str(room.id),
+                "configuration": {},
+                "is_administrable": True,
+                "is_public": room.is_public,
+                "name": room.name,
+                "slug": room.slug,
+            },
+        )
+        mock_token.assert_not_called()
+
+    def test_api_sparse_fieldsets_nested_objects(self):
+        """Fieldsets should not apply to objects nested in the objects serialized."""
+        room = RoomFactory(users=[(self.user, "administrator")])
+
+        response = self.client.get(f"/api/rooms/{room.id!s}/?fields=id,accesses")
+
+        self.assertEqual(response.status_code, 200)
+        content = response.json()
+        self.assertEqual(list(content), ["id", "accesses"])
+        self.assertEqual(
+            content["accesses"][0]["user"],
+            {
+                "id": str(self.user.id),
+                "email": self.user.email,
+                "is_device": False,
+                "language": self.user.language,
+                "name": self.user.name,
+                "timezone": str(self.user.timezone),
+                "username": self.user.username,
+            },
+        )
+
+    @mock.patch("magnify.apps.core.serializers.meetings.generate_token")
+    def test_api_sparse_fieldsets_meetings_fields(self, mock_token):
+        """
+        Listing meetings with only a few fields should neither look up guests nor expand
+        occurrences nor generate tokens.
+        """
+        MeetingFactory.create_batch(3, owner=self.user, start=START, end=END)
+
+        # Authentication, count for pagination, meetings
+        with self.assertNumQueries(3):
+            response = self.client.get(f"/api/meetings/?{PERIOD:s}&fields=id,name")
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(len(results), 3)
+        for meeting in results:
+            self.assertEqual(list(meeting), ["id", "name"])
+        mock_token.assert_not_called()
+
+    def test_api_sparse_fieldsets_room_meetings_omit(self):
+        """Omitting guests and occurrences of the meetings of a room should skip them."""
+        room = RoomFactory(users=[self.user])
+        MeetingFactory(
+            room=room,
+            owner=self.user,
+            start=START,
+            end=END,
+        )
+
+        # Authentication, room, meetings
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                f"/api/rooms/{room.id!s}/meetings/?{PERIOD:s}"
+                "&omit=guests,occurrences,owner"
+            )
+
+        self.assertEqual(response.status_code, 200)
+        meeting = response.json()[0]
+        self.assertIn("jitsi", meeting)
+        for name in ["guests", "occurrences", "owner"]:
+            self.assertNotIn(name, meeting)
+
+    def test_api_sparse_fieldsets_groups(self):
+        """Omitted relations of groups should not be queried."""
+        GroupFactory.create_batch(2, administrators=[self.user], members=[self.user])
+
+        # Authentication, count for pagination, groups
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/groups/?omit=administrators,members")
+
+        self.assertEqual(response.status_code, 200)
+        for group in response.json()["results"]:
+            self.assertEqual(list(group), ["id", "name"])
+
+        # Authentication, count for pagination, groups, administrators
+        with self.assertNumQueries(4):
+            response = self.client.get("/api/groups/?fields=name,administrators")
+
+        self.assertEqual(response.status_code, 200)
+        for group in response.json()["results"]:
+            self.assertEqual(
+                group, {"administrators": [str(self.user.id)], "name": group["name"]}
+            )
+
+    def test_api_sparse_fieldsets_users(self):
+        """Fieldsets should apply to users."""
+        response = self.client.get("/api/users/me/?fields=id,username,unknown")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), {"id": str(self.user.id), "username": self.user.username}
+        )
+
+    def test_api_sparse_fieldsets_ignored_on_write(self):
+        """Fieldsets should be ignored on requests that are not safe."""
+        response = self.client.post(
+            "/api/rooms/?fields=id", {"name": "my room"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["name"], "my room")
+        self.assertIn("jitsi", response.json())
@@ -3,11 +3,12 @@ Unit tests for the DelegatedJWTAuthentication backend.
 """
 from uuid import uuid4
 
+from django.core.cache import cache
 from django.test import TestCase
 from django.test.utils import override_settings
 
 from magnify.apps.core import factories, models
-from magnify.apps.core.authentication import DelegatedJWTAuthentication
+from magnify.apps.core.authentication import DelegatedJWTAuthentication, user_sync_stats
 
 
 class DelegatedJWTAuthenticationTestCase(TestCase):
@@ -15,6 +16,12 @@ class DelegatedJWTAuthenticationTestCase(TestCase):
     Unit test suite to validate the behavior of the DelegatedJWTAuthentication backend.
     """
 
+    def setUp(self):
+        """Start each test without synchronized claims nor counters."""
+        super().setUp()
+        cache.clear()
+        user_sync_stats.clear()
+
     def test_authentication_delegated_user_unknown(self):
         """If the user is unknown, it should be created on the fly."""
         jwt_user_id = uuid4()
@@ -92,3 +99,147 @@ class DelegatedJWTAuthenticationTestCase(TestCase):
 
         user.refresh_from_db()
         self.assertFalse(user.is_device)
+
+    def test_authentication_delegated_user_unchanged(self):
+        """A user whose claims did not change should not be written again."""
+        payload = {
+            "sub": uuid4(),
+            "name": "David Bowman",
+            "email": "david.bowman@hal.com",
+            "preferred_username": "dave",
+        }
+        user = DelegatedJWTAuthentication().get_user(payload)
+
+        # The user is only read by its primary key
+        with self.assertNumQueries(1):
+            self.assertEqual(DelegatedJWTAuthentication().get_user(payload), user)
+
+        # The values of the user in database are compared when the cache is cold
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(DelegatedJWTAuthentication().get_user(payload), user)
+
+        self.assertEqual(
+            user_sync_stats.get_stats(),
+            {"created": 1, "updated": 0, "skipped": 2, "skipped_ratio": 2 / 3},
+        )
+
+    def test_authentication_delegated_user_changed(self):
+        """A user whose claims changed should be synchronized."""
+        payload = {
+            "sub": uuid4(),
+            "email": "david.bowman@hal.com",
+            "preferred_username": "dave",
+        }
+        user = DelegatedJWTAuthentication().get_user(payload)
+
+        payload["email"] = "dave@hal.com"
+        DelegatedJWTAuthentication().get_user(payload)
+
+        user.refresh_from_db()
+        self.assertEqual(user.email, "dave@hal.com")
+        self.assertEqual(user_sync_stats.get_stats()["updated"], 1)
+
+    def test_authentication_delegated_user_cached(self):
+        """
+        Users synchronized recently should be read from the database without comparing their
+        claims until the cache expires, and compared afterwards, unless the cache is disabled.
+        """
+        payload = {
+            "sub": uuid4(),
+            "email": "david.bowman@hal.com",
+            "preferred_username": "dave",
+        }
+        user = DelegatedJWTAuthentication().get_user(payload)
+        self.assertEqual(cache.get(f"jwt-user-sync:{payload['sub']!s}")[1], user.pk)
+        models.User.objects.filter(pk=user.pk).update(email="frank.poole@hal.com")
+
+        with self.assertNumQueries(1):
+            authenticated_user = DelegatedJWTAuthentication().get_user(payload)
+        self.assertEqual(authenticated_user.email, "frank.poole@hal.com")
+
+        # The drift is corrected once the cache expired
+        cache.clear()
+        DelegatedJWTAuthentication().get_user(payload)
+        user.refresh_from_db()
+        self.assertEqual(user.email, "david.bowman@hal.com")
+        self.assertEqual(user_sync_stats.get_stats()["updated"], 1)
+
+        with override_settings(JWT_USER_SYNC_CACHE_TIMEOUT=0):
+            cache.clear()
+            with self.assertNumQueries(1):
+                DelegatedJWTAuthentication().get_user(payload)
+            self.assertIsNone(cache.get(f"jwt-user-sync:{payload['sub']!s}"))
+
+    def test_authentication_delegated_user_saved(self):
+        """A user saved in database should be dropped from the cache."""
+        payload = {
+            "sub": uuid4(),
+            "email": "david.bowman@hal.com",
+            "preferred_username": "dave",
+        }
+        user = DelegatedJWTAuthentication().get_user(payload)
+        self.assertIsNotNone(cache.get(f"jwt-user-sync:{payload['sub']!s}"))
+
+        user.name = "David Bowman"
+        user.save()
+
+        self.assertIsNone(cache.get(f"jwt-user-sync:{payload['sub']!s}"))
+        self.assertEqual(
+            DelegatedJWTAuthentication().get_user(payload).name, "David Bowman"
+        )
+
+    def test_authentication_delegated_user_deleted(self):
+        """A user deleted after its claims were synchronized should be created again."""
+        payload = {
+            "sub": uuid4(),
+            "email": "david.bowman@hal.com",
+            "preferred_username": "dave",
+        }
+        DelegatedJWTAuthentication().get_user(payload).delete()
+
+        user = DelegatedJWTAuthentication().get_user(payload)
+
+        self.assertEqual(models.User.objects.get(), user)
+        self.assertEqual(user_sync_stats.get_stats()["created"], 2)
+
+    def test_authentication_delegated_user_deactivated(self):
+        """
+        A user deactivated or demoted by another process should be seen as such even if its
+        claims were synchronized recently.
+        """
+        payload = {
+            "sub": uuid4(),
+            "email": "david.bowman@hal.com",
+            "preferred_username": "dave",
+        }
+        user = DelegatedJWTAuthentication().get_user(payload)
+        models.User.objects.filter(pk=user.pk).update(is_active=False, is_staff=True)
+
+        authenticated_user = DelegatedJWTAuthentication().get_user(payload)
+
+        self.assertEqual(authenticated_user, user)
+        self.assertFalse(authenticated_user.is_active)
+        self.assertTrue(authenticated_user.is_staff)
+
+    def test_authentication_delegated_user_deleted_elsewhere(self):
+        """
+        A user deleted by another process, whose claims are still cached, should be created
+        again instead of being authenticated.
+        """
+        payload = {
+            "sub": uuid4(),
+            "email": "david.bowman@hal.com",
+            "preferred_username": "dave",
+        }
+        user_pk = DelegatedJWTAuthentication().get_user(payload).pk
+        synced = cache.get(f"jwt-user-sync:{payload['sub']!s}")
+        models.User.objects.filter(pk=user_pk).delete()
+        # The cache of another process was not cleared
+        cache.set(f"jwt-user-sync:{payload['sub']!s}", synced)
+
+        authenticated_user = DelegatedJWTAuthentication().get_user(payload)
+
+        self.assertNotEqual(authenticated_user.pk, user_pk)
+        self.assertEqual(models.User.objects.get(), authenticated_user)
+        self.assertEqual(user_sync_stats.get_stats()["created"], 2)
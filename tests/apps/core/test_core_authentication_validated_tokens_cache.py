@@ -0,0 +1,124 @@
+"""
+Unit tests for the cache of validated tokens of the DelegatedJWTAuthentication backend.
+"""
+import time
+from unittest import mock
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from magnify.apps.core.authentication import (
+    DelegatedJWTAuthentication,
+    validated_tokens_cache,
+)
+from magnify.apps.core.factories import UserFactory
+
+
+@mock.patch.object(
+    TokenBackend, "decode", autospec=True, side_effect=TokenBackend.decode
+)
+@override_settings(JWT_VALIDATED_TOKENS_CACHE_SIZE=10)
+class ValidatedTokensCacheTestCase(TestCase):
+    """Unit test suite to validate the cache of validated tokens."""
+
+    def setUp(self):
+        """Start each test with an empty cache."""
+        super().setUp()
+        validated_tokens_cache.clear()
+
+    @staticmethod
+    def get_raw_token(user=None):
+        """Returns a raw access token for the user passed in argument."""
+        return str(AccessToken.for_user(user or UserFactory())).encode()
+
+    @override_settings(JWT_VALIDATED_TOKENS_CACHE_SIZE=0)
+    def test_authentication_validated_tokens_cache_disabled(self, mock_decode):
+        """Tokens should be verified on each request when the cache is not configured."""
+        raw_token = self.get_raw_token()
+
+        for _i in range(2):
+            DelegatedJWTAuthentication().get_validated_token(raw_token)
+
+        self.assertEqual(mock_decode.call_count, 2)
+        self.assertEqual(validated_tokens_cache.get_stats()["size"], 0)
+
+    def test_authentication_validated_tokens_cache_hits(self, mock_decode):
+        """A token should be verified once and handed back until it expires."""
+        raw_token = self.get_raw_token()
+
+        validated_token = DelegatedJWTAuthentication().get_validated_token(raw_token)
+        self.assertIs(
+            DelegatedJWTAuthentication().get_validated_token(raw_token),
+            validated_token,
+        )
+
+        self.assertEqual(mock_decode.call_count, 1)
+        self.assertEqual(
+            validated_tokens_cache.get_stats(),
+            {"hits": 1, "misses": 1, "size": 1, "max_size": 10},
+        )
+
+    def test_authentication_validated_tokens_cache_expired(self, mock_decode):
+        """An expired token should not be handed back but verified again and refused."""
+        raw_token = self.get_raw_token()
+        validated_token = DelegatedJWTAuthentication().get_validated_token(raw_token)
+
+        with mock.patch.object(time, "time", return_value=validated_token["exp"]):
+            with mock.patch(
+                "rest_framework_simplejwt.tokens.aware_utcnow",
+                return_value=validated_token.current_time.replace(year=2100),
+            ):
+                with self.assertRaises(InvalidToken):
+                    DelegatedJWTAuthentication().get_validated_token(raw_token)
+
+        self.assertEqual(mock_decode.call_count, 2)
+        self.assertEqual(validated_tokens_cache.get_stats()["size"], 0)
+
+    def test_authentication_validated_tokens_cache_invalid(self, mock_decode):
+        """Invalid tokens should not be cached."""
+        raw_token = self.get_raw_token()[:-2]
+
+        for _i in range(2):
+            with self.assertRaises(InvalidToken):
+                DelegatedJWTAuthentication().get_validated_token(raw_token)
+
+        self.assertEqual(mock_decode.call_count, 2)
+        self.assertEqual(validated_tokens_cache.get_stats()["size"], 0)
+
+    @override_settings(JWT_VALIDATED_TOKENS_CACHE_SIZE=2)
+    def test_authentication_validated_tokens_cache_eviction(self, mock_decode):
+        """The least recently used tokens should be evicted."""
+        user = UserFactory()
+        raw_tokens = [self.get_raw_token(user) for _i in range(3)]
+        authentication = DelegatedJWTAuthentication()
+
+        for index in [0, 1, 0, 2]:
+            authentication.get_validated_token(raw_tokens[index])
+        self.assertEqual(mock_decode.call_count, 3)
+
+        authentication.get_validated_token(raw_tokens[0])
+        self.assertEqual(mock_decode.call_count, 3)
+        authentication.get_validated_token(raw_tokens[1])
+        self.assertEqual(mock_decode.call_count, 4)
+
+    def test_authentication_validated_tokens_cache_authenticate(self, mock_decode):
+        """Requests authenticated with the same token should verify it once."""
+        user = UserFactory()
+        raw_token = self.get_raw_token(user).decode()
+        factory = APIRequestFactory()
+
+        for _i in range(3):
+            request = factory.get(
+                "/api/users/me/", HTTP_AUTHORIZATION=f"Bearer {raw_token:s}"
+            )
+            authenticated_user, _token = DelegatedJWTAuthentication().authenticate(
+                request
+            )
+            self.assertEqual(authenticated_user, user)
+
+        self.assertEqual(mock_decode.call_count, 1)
@@ -0,0 +1,112 @@
+"""
+Unit tests for the authorization service resolving roles in batch.
+"""
+from uuid import uuid4
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase
+
+from magnify.apps.core.authorization import (
+    memoize_roles,
+    resource_ids_with_roles,
+    role_for,
+    roles_for,
+)
+from magnify.apps.core.factories import GroupFactory, RoomFactory, UserFactory
+
+
+class RolesForTestCase(TestCase):
+    """Unit test suite to validate the resolution of roles by the authorization service."""
+
+    def test_authorization_roles_for_one_query(self):
+        """The roles of a user on many resources should be resolved in one query."""
+        user = UserFactory()
+        group = GroupFactory(members=[user])
+        member_room = RoomFactory(users=[(user, "member")])
+        group_room = RoomFactory(groups=[(group, "administrator")])
+        owned_room = RoomFactory(users=[(user, "owner")])
+        unrelated_room = RoomFactory(users=[UserFactory()])
+        rooms = [member_room, group_room, owned_room, unrelated_room]
+
+        with self.assertNumQueries(1):
+            roles = roles_for(user, [room.pk for room in rooms])
+
+        self.assertEqual(
+            roles,
+            {
+                member_room.pk: "member",
+                group_room.pk: "administrator",
+                owned_room.pk: "owner",
+                unrelated_room.pk: None,
+            },
+        )
+
+    def test_authorization_roles_for_highest_role(self):
+        """The highest of the direct and group roles of a user should win."""
+        user = UserFactory()
+        group = GroupFactory(members=[user])
+        room = RoomFactory(users=[(user, "member")], groups=[(group, "administrator")])
+        other_room = RoomFactory(users=[(user, "owner")], groups=[(group, "member")])
+
+        self.assertEqual(
+            roles_for(user, [room.pk, other_room.pk]),
+            {room.pk: "administrator", other_room.pk: "owner"},
+        )
+
+    def test_authorization_roles_for_anonymous(self):
+        """Anonymous users should have no role, without querying the database."""
+        user = UserFactory()
+        room = RoomFactory(users=[(user, "owner")])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(roles_for(AnonymousUser(), [room.pk]), {room.pk: None})
+            self.assertEqual(roles_for(None, [room.pk]), {room.pk: None})
+            self.assertEqual(roles_for(user, []), {})
+            self.assertFalse(resource_ids_with_roles(AnonymousUser(), ["owner"]))
+
+    def test_authorization_roles_for_string_ids(self):
+        """Resource ids passed as strings should be normalized and deduplicated."""
+        user = UserFactory()
+        room = RoomFactory(users=[(user, "administrator")])
+        unknown_id = uuid4()
+
+        self.assertEqual(
+            roles_for(user, [str(room.pk), room.pk, str(unknown_id)]),
+            {room.pk: "administrator", unknown_id: None},
+        )
+        self.assertEqual(role_for(user, str(room.pk)), "administrator")
+
+    def test_authorization_roles_for_memo(self):
+        """Within a request, only the roles that were not looked up yet should be queried."""
+        user = UserFactory()
+        room, other_room = RoomFactory.create_batch(2, users=[(user, "member")])
+
+        with memoize_roles():
+            with self.assertNumQueries(1):
+                self.assertEqual(role_for(user, room.pk), "member")
+                self.assertEqual(room.get_role(user), "member")
+
+            with self.assertNumQueries(1):
+                self.assertEqual(
+                    roles_for(user, [room.pk, other_room.pk]),
+                    {room.pk: "member", other_room.pk: "member"},
+                )
+
+            with self.assertNumQueries(0):
+                self.assertEqual(other_room.get_role(user), "member")
+
+    def test_authorization_resource_ids_with_roles(self):
+        """Resources on which a user has one of the roles should be listed by id."""
+        user = UserFactory()
+        group = GroupFactory(members=[user])
+        RoomFactory(users=[(user, "member")])
+        group_room = RoomFactory(groups=[(group, "administrator")])
+        owned_room = RoomFactory(users=[(user, "owner")])
+
+        self.assertEqual(
+            {
+                access["resource_id"]
+                for access in resource_ids_with_roles(user, ["administrator", "owner"])
+            },
+            {group_room.pk, owned_room.pk},
+        )
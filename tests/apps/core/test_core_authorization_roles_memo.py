@@ -0,0 +1,92 @@
+"""
+Unit tests for the memo of the roles of users on resources.
+"""
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase
+
+from magnify.apps.core.authorization import clear_roles_memo, memoize_roles, roles_memo
+from magnify.apps.core.factories import GroupFactory, RoomFactory, UserFactory
+from magnify.apps.core.models import ResourceAccess
+
+
+class RolesMemoTestCase(TestCase):
+    """Unit test suite to validate the memo of roles shared within a request."""
+
+    def test_roles_memo_outside_request(self):
+        """Roles should be looked up each time outside of a request."""
+        user = UserFactory()
+        room = RoomFactory(users=[(user, "member")])
+
+        with self.assertNumQueries(2):
+            self.assertEqual(room.get_role(user), "member")
+            self.assertFalse(room.is_administrator(user))
+        self.assertIsNone(roles_memo.get())
+
+    def test_roles_memo_shared(self):
+        """
+        Roles should be looked up once per resource and user, whatever the instance of the
+        resource.
+        """
+        user, other_user = UserFactory.create_batch(2)
+        room = RoomFactory(users=[(user, "administrator"), (other_user, "member")])
+        other_room = RoomFactory(users=[(user, "owner")])
+
+        with memoize_roles():
+            with self.assertNumQueries(3):
+                self.assertEqual(room.get_role(user), "administrator")
+                self.assertTrue(room.resource.is_administrator(user))
+                self.assertFalse(room.is_owner(user))
+                self.assertEqual(room.get_role(other_user), "member")
+                self.assertTrue(other_room.is_owner(user))
+                self.assertIsNone(room.get_role(AnonymousUser()))
+
+        self.assertIsNone(roles_memo.get())
+
+    def test_roles_memo_unrelated(self):
+        """The absence of role should be memoized too."""
+        user = UserFactory()
+        room = RoomFactory()
+
+        with memoize_roles():
+            with self.assertNumQueries(1):
+                self.assertIsNone(room.get_role(user))
+                self.assertIsNone(room.get_role(user))
+
+    def test_roles_memo_access_writes(self):
+        """Writing accesses should clear the memo within the request."""
+        user = UserFactory()
+        room = RoomFactory()
+
+        with memoize_roles():
+            self.assertIsNone(room.get_role(user))
+
+            access = ResourceAccess.objects.create(
+                resource=room, user=user, role="member"
+            )
+            self.assertEqual(room.get_role(user), "member")
+
+            access.role = "administrator"
+            access.save()
+            self.assertEqual(room.get_role(user), "administrator")
+
+            access.delete()
+            self.assertIsNone(room.get_role(user))
+
+            group = GroupFactory()
+            ResourceAccess.objects.create(
+                resource=room, group=group, role="administrator"
+            )
+            self.assertIsNone(room.get_role(user))
+            group.members.add(user)
+            self.assertEqual(room.get_role(user), "administrator")
+
+    def test_roles_memo_clear(self):
+        """Clearing the memo should be possible with or without a memo in use."""
+        clear_roles_memo()
+
+        user = UserFactory()
+        room = RoomFactory(users=[(user, "member")])
+        with memoize_roles():
+            room.get_role(user)
+            clear_roles_memo()
+            self.assertEqual(roles_memo.get(), {})
@@ -0,0 +1,155 @@
+"""Unit tests for the cache of meeting occurrences."""
+from datetime import datetime
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from magnify.apps.core.cache import OccurrencesCache
+from magnify.apps.core.factories import MeetingFactory
+from magnify.apps.core.models import Meeting
+
+START = datetime(2022, 7, 11, 10, 0, tzinfo=ZoneInfo("UTC"))
+END = datetime(2022, 7, 13, 8, 0, tzinfo=ZoneInfo("UTC"))
+
+
+@mock.patch(
+    "django.utils.timezone.now",
+    return_value=datetime(2022, 7, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+)
+class OccurrencesCacheTestCase(TestCase):
+    """Unit test suite to validate the two tiers cache of meeting occurrences."""
+
+    def setUp(self):
+        """Start each test with empty tiers."""
+        super().setUp()
+        cache.clear()
+
+    @staticmethod
+    def create_meeting(**kwargs):
+        """Create a daily meeting starting on 2022-07-07."""
+        return MeetingFactory(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            frequency=1,
+            recurring_until=None,
+            timezone=ZoneInfo("UTC"),
+            **kwargs,
+        )
+
+    def test_cache_occurrences_hits_and_misses(self, _mock_now):
+        """
+        Occurrences should be computed once for whole days and served from the local tier
+        then, filtered on the period requested.
+        """
+        occurrences_cache = OccurrencesCache()
+        meeting = self.create_meeting()
+
+        with mock.patch.object(
+            Meeting,
+            "get_occurrences",
+            side_effect=Meeting.get_occurrences,
+            autospec=True,
+        ) as mock_get_occurrences:
+            for _i in range(2):
+                self.assertEqual(
+                    occurrences_cache.get_occurrences(meeting, START, END),
+                    [datetime(2022, 7, 12, 9, 0, tzinfo=ZoneInfo("UTC"))],
+                )
+            # Same days, different period
+            self.assertEqual(
+                occurrences_cache.get_occurrences(
+                    meeting,
+                    datetime(2022, 7, 11, tzinfo=ZoneInfo("UTC")),
+                    END,
+                ),
+                [
+                    datetime(2022, 7, 11, 9, 0, tzinfo=ZoneInfo("UTC")),
+                    datetime(2022, 7, 12, 9, 0, tzinfo=ZoneInfo("UTC")),
+                ],
+            )
+
+        mock_get_occurrences.assert_not_called()
+        self.assertEqual(
+            occurrences_cache.get_stats(),
+            {
+                "local_hits": 2,
+                "shared_hits": 0,
+                "misses": 1,
+                "local_size": 1,
+                "local_max_size": 1000,
+            },
+        )
+
+    def test_cache_occurrences_shared_tier(self, _mock_now):
+        """Occurrences cached by a process should be served to other processes."""
+        meeting = self.create_meeting()
+        OccurrencesCache().get_occurrences(meeting, START, END)
+
+        other_cache = OccurrencesCache()
+        self.assertEqual(
+            other_cache.get_occurrences(meeting, START, END),
+            [datetime(2022, 7, 12, 9, 0, tzinfo=ZoneInfo("UTC"))],
+        )
+        stats = other_cache.get_stats()
+        self.assertEqual((stats["shared_hits"], stats["misses"]), (1, 0))
+
+    @override_settings(MEETING_OCCURRENCES_CACHE_SIZE=2)
+    def test_cache_occurrences_local_lru(self, _mock_now):
+        """The least recently used entries should be evicted from the local tier."""
+        occurrences_cache = OccurrencesCache()
+        meetings = [self.create_meeting() for _i in range(3)]
+
+        occurrences_cache.get_many(meetings[:2], START, END)
+        occurrences_cache.get_occurrences(meetings[0], START, END)
+        occurrences_cache.get_occurrences(meetings[2], START, END)
+
+        self.assertEqual(len(occurrences_cache.local.entries), 2)
+        self.assertEqual(
+            set(occurrences_cache.local_keys),
+            {str(meetings[0].pk), str(meetings[2].pk)},
+        )
+
+    @override_settings(MEETING_OCCURRENCES_CACHE_TIMEOUT=0)
+    def test_cache_occurrences_invalidated(self, _mock_now):
+        """Changing the recurrence of a meeting should not serve its cached occurrences."""
+        occurrences_cache = OccurrencesCache()
+        meeting = self.create_meeting()
+        occurrences_cache.get_occurrences(meeting, START, END)
+
+        meeting.frequency = 2
+        meeting.save()
+        self.assertEqual(occurrences_cache.get_occurrences(meeting, START, END), [])
+        self.assertEqual(occurrences_cache.get_stats()["misses"], 2)
+
+        occurrences_cache.invalidate(meeting)
+        self.assertEqual(occurrences_cache.local.entries, {})
+
+    def test_cache_occurrences_invalidated_on_save_and_delete(self, _mock_now):
+        """Saving or deleting a meeting should drop its occurrences from the local tier."""
+        meeting = self.create_meeting()
+        with mock.patch(
+            "magnify.apps.core.models.occurrences_cache.invalidate"
+        ) as mock_invalidate:
+            meeting.save()
+            mock_invalidate.assert_called_once_with(meeting)
+
+            mock_invalidate.reset_mock()
+            meeting.delete()
+            mock_invalidate.assert_called_once_with(meeting)
+
+    def test_cache_occurrences_no_recurrence(self, _mock_now):
+        """Occurrences of meetings without recurrence should not be cached."""
+        occurrences_cache = OccurrencesCache()
+        meeting = MeetingFactory(
+            start=datetime(2022, 7, 12, 9, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 12, 10, 0, tzinfo=ZoneInfo("UTC")),
+        )
+        self.assertEqual(
+            occurrences_cache.get_occurrences(meeting, START, END),
+            [datetime(2022, 7, 12, 9, 0, tzinfo=ZoneInfo("UTC"))],
+        )
+        self.assertEqual(occurrences_cache.get_stats()["misses"], 0)
+        self.assertEqual(occurrences_cache.local.entries, {})
@@ -0,0 +1,36 @@
+"""
+Test suite for the rebuild_effective_resource_accesses management command
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from magnify.apps.core.factories import (
+    GroupFactory,
+    GroupResourceAccessFactory,
+    UserFactory,
+    UserResourceAccessFactory,
+)
+from magnify.apps.core.models import EffectiveResourceAccess
+
+
+class RebuildEffectiveResourceAccessesCommandTestCase(TestCase):
+    """Test the command that rebuilds effective resource accesses."""
+
+    def test_commands_rebuild_effective_resource_accesses(self):
+        """Effective accesses out of sync should be recomputed."""
+        access = UserResourceAccessFactory(role="administrator")
+        GroupResourceAccessFactory(
+            group=GroupFactory(members=UserFactory.create_batch(2)), role="member"
+        )
+        EffectiveResourceAccess.objects.filter(user=access.user).update(role="member")
+        EffectiveResourceAccess.objects.exclude(user=access.user).delete()
+
+        out = StringIO()
+        call_command("rebuild_effective_resource_accesses", stdout=out)
+
+        self.assertEqual(out.getvalue(), "3 effective resource access(es) rebuilt.\n")
+        self.assertEqual(
+            EffectiveResourceAccess.objects.get(user=access.user).role, "administrator"
+        )
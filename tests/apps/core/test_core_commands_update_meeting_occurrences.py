@@ -0,0 +1,68 @@
+"""
+Test suite for the update_meeting_occurrences management command
+"""
+from datetime import datetime
+from io import StringIO
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from magnify.apps.core.factories import MeetingFactory
+from magnify.apps.core.models import Meeting, MeetingOccurrence
+
+
+@override_settings(MEETING_OCCURRENCES_HORIZON_DAYS=10)
+class UpdateMeetingOccurrencesCommandTestCase(TestCase):
+    """Test the command that keeps occurrences materialized up to the rolling horizon."""
+
+    def test_commands_update_meeting_occurrences(self):
+        """
+        The command should materialize meetings never materialized and extend infinite
+        recurrences up to the horizon.
+        """
+        with mock.patch(
+            "django.utils.timezone.now",
+            return_value=datetime(2022, 7, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+        ):
+            infinite = MeetingFactory(
+                start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence="daily",
+                recurring_until=None,
+                nb_occurrences=None,
+                timezone=ZoneInfo("UTC"),
+            )
+            finite = MeetingFactory(
+                start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence="daily",
+                nb_occurrences=3,
+            )
+            legacy = MeetingFactory(
+                start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence="daily",
+                nb_occurrences=2,
+            )
+        # Simulate a meeting created before occurrences were materialized
+        legacy.occurrences.all().delete()
+        Meeting.objects.filter(pk=legacy.pk).update(occurrences_until=None)
+        self.assertEqual(infinite.occurrences.count(), 5)
+
+        out = StringIO()
+        with mock.patch(
+            "django.utils.timezone.now",
+            return_value=datetime(2022, 7, 11, 9, 0, tzinfo=ZoneInfo("UTC")),
+        ):
+            call_command("update_meeting_occurrences", stdout=out)
+
+        self.assertEqual(out.getvalue(), "Occurrences updated for 2 meeting(s).\n")
+        infinite.refresh_from_db()
+        self.assertEqual(
+            infinite.occurrences_until,
+            datetime(2022, 7, 21, 9, 0, tzinfo=ZoneInfo("UTC")),
+        )
+        self.assertEqual(infinite.occurrences.count(), 15)
+        self.assertEqual(finite.occurrences.count(), 3)
+        self.assertEqual(legacy.occurrences.count(), 2)
+        self.assertEqual(MeetingOccurrence.objects.count(), 20)
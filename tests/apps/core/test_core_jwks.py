@@ -0,0 +1,217 @@
+"""
+Unit tests for the JWKS cache against a local JWKS server.
+"""
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from uuid import uuid4
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt import PyJWKClientError
+from jwt.algorithms import RSAAlgorithm
+from rest_framework_simplejwt.exceptions import TokenError
+
+from magnify.apps.core.jwks import JWKSCache, jwks_cache
+from magnify.apps.core.tokens import BearerToken
+
+PRIVATE_KEYS = {
+    kid: rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    for kid in ["key-1", "key-2"]
+}
+
+
+def get_jwk(kid):
+    """Returns the public key of the private key passed in argument as a JWK."""
+    jwk = json.loads(RSAAlgorithm.to_jwk(PRIVATE_KEYS[kid].public_key()))
+    return {**jwk, "kid": kid, "use": "sig", "alg": "RS256"}
+
+
+class JWKSHandler(BaseHTTPRequestHandler):
+    """Serve the JWKS configured on the server, counting requests."""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Return the JWKS after the configured delay."""
+        server = self.server
+        with server.lock:
+            server.hits += 1
+        time.sleep(server.delay)
+        body = json.dumps({"keys": [get_jwk(kid) for kid in server.kids]}).encode()
+        self.send_response(server.status)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Keep the output of tests clean."""
+
+
+class JWKSCacheTestCase(TestCase):
+    """Unit test suite to validate the JWKS cache against a local JWKS server."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), JWKSHandler)
+        cls.server.lock = threading.Lock()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port:d}/certs"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        """Serve the first key without delay and start with an empty cache."""
+        super().setUp()
+        self.server.kids = ["key-1"]
+        self.server.delay = 0
+        self.server.status = 200
+        self.server.hits = 0
+        self.clock = mock.Mock(return_value=1000.0)
+        self.cache = JWKSCache(clock=self.clock)
+        jwks_cache.clear()
+        override = override_settings(SIMPLE_JWT={"JWK_URL": self.url})
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_jwks_cache_fetch_once(self):
+        """Keys should be fetched once and then served from the cache."""
+        for _i in range(3):
+            key = self.cache.get_signing_key("key-1")
+        self.assertEqual(key.key_id, "key-1")
+        self.assertEqual(self.server.hits, 1)
+        self.assertEqual(
+            self.cache.get_stats(), {"fetches": 1, "failures": 0, "age": 0}
+        )
+
+    def test_jwks_cache_kid_miss(self):
+        """A missing key id should fetch keys again, at most once per minimum interval."""
+        self.cache.get_signing_key("key-1")
+
+        self.server.kids = ["key-1", "key-2"]
+        self.clock.return_value += 10
+        self.assertEqual(self.cache.get_signing_key("key-2").key_id, "key-2")
+        self.assertEqual(self.server.hits, 2)
+
+        # Unknown key ids do not hammer the JWKS server
+        self.clock.return_value += 1
+        with self.assertRaises(PyJWKClientError):
+            self.cache.get_signing_key("unknown")
+        self.assertEqual(self.server.hits, 2)
+
+        self.clock.return_value += 10
+        with self.assertRaises(PyJWKClientError):
+            self.cache.get_signing_key("unknown")
+        self.assertEqual(self.server.hits, 3)
+
+    def test_jwks_cache_single_flight(self):
+        """Concurrent requests on a cold cache should fetch keys once."""
+        self.server.delay = 0.2
+        keys = []
+
+        def get_key():
+            keys.append(self.cache.get_signing_key("key-1"))
+
+        threads = [threading.Thread(target=get_key) for _i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(keys), 5)
+        self.assertEqual({key.key_id for key in keys}, {"key-1"})
+        self.assertEqual(self.server.hits, 1)
+
+    def test_jwks_cache_stale_while_revalidate(self):
+        """Stale keys should be served while they are fetched again in the background."""
+        self.cache.get_signing_key("key-1")
+        self.server.kids = ["key-2"]
+        self.server.delay = 0.2
+        self.clock.return_value += 301
+
+        started_at = time.monotonic()
+        self.assertEqual(self.cache.get_signing_key("key-1").key_id, "key-1")
+        self.assertLess(time.monotonic() - started_at, 0.2)
+        # The revalidation in progress is not started twice
+        self.cache.get_signing_key("key-1")
+
+        for _i in range(100):
+            if not self.cache.state.is_revalidating:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.server.hits, 2)
+        self.assertEqual(list(self.cache.state.keys), ["key-2"])
+
+    def test_jwks_cache_server_down(self):
+        """
+        Stale keys should be served while the JWKS server is down, until they exceed their
+        stale TTL.
+        """
+        self.cache.get_signing_key("key-1")
+        self.server.status = 500
+
+        self.clock.return_value += 301
+        with self.assertLogs("magnify.apps.core.jwks", "WARNING"):
+            self.assertEqual(self.cache.get_signing_key("key-1").key_id, "key-1")
+            for _i in range(100):
+                if not self.cache.state.is_revalidating:
+                    break
+                time.sleep(0.01)
+
+        self.clock.return_value += 3600
+        with self.assertRaises(PyJWKClientError):
+            self.cache.get_signing_key("key-1")
+        self.assertEqual(self.cache.get_stats()["failures"], 2)
+
+    def test_jwks_cache_warm_up(self):
+        """Warming up should fetch keys, logging failures instead of raising them."""
+        self.cache.warm_up()
+        self.assertEqual(self.server.hits, 1)
+
+        self.cache.clear()
+        self.server.status = 500
+        with self.assertLogs("magnify.apps.core.jwks", "WARNING"):
+            self.cache.warm_up()
+        self.assertIsNone(self.cache.state.keys)
+
+        with override_settings(SIMPLE_JWT={"JWK_URL": None}):
+            self.cache.warm_up()
+        self.assertEqual(self.server.hits, 2)
+
+    def test_jwks_cache_bearer_token(self):
+        """Bearer tokens should be verified with the keys of the JWKS cache."""
+        claims = {
+            "sub": str(uuid4()),
+            "jti": uuid4().hex,
+            "token_type": "Bearer",
+            "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+        }
+        with override_settings(SIMPLE_JWT={"JWK_URL": self.url, "ALGORITHM": "RS256"}):
+            for _i in range(2):
+                token = jwt.encode(
+                    claims,
+                    PRIVATE_KEYS["key-1"],
+                    algorithm="RS256",
+                    headers={"kid": "key-1"},
+                )
+                self.assertEqual(BearerToken(token)["sub"], claims["sub"])
+
+            forged_token = jwt.encode(
+                claims,
+                PRIVATE_KEYS["key-2"],
+                algorithm="RS256",
+                headers={"kid": "key-1"},
+            )
+            with self.assertRaises(TokenError):
+                BearerToken(forged_token)
+
+        self.assertEqual(self.server.hits, 1)
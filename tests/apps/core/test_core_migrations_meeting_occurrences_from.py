@@ -0,0 +1,147 @@
+"""
+Test suite for the migration materializing the occurrences of existing meetings
+"""
+from datetime import datetime
+from importlib import import_module
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.apps import apps
+from django.conf import settings
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from magnify.apps.core.factories import MeetingFactory
+from magnify.apps.core.models import Meeting, MeetingOccurrence
+
+migration = import_module("magnify.apps.core.migrations.0007_meeting_occurrences_from")
+
+
+@override_settings(
+    MEETING_OCCURRENCES_HORIZON_DAYS=10, MEETING_OCCURRENCES_RETENTION_DAYS=5
+)
+@mock.patch(
+    "django.utils.timezone.now",
+    return_value=datetime(2022, 7, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+)
+class MeetingOccurrencesFromMigrationTestCase(TestCase):
+    """Test the backfill of the occurrences of meetings when migrating."""
+
+    def test_migrations_meeting_occurrences_from(self, _mock_now):
+        """
+        Meetings never materialized should be materialized as when saving them, and meetings
+        already materialized should be materialized from their start.
+        """
+        materialized = MeetingFactory(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            nb_occurrences=3,
+            timezone=ZoneInfo("UTC"),
+        )
+        meetings = [
+            MeetingFactory(
+                start=datetime(2020, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence="daily",
+                recurring_until=None,
+                nb_occurrences=None,
+                timezone=ZoneInfo("Europe/Paris"),
+            ),
+            MeetingFactory(
+                start=datetime(2022, 6, 27, 9, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence="weekly",
+                weekdays="024",
+                nb_occurrences=7,
+                timezone=ZoneInfo("UTC"),
+            ),
+            MeetingFactory(
+                start=datetime(2022, 1, 31, 9, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence="monthly",
+                monthly_type="date_day",
+                recurring_until=None,
+                nb_occurrences=None,
+                timezone=ZoneInfo("UTC"),
+            ),
+            # The first sunday of a month must be walked
+            MeetingFactory(
+                start=datetime(2022, 5, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence="monthly",
+                monthly_type="nth_day",
+                recurring_until=None,
+                nb_occurrences=None,
+                timezone=ZoneInfo("Europe/Paris"),
+            ),
+            MeetingFactory(
+                start=datetime(2022, 6, 15, 9, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence="monthly",
+                frequency=2,
+                monthly_type="nth_day",
+                nb_occurrences=4,
+                timezone=ZoneInfo("UTC"),
+            ),
+            MeetingFactory(
+                start=datetime(2020, 2, 29, 9, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence="yearly",
+                recurring_until=None,
+                nb_occurrences=None,
+                timezone=ZoneInfo("UTC"),
+            ),
+            MeetingFactory(start=datetime(2020, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC"))),
+        ]
+        expected = {
+            meeting.pk: (
+                meeting.occurrences_from,
+                meeting.occurrences_until,
+                list(meeting.occurrences.values_list("start", "end")),
+            )
+            for meeting in meetings
+        }
+
+        # Simulate meetings created before occurrences were materialized
+        MeetingOccurrence.objects.exclude(meeting=materialized).delete()
+        Meeting.objects.update(occurrences_from=None)
+        Meeting.objects.exclude(pk=materialized.pk).update(occurrences_until=None)
+
+        migration.materialize_occurrences(apps, None)
+
+        for meeting in Meeting.objects.exclude(pk=materialized.pk):
+            self.assertEqual(
+                (
+                    meeting.occurrences_from,
+                    meeting.occurrences_until,
+                    list(meeting.occurrences.values_list("start", "end")),
+                ),
+                expected[meeting.pk],
+            )
+        materialized.refresh_from_db()
+        self.assertEqual(materialized.occurrences_from, materialized.start)
+        self.assertEqual(materialized.occurrences.count(), 3)
+
+    def test_migrations_meeting_occurrences_from_default_settings(self, _mock_now):
+        """
+        The migration should not depend on settings that may not be defined, falling back
+        to their defaults at the time of the migration.
+        """
+        meeting = MeetingFactory(
+            start=datetime(2020, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            recurring_until=None,
+            nb_occurrences=None,
+            timezone=ZoneInfo("UTC"),
+        )
+        MeetingOccurrence.objects.all().delete()
+        Meeting.objects.update(occurrences_from=None, occurrences_until=None)
+
+        with self.settings():
+            del settings.MEETING_OCCURRENCES_HORIZON_DAYS
+            del settings.MEETING_OCCURRENCES_RETENTION_DAYS
+            migration.materialize_occurrences(apps, None)
+
+        meeting.refresh_from_db()
+        self.assertEqual(
+            meeting.occurrences_from, datetime(2021, 7, 1, 9, 0, tzinfo=ZoneInfo("UTC"))
+        )
+        self.assertEqual(
+            meeting.occurrences_until,
+            datetime(2023, 7, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+        )
+        self.assertEqual(meeting.occurrences.count(), 731)
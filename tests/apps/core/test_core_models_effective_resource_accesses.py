@@ -0,0 +1,177 @@
+"""
+Unit tests for the EffectiveResourceAccess model and its synchronization
+"""
+from django.test import TestCase
+
+from magnify.apps.core.factories import (
+    GroupFactory,
+    GroupResourceAccessFactory,
+    RoomFactory,
+    UserFactory,
+    UserResourceAccessFactory,
+)
+from magnify.apps.core.models import EffectiveResourceAccess, ResourceAccess
+
+
+class EffectiveResourceAccessesModelsTestCase(TestCase):
+    """
+    Unit test suite to validate that effective resource accesses are kept in sync with
+    resource accesses and group memberships.
+    """
+
+    @staticmethod
+    def get_effective_accesses():
+        """Return effective accesses as a set of (user id, resource id, role) tuples."""
+        return set(
+            EffectiveResourceAccess.objects.values_list(
+                "user_id", "resource_id", "role"
+            )
+        )
+
+    def test_models_effective_resource_accesses_user(self):
+        """Saving or deleting the access of a user should update their effective access."""
+        access = UserResourceAccessFactory(role="member")
+        self.assertEqual(
+            self.get_effective_accesses(),
+            {(access.user_id, access.resource_id, "member")},
+        )
+
+        access.role = "administrator"
+        access.save()
+        self.assertEqual(
+            self.get_effective_accesses(),
+            {(access.user_id, access.resource_id, "administrator")},
+        )
+
+        access.delete()
+        self.assertEqual(self.get_effective_accesses(), set())
+
+    def test_models_effective_resource_accesses_moved(self):
+        """
+        Moving an access to another resource should update the effective accesses to both
+        resources.
+        """
+        access = UserResourceAccessFactory(role="member")
+        old_resource_id = access.resource_id
+        room = RoomFactory()
+
+        access.resource = room
+        access.save()
+        self.assertEqual(
+            self.get_effective_accesses(),
+            {(access.user_id, room.id, "member")},
+        )
+        self.assertNotEqual(old_resource_id, room.id)
+
+        # Accesses loaded from the database remember their resource as well
+        access = ResourceAccess.objects.get(pk=access.pk)
+        access.resource = RoomFactory()
+        access.save()
+        self.assertEqual(
+            self.get_effective_accesses(),
+            {(access.user_id, access.resource_id, "member")},
+        )
+
+    def test_models_effective_resource_accesses_highest_role(self):
+        """
+        The effective access should carry the highest role among the user's own access and
+        the accesses of the groups of which the user is a member or an administrator.
+        """
+        user = UserFactory()
+        room = RoomFactory(users=[(user, "member")])
+        GroupResourceAccessFactory(
+            resource=room, group=GroupFactory(administrators=[user]), role="member"
+        )
+        group_access = GroupResourceAccessFactory(
+            resource=room, group=GroupFactory(members=[user]), role="administrator"
+        )
+        self.assertEqual(
+            self.get_effective_accesses(), {(user.id, room.id, "administrator")}
+        )
+        self.assertEqual(room.get_role(user), "administrator")
+
+        group_access.delete()
+        self.assertEqual(self.get_effective_accesses(), {(user.id, room.id, "member")})
+
+    def test_models_effective_resource_accesses_group_members(self):
+        """Adding or removing users to or from a group should update their accesses."""
+        user, other_user = UserFactory.create_batch(2)
+        group = GroupFactory()
+        access = GroupResourceAccessFactory(group=group, role="member")
+
+        group.members.add(user)
+        user.is_administrator_of.add(group)
+        other_user.is_member_of.add(group)
+        self.assertEqual(
+            self.get_effective_accesses(),
+            {
+                (user.id, access.resource_id, "member"),
+                (other_user.id, access.resource_id, "member"),
+            },
+        )
+
+        group.members.remove(user)
+        other_user.is_member_of.clear()
+        self.assertEqual(
+            self.get_effective_accesses(), {(user.id, access.resource_id, "member")}
+        )
+
+        group.administrators.clear()
+        self.assertEqual(self.get_effective_accesses(), set())
+
+    def test_models_effective_resource_accesses_related_managers(self):
+        """Accesses added via the related managers of resources should be effective."""
+        user = UserFactory()
+        group = GroupFactory(members=[user])
+        room, other_room = RoomFactory.create_batch(2)
+
+        room.users.add(user)
+        group.resources.add(other_room)
+        self.assertEqual(
+            self.get_effective_accesses(),
+            {(user.id, room.id, "member"), (user.id, other_room.id, "member")},
+        )
+
+        room.users.remove(user)
+        group.resources.clear()
+        self.assertEqual(self.get_effective_accesses(), set())
+
+    def test_models_effective_resource_accesses_cascade(self):
+        """Deleting users, groups or resources should delete the related accesses."""
+        user = UserFactory()
+        group = GroupFactory(members=[user])
+        room = RoomFactory(users=[(user, "owner")], groups=[group])
+        other_room = RoomFactory(users=[(user, "owner")], groups=[group])
+
+        room.delete()
+        self.assertEqual(
+            self.get_effective_accesses(), {(user.id, other_room.id, "owner")}
+        )
+
+        group.delete()
+        self.assertEqual(
+            self.get_effective_accesses(), {(user.id, other_room.id, "owner")}
+        )
+
+        user.delete()
+        self.assertEqual(self.get_effective_accesses(), set())
+
+    def test_models_effective_resource_accesses_rebuild(self):
+        """Rebuilding effective accesses should restore them from resource accesses."""
+        access = UserResourceAccessFactory(role="owner")
+        other_access = GroupResourceAccessFactory(
+            group__members=[UserFactory()], role="member"
+        )
+        expected = self.get_effective_accesses()
+        EffectiveResourceAccess.objects.all().delete()
+
+        EffectiveResourceAccess.objects.rebuild(resources=[access.resource_id])
+        self.assertEqual(
+            self.get_effective_accesses(),
+            {(access.user_id, access.resource_id, "owner")},
+        )
+
+        EffectiveResourceAccess.objects.rebuild()
+        self.assertEqual(self.get_effective_accesses(), expected)
+        self.assertEqual(len(expected), 2)
+        self.assertIn(other_access.resource_id, {item[1] for item in expected})
@@ -0,0 +1,214 @@
+"""
+Unit tests for the MeetingOccurrence model and the materialization of meeting occurrences
+"""
+from datetime import datetime, timedelta
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from magnify.apps.core.factories import MeetingFactory
+from magnify.apps.core.models import Meeting, MeetingOccurrence
+
+
+@mock.patch(
+    "django.utils.timezone.now",
+    return_value=datetime(2022, 7, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+)
+class MeetingOccurrencesModelsTestCase(TestCase):
+    """
+    Unit test suite to validate that occurrences materialized in database are kept in sync
+    with the recurrence of their meeting.
+    """
+
+    def test_models_meeting_occurrences_no_recurrence(self, _mock_now):
+        """A meeting without recurrence should be materialized as one occurrence."""
+        meeting = MeetingFactory(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 7, 10, 0, tzinfo=ZoneInfo("UTC")),
+        )
+        self.assertEqual(
+            list(meeting.occurrences.values_list("start", "end")),
+            [
+                (
+                    datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+                    datetime(2022, 7, 7, 10, 0, tzinfo=ZoneInfo("UTC")),
+                )
+            ],
+        )
+        self.assertEqual(meeting.occurrences_until, meeting.start)
+
+    def test_models_meeting_occurrences_finite(self, _mock_now):
+        """All occurrences of a finite recurrence should be materialized."""
+        meeting = MeetingFactory(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 7, 10, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            nb_occurrences=3,
+            timezone=ZoneInfo("Europe/Paris"),
+        )
+        self.assertEqual(
+            list(meeting.occurrences.values_list("start", flat=True)),
+            [
+                datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 7, 8, 9, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 7, 9, 9, 0, tzinfo=ZoneInfo("UTC")),
+            ],
+        )
+        self.assertEqual(meeting.occurrences_until, meeting.recurring_until)
+
+    @override_settings(MEETING_OCCURRENCES_HORIZON_DAYS=10)
+    def test_models_meeting_occurrences_infinite(self, _mock_now):
+        """Occurrences of an infinite recurrence should be materialized up to the horizon."""
+        meeting = MeetingFactory(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 7, 10, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            recurring_until=None,
+            nb_occurrences=None,
+            timezone=ZoneInfo("Europe/Paris"),
+        )
+        self.assertEqual(
+            meeting.occurrences_until,
+            datetime(2022, 7, 11, 9, 0, tzinfo=ZoneInfo("UTC")),
+        )
+        self.assertEqual(meeting.occurrences.count(), 5)
+
+        meeting.extend_occurrences(
+            until=datetime(2022, 7, 13, 9, 0, tzinfo=ZoneInfo("UTC"))
+        )
+        meeting.refresh_from_db()
+        self.assertEqual(
+            meeting.occurrences_until,
+            datetime(2022, 7, 13, 9, 0, tzinfo=ZoneInfo("UTC")),
+        )
+        self.assertEqual(
+            list(meeting.occurrences.values_list("start", flat=True)),
+            meeting.get_occurrences(
+                meeting.start, datetime(2022, 7, 13, 9, 0, tzinfo=ZoneInfo("UTC"))
+            ),
+        )
+
+    @override_settings(
+        MEETING_OCCURRENCES_HORIZON_DAYS=10, MEETING_OCCURRENCES_RETENTION_DAYS=5
+    )
+    def test_models_meeting_occurrences_retention(self, _mock_now):
+        """
+        Occurrences of a recurrence older than the retention should only be materialized from
+        the retention, the meeting being still found in older periods.
+        """
+        meeting = MeetingFactory(
+            start=datetime(2020, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2020, 7, 7, 10, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            recurring_until=None,
+            nb_occurrences=None,
+            timezone=ZoneInfo("UTC"),
+        )
+        self.assertEqual(
+            meeting.occurrences_from,
+            datetime(2022, 6, 26, 9, 0, tzinfo=ZoneInfo("UTC")),
+        )
+        self.assertEqual(
+            list(meeting.occurrences.values_list("start", flat=True)),
+            [
+                datetime(2022, 6, day, 9, 0, tzinfo=ZoneInfo("UTC"))
+                for day in range(26, 31)
+            ]
+            + [
+                datetime(2022, 7, day, 9, 0, tzinfo=ZoneInfo("UTC"))
+                for day in range(1, 12)
+            ],
+        )
+
+        for start, end in [
+            (
+                datetime(2021, 1, 1, 0, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2021, 1, 2, 0, 0, tzinfo=ZoneInfo("UTC")),
+            ),
+            (
+                datetime(2022, 7, 2, 0, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 7, 3, 0, 0, tzinfo=ZoneInfo("UTC")),
+            ),
+        ]:
+            self.assertTrue(
+                Meeting.objects.occurring_between(start, end)
+                .filter(pk=meeting.pk)
+                .exists()
+            )
+
+        # A single meeting is always materialized
+        meeting = MeetingFactory(
+            start=datetime(2020, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2020, 7, 7, 10, 0, tzinfo=ZoneInfo("UTC")),
+        )
+        self.assertEqual(meeting.occurrences.count(), 1)
+        self.assertEqual(meeting.occurrences_from, meeting.start)
+
+    def test_models_meeting_occurrences_recurrence_changed(self, _mock_now):
+        """Occurrences should be materialized again when the recurrence changes."""
+        meeting = MeetingFactory(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            end=datetime(2022, 7, 7, 10, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            nb_occurrences=3,
+            timezone=ZoneInfo("Europe/Paris"),
+        )
+        kept = meeting.occurrences.get(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC"))
+        )
+
+        meeting = Meeting.objects.get(pk=meeting.pk)
+        meeting.frequency = 2
+        meeting.save()
+
+        # The date of end of recurrence is kept so there is one occurrence less
+        self.assertEqual(
+            list(meeting.occurrences.values_list("start", flat=True)),
+            [
+                datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 7, 9, 9, 0, tzinfo=ZoneInfo("UTC")),
+            ],
+        )
+        # Occurrences that did not change are updated incrementally
+        self.assertTrue(meeting.occurrences.filter(pk=kept.pk).exists())
+
+        # Changing the duration of the meeting changes the end of all occurrences
+        meeting.end += timedelta(minutes=30)
+        meeting.save()
+        self.assertFalse(meeting.occurrences.filter(pk=kept.pk).exists())
+        self.assertEqual(
+            set(meeting.occurrences.values_list("end", flat=True)),
+            {
+                datetime(2022, 7, 7, 10, 30, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 7, 9, 10, 30, tzinfo=ZoneInfo("UTC")),
+            },
+        )
+
+    def test_models_meeting_occurrences_recurrence_unchanged(self, _mock_now):
+        """Saving a meeting without changing its recurrence should not touch occurrences."""
+        meeting = MeetingFactory(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            nb_occurrences=3,
+        )
+        meeting = Meeting.objects.get(pk=meeting.pk)
+        meeting.name = "new name"
+
+        with mock.patch.object(Meeting, "update_occurrences") as mock_update:
+            meeting.save()
+
+        mock_update.assert_not_called()
+
+    def test_models_meeting_occurrences_delete_cascade(self, _mock_now):
+        """Occurrences should be deleted with their meeting."""
+        meeting = MeetingFactory(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            nb_occurrences=3,
+        )
+        self.assertEqual(MeetingOccurrence.objects.count(), 3)
+
+        meeting.delete()
+        self.assertFalse(MeetingOccurrence.objects.exists())
@@ -0,0 +1,176 @@
+"""
+Unit tests for the `get_nth_occurrence` and `count_occurrences` methods on the Meeting model
+"""
+from datetime import datetime
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.test import TestCase
+
+from magnify.apps.core.factories import MeetingFactory
+from magnify.apps.core.models import Meeting
+
+
+class CountOccurrencesMeetingsModelsTestCase(TestCase):
+    """
+    Unit test suite to validate that occurrences are indexed and counted arithmetically
+    consistently with walking the recurrence.
+    """
+
+    def test_models_meetings_get_nth_occurrence_no_recurrence(self):
+        """A meeting without recurrence should only have its start as occurrence."""
+        meeting = MeetingFactory.build(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")), recurrence=None
+        )
+        self.assertEqual(meeting.get_nth_occurrence(0), meeting.start)
+        with self.assertRaises(RuntimeError):
+            meeting.get_nth_occurrence(1)
+
+        self.assertEqual(
+            meeting.count_occurrences(
+                datetime(2022, 7, 7, 8, 59, tzinfo=ZoneInfo("UTC"))
+            ),
+            0,
+        )
+        self.assertEqual(
+            meeting.count_occurrences(datetime(2030, 1, 1, tzinfo=ZoneInfo("UTC"))), 1
+        )
+
+    def test_models_meetings_count_occurrences_daily(self):
+        """Daily occurrences should be indexed and counted with the frequency."""
+        meeting = MeetingFactory.build(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            frequency=2,
+            timezone=ZoneInfo("UTC"),
+        )
+        self.assertEqual(
+            meeting.get_nth_occurrence(3),
+            datetime(2022, 7, 13, 9, 0, tzinfo=ZoneInfo("UTC")),
+        )
+        self.assertEqual(
+            meeting.count_occurrences(
+                datetime(2022, 7, 13, 8, 59, tzinfo=ZoneInfo("UTC"))
+            ),
+            3,
+        )
+        self.assertEqual(
+            meeting.count_occurrences(
+                datetime(2022, 7, 13, 9, 0, tzinfo=ZoneInfo("UTC"))
+            ),
+            4,
+        )
+
+    def test_models_meetings_count_occurrences_weekly(self):
+        """
+        Weekly occurrences should be indexed and counted by period of weeks holding one
+        occurrence per weekday, except for the first period.
+        """
+        meeting = MeetingFactory.build(
+            start=datetime(2022, 10, 27, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="weekly",
+            frequency=2,
+            timezone=ZoneInfo("UTC"),
+            weekdays="036",  # Monday, Thursday and Sunday
+        )
+        self.assertEqual(
+            [meeting.get_nth_occurrence(index) for index in range(6)],
+            [
+                datetime(2022, 10, 27, 9, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 10, 30, 9, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 11, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 11, 10, 9, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 11, 13, 9, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 11, 21, 9, 0, tzinfo=ZoneInfo("UTC")),
+            ],
+        )
+        self.assertEqual(
+            meeting.count_occurrences(
+                datetime(2022, 11, 12, 23, 0, tzinfo=ZoneInfo("UTC"))
+            ),
+            4,
+        )
+        self.assertEqual(
+            meeting.count_occurrences(
+                datetime(2022, 11, 20, 23, 0, tzinfo=ZoneInfo("UTC"))
+            ),
+            5,
+        )
+
+    def test_models_meetings_count_occurrences_monthly_date_day(self):
+        """Days clipped to the end of a month should stay clipped as when walking."""
+        meeting = MeetingFactory.build(
+            start=datetime(2022, 1, 31, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="monthly",
+            monthly_type="date_day",
+            frequency=1,
+            timezone=ZoneInfo("UTC"),
+        )
+        self.assertEqual(
+            meeting.get_nth_occurrence(2),
+            datetime(2022, 3, 28, 9, 0, tzinfo=ZoneInfo("UTC")),
+        )
+        self.assertEqual(
+            meeting.count_occurrences(
+                datetime(2022, 3, 30, 9, 0, tzinfo=ZoneInfo("UTC"))
+            ),
+            3,
+        )
+
+    def test_models_meetings_count_occurrences_consistent_with_walking(self):
+        """Indexing and counting should give the same results as walking the recurrence."""
+        for recurrence, monthly_type, start in [
+            ("monthly", "nth_day", datetime(2022, 7, 26, 9, 0)),  # 4th tuesday
+            ("monthly", "nth_day", datetime(2022, 7, 31, 9, 0)),  # Sunday is walked
+            ("monthly", "date_day", datetime(2022, 8, 31, 9, 0)),
+            ("yearly", "date_day", datetime(2024, 2, 29, 9, 0)),
+        ]:
+            meeting = MeetingFactory.build(
+                start=start.replace(tzinfo=ZoneInfo("UTC")),
+                recurrence=recurrence,
+                monthly_type=monthly_type,
+                frequency=1,
+                timezone=ZoneInfo("Europe/Paris"),
+            )
+            walked = [meeting.start]
+            for _i in range(30):
+                walked.append(meeting.next_occurrence(walked[-1]))
+
+            for index, occurrence in enumerate(walked):
+                self.assertEqual(meeting.get_nth_occurrence(index), occurrence)
+                self.assertEqual(meeting.count_occurrences(occurrence), index + 1)
+
+    @mock.patch(
+        "django.utils.timezone.now",
+        return_value=datetime(2022, 7, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+    )
+    def test_models_meetings_count_occurrences_save_long_recurrence(self, _mock_now):
+        """
+        Saving a meeting with a long recurrence should compute its end arithmetically and
+        only materialize its occurrences up to the horizon.
+        """
+        meeting = MeetingFactory(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            frequency=1,
+            timezone=ZoneInfo("UTC"),
+            nb_occurrences=100000,
+        )
+        self.assertEqual(
+            meeting.recurring_until,
+            datetime(2296, 4, 20, 9, 0, tzinfo=ZoneInfo("UTC")),
+        )
+        self.assertEqual(
+            meeting.occurrences_until,
+            datetime(2023, 7, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+        )
+        self.assertEqual(meeting.occurrences.count(), 360)
+
+        meeting = Meeting.objects.get(pk=meeting.pk)
+        meeting.nb_occurrences = None
+        meeting.save()
+        self.assertEqual(meeting.nb_occurrences, 100000)
+        self.assertEqual(
+            meeting.recurring_until,
+            datetime(2296, 4, 20, 9, 0, tzinfo=ZoneInfo("UTC")),
+        )
@@ -1,14 +1,16 @@
 """Unit tests for the `get_occurrences` method on the Meeting model."""
 import random
 from datetime import datetime
+from unittest import mock
 from zoneinfo import ZoneInfo
 
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 
 from magnify.apps.core.factories import MeetingFactory
+from magnify.apps.core.recurrence import RecurrenceRule
 
-# pylint: disable=too-many-public-methods
+# pylint: disable=too-many-lines,too-many-public-methods
 
 
 class OccurencesMeetingsModelsTestCase(TestCase):
@@ -892,3 +894,137 @@ class OccurencesMeetingsModelsTestCase(TestCase):
             occurrences[-1], datetime(2049, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC"))
         )
         self.assertEqual(len(occurrences), 28)
+
+    # Seeking
+
+    def test_models_meetings_get_occurrences_seek_daily(self):
+        """
+        Occurrences in a window far from the start of a daily recurrence should be computed
+        without walking the whole history of the recurrence.
+        """
+        meeting = MeetingFactory(
+            start=datetime(2019, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            frequency=2,
+            timezone=ZoneInfo("Europe/Paris"),
+            recurring_until=None,
+            nb_occurrences=None,
+        )
+        computed = []
+        original = RecurrenceRule.iter_local_occurrences
+
+        def iter_local_occurrences(rule, index=0):
+            for occurrence in original(rule, index):
+                computed.append(occurrence)
+                yield occurrence
+
+        with mock.patch.object(
+            RecurrenceRule,
+            "iter_local_occurrences",
+            autospec=True,
+            side_effect=iter_local_occurrences,
+        ) as mock_iter:
+            occurrences = meeting.get_occurrences(
+                datetime(2022, 11, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 11, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            )
+
+        self.assertEqual(
+            occurrences,
+            [
+                datetime(2022, 11, 2, 10, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 11, 4, 10, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 11, 6, 10, 0, tzinfo=ZoneInfo("UTC")),
+            ],
+        )
+        # The occurrences in the window, the one stopping the iteration and at most one
+        # occurrence seeked before the window are computed, in a single iteration
+        mock_iter.assert_called_once()
+        self.assertGreaterEqual(len(computed), 4)
+        self.assertLessEqual(len(computed), 5)
+
+    def test_models_meetings_get_occurrences_seek_weekly(self):
+        """Seeking in a weekly recurrence should respect the frequency and the weekdays."""
+        # 2022-10-27 is a Thursday
+        meeting = MeetingFactory(
+            start=datetime(2022, 10, 27, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="weekly",
+            frequency=3,
+            timezone=ZoneInfo("Europe/Paris"),
+            recurring_until=None,
+            nb_occurrences=None,
+            weekdays="135",
+        )
+        self.assertEqual(
+            meeting.get_occurrences(
+                datetime(2025, 3, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2025, 3, 31, 9, 0, tzinfo=ZoneInfo("UTC")),
+            ),
+            [
+                datetime(2025, 3, 4, 10, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2025, 3, 6, 10, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2025, 3, 8, 10, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2025, 3, 25, 10, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2025, 3, 27, 10, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2025, 3, 29, 10, 0, tzinfo=ZoneInfo("UTC")),
+            ],
+        )
+
+    def test_models_meetings_get_occurrences_seek_monthly_end_of_month(self):
+        """
+        Seeking in a monthly recurrence starting at the end of a month should keep the day
+        clipped by previous short months, as when walking the recurrence from its start.
+        """
+        meeting = MeetingFactory(
+            start=datetime(2023, 1, 31, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="monthly",
+            frequency=1,
+            timezone=ZoneInfo("UTC"),
+            recurring_until=None,
+            nb_occurrences=None,
+        )
+        self.assertEqual(
+            meeting.get_occurrences(
+                datetime(2024, 6, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2024, 8, 1, 9, 0, tzinfo=ZoneInfo("UTC")),
+            ),
+            [
+                datetime(2024, 6, 28, 9, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2024, 7, 28, 9, 0, tzinfo=ZoneInfo("UTC")),
+            ],
+        )
+
+    def test_models_meetings_get_occurrences_seek_same_as_walking(self):
+        """
+        Seeking should return the same occurrences as walking the recurrence from its start,
+        whatever the type of recurrence.
+        """
+        # 2022-10-23 is a Sunday for which the nth weekday can not be sought
+        for start_day, monthly_type in [
+            (21, "nth_day"),
+            (23, "nth_day"),
+            (30, "date_day"),
+        ]:
+            for recurrence in ["daily", "monthly", "yearly"]:
+                meeting = MeetingFactory(
+                    start=datetime(2022, 10, start_day, 9, 0, tzinfo=ZoneInfo("UTC")),
+                    recurrence=recurrence,
+                    frequency=random.randint(1, 5),
+                    timezone=ZoneInfo("Europe/Paris"),
+                    recurring_until=None,
+                    nb_occurrences=None,
+                    monthly_type=monthly_type,
+                )
+                window_start = datetime(2031, 2, 3, 9, 0, tzinfo=ZoneInfo("UTC"))
+                window_end = datetime(2034, 5, 6, 9, 0, tzinfo=ZoneInfo("UTC"))
+
+                expected = []
+                occurrence = meeting.start
+                while occurrence <= window_end:
+                    if occurrence >= window_start:
+                        expected.append(occurrence)
+                    occurrence = meeting.next_occurrence(occurrence)
+
+                self.assertEqual(
+                    meeting.get_occurrences(window_start, window_end), expected
+                )
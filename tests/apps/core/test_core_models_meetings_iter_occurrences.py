@@ -0,0 +1,98 @@
+"""Unit tests for the `iter_occurrences` method on the Meeting model."""
+from datetime import datetime
+from itertools import islice
+from zoneinfo import ZoneInfo
+
+from django.test import TestCase
+
+from magnify.apps.core.factories import MeetingFactory
+
+
+class IterOccurrencesMeetingsModelsTestCase(TestCase):
+    """Unit test suite to validate lazy iteration over meeting occurrences."""
+
+    def test_models_meetings_iter_occurrences_no_recurrence(self):
+        """A meeting without recurrence should yield its start only if it is after the cursor."""
+        meeting = MeetingFactory(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence=None,
+        )
+        self.assertEqual(
+            list(meeting.iter_occurrences()),
+            [datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC"))],
+        )
+        self.assertEqual(
+            list(
+                meeting.iter_occurrences(
+                    after=datetime(2022, 7, 7, 8, 59, tzinfo=ZoneInfo("UTC"))
+                )
+            ),
+            [datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC"))],
+        )
+        self.assertEqual(
+            list(
+                meeting.iter_occurrences(
+                    after=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC"))
+                )
+            ),
+            [],
+        )
+        self.assertEqual(list(meeting.iter_occurrences(limit=0)), [])
+
+    def test_models_meetings_iter_occurrences_finite(self):
+        """A finite recurrence should stop at the date of end of recurrence."""
+        meeting = MeetingFactory(
+            start=datetime(2022, 10, 27, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="weekly",
+            frequency=1,
+            timezone=ZoneInfo("Europe/Paris"),
+            recurring_until=None,
+            nb_occurrences=5,
+            weekdays="36",  # Thursday and Sunday
+        )
+        self.assertEqual(
+            list(meeting.iter_occurrences()),
+            meeting.get_occurrences(meeting.start, meeting.recurring_until),
+        )
+        self.assertEqual(
+            list(
+                meeting.iter_occurrences(
+                    after=datetime(2022, 11, 3, 10, 0, tzinfo=ZoneInfo("UTC")), limit=10
+                )
+            ),
+            [
+                datetime(2022, 11, 6, 10, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 11, 10, 10, 0, tzinfo=ZoneInfo("UTC")),
+            ],
+        )
+
+    def test_models_meetings_iter_occurrences_infinite(self):
+        """An infinite recurrence should be iterated lazily with a limit and a cursor."""
+        meeting = MeetingFactory(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="monthly",
+            timezone=ZoneInfo("Europe/Paris"),
+            frequency=1,
+            recurring_until=None,
+            nb_occurrences=None,
+        )
+        self.assertEqual(
+            list(
+                meeting.iter_occurrences(
+                    after=datetime(2049, 11, 7, 8, 0, tzinfo=ZoneInfo("UTC")), limit=3
+                )
+            ),
+            [
+                datetime(2049, 11, 7, 10, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2049, 12, 7, 10, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2050, 1, 7, 10, 0, tzinfo=ZoneInfo("UTC")),
+            ],
+        )
+        # Without limit, the iteration is only stopped by the caller
+        self.assertEqual(
+            list(islice(meeting.iter_occurrences(), 2)),
+            [
+                datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 8, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            ],
+        )
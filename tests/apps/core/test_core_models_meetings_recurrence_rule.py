@@ -0,0 +1,94 @@
+"""Unit tests for the recurrence rule compiled from the Meeting model."""
+from dataclasses import FrozenInstanceError
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from django.test import TestCase
+
+from magnify.apps.core.factories import MeetingFactory
+from magnify.apps.core.recurrence import MONTHS, WEEKS
+
+
+class RecurrenceRuleMeetingsModelsTestCase(TestCase):
+    """Unit test suite to validate the compilation and caching of recurrence rules."""
+
+    def test_models_meetings_recurrence_rule_compiled(self):
+        """Weekdays should be compiled to a bitmask and a table of offsets."""
+        meeting = MeetingFactory.build(
+            start=datetime(2022, 10, 27, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="weekly",
+            frequency=2,
+            timezone=ZoneInfo("Europe/Paris"),
+            weekdays="36",  # Thursday and Sunday
+        )
+        rule = meeting.get_recurrence_rule()
+        self.assertEqual(rule.unit, WEEKS)
+        self.assertEqual(rule.weekdays, 0b1001000)
+        self.assertEqual(rule.weekdays_list, (3, 6))
+        self.assertEqual(
+            rule.weekday_offsets,
+            tuple(timedelta(days=days) for days in (3, 2, 1, 3, 2, 1, 11)),
+        )
+
+        with self.assertRaises(FrozenInstanceError):
+            rule.frequency = 1
+
+    def test_models_meetings_recurrence_rule_yearly(self):
+        """Yearly recurrences should be compiled as recurrences every 12 months."""
+        meeting = MeetingFactory.build(recurrence="yearly", frequency=2)
+        rule = meeting.get_recurrence_rule()
+        self.assertEqual(rule.unit, MONTHS)
+        self.assertEqual(rule.frequency, 24)
+        self.assertFalse(rule.nth_day)
+
+    def test_models_meetings_recurrence_rule_cached(self):
+        """The rule should be compiled once until a recurrence field changes."""
+        meeting = MeetingFactory.build(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            frequency=1,
+        )
+        rule = meeting.get_recurrence_rule()
+        self.assertIs(meeting.get_recurrence_rule(), rule)
+
+        meeting.name = "new name"
+        self.assertIs(meeting.get_recurrence_rule(), rule)
+
+        meeting.frequency = 2
+        self.assertIsNot(meeting.get_recurrence_rule(), rule)
+        self.assertEqual(
+            meeting.next_occurrence(meeting.start),
+            datetime(2022, 7, 9, 9, 0, tzinfo=ZoneInfo("UTC")),
+        )
+
+    def test_models_meetings_recurrence_rule_no_recurrence(self):
+        """Meetings without recurrence should not have next occurrences."""
+        meeting = MeetingFactory.build(recurrence=None)
+        with self.assertRaises(RuntimeError):
+            meeting.next_occurrence(meeting.start)
+
+    def test_models_meetings_recurrence_rule_next_occurrence_steps(self):
+        """
+        Stepping from one occurrence to the next should yield the same occurrences as computing
+        them arithmetically, keeping the local time across daylight saving time changes.
+        """
+        for fields in [
+            {"recurrence": "daily"},
+            {"recurrence": "weekly", "frequency": 2, "weekdays": "036"},
+            {"recurrence": "monthly", "monthly_type": "date_day"},
+            {"recurrence": "monthly", "monthly_type": "nth_day"},
+            {"recurrence": "yearly"},
+        ]:
+            with self.subTest(**fields):
+                meeting = MeetingFactory.build(
+                    start=datetime(2022, 1, 31, 1, 30, tzinfo=ZoneInfo("UTC")),
+                    timezone=ZoneInfo("Europe/Paris"),
+                    **fields,
+                )
+                rule = meeting.get_recurrence_rule()
+                expected = list(zip(range(100), rule.iter_occurrences()))
+
+                occurrence = meeting.start
+                for index, expected_occurrence in expected:
+                    self.assertEqual(occurrence, expected_occurrence, index)
+                    occurrence = rule.next_occurrence(occurrence)
@@ -0,0 +1,169 @@
+"""Unit tests for the `expand_occurrences` function of the recurrence module."""
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from django.test import TestCase
+
+from magnify.apps.core.factories import MeetingFactory
+from magnify.apps.core.recurrence import expand_occurrences
+
+
+class ExpandOccurrencesRecurrenceTestCase(TestCase):
+    """Unit test suite to validate the expansion of occurrences for many meetings at once."""
+
+    def test_recurrence_expand_occurrences_consistent(self):
+        """Occurrences should be the same as when computing them meeting by meeting."""
+        meetings = [
+            MeetingFactory.build(
+                start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+                end=datetime(2022, 7, 7, 10, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence=None,
+            ),
+            MeetingFactory.build(
+                start=datetime(2022, 1, 3, 9, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence="daily",
+                frequency=3,
+                timezone=ZoneInfo("Europe/Paris"),
+            ),
+            MeetingFactory.build(
+                start=datetime(2022, 1, 3, 9, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence="weekly",
+                frequency=2,
+                weekdays="046",
+                timezone=ZoneInfo("America/Toronto"),
+            ),
+            MeetingFactory.build(
+                start=datetime(2022, 1, 31, 9, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence="monthly",
+                monthly_type="date_day",
+                frequency=1,
+                timezone=ZoneInfo("Europe/Paris"),
+            ),
+            MeetingFactory.build(
+                start=datetime(2022, 1, 25, 9, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence="monthly",
+                monthly_type="nth_day",
+                frequency=1,
+                timezone=ZoneInfo("Asia/Tokyo"),
+            ),
+            MeetingFactory.build(  # Sunday: walked
+                start=datetime(2022, 1, 30, 9, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence="monthly",
+                monthly_type="nth_day",
+                frequency=1,
+                timezone=ZoneInfo("UTC"),
+            ),
+            MeetingFactory.build(
+                start=datetime(2020, 2, 29, 9, 0, tzinfo=ZoneInfo("UTC")),
+                recurrence="yearly",
+                frequency=1,
+                timezone=ZoneInfo("UTC"),
+            ),
+            # Local times skipped by the daylight saving time change of 2022-03-27
+            MeetingFactory.build(
+                start=datetime(2022, 3, 21, 1, 30, tzinfo=ZoneInfo("UTC")),
+                recurrence="weekly",
+                frequency=1,
+                weekdays="06",
+                timezone=ZoneInfo("Europe/Paris"),
+            ),
+            MeetingFactory.build(
+                start=datetime(2022, 2, 27, 1, 30, tzinfo=ZoneInfo("UTC")),
+                recurrence="monthly",
+                monthly_type="date_day",
+                frequency=1,
+                timezone=ZoneInfo("Europe/Paris"),
+            ),
+        ]
+        meetings[2].recurring_until = datetime(2022, 7, 20, tzinfo=ZoneInfo("UTC"))
+
+        for start, end in [
+            (
+                datetime(2022, 7, 1, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 7, 31, tzinfo=ZoneInfo("UTC")),
+            ),
+            (
+                datetime(2022, 1, 1, tzinfo=ZoneInfo("UTC")),
+                datetime(2024, 12, 31, tzinfo=ZoneInfo("UTC")),
+            ),
+            (
+                datetime(2021, 1, 1, tzinfo=ZoneInfo("UTC")),
+                datetime(2021, 2, 1, tzinfo=ZoneInfo("UTC")),
+            ),
+        ]:
+            occurrences = expand_occurrences(meetings, start, end)
+            self.assertEqual(
+                occurrences,
+                {
+                    meeting.pk: meeting.get_occurrences(start, end)
+                    for meeting in meetings
+                },
+            )
+
+    def test_recurrence_expand_occurrences_daily(self):
+        """Daily occurrences should be expanded in the period only."""
+        meeting = MeetingFactory.build(
+            start=datetime(2022, 7, 7, 9, 0, tzinfo=ZoneInfo("UTC")),
+            recurrence="daily",
+            frequency=2,
+            timezone=ZoneInfo("UTC"),
+        )
+        self.assertEqual(
+            expand_occurrences(
+                [meeting],
+                datetime(2022, 7, 9, 9, 1, tzinfo=ZoneInfo("UTC")),
+                datetime(2022, 7, 15, 9, 0, tzinfo=ZoneInfo("UTC")),
+            ),
+            {
+                meeting.pk: [
+                    datetime(2022, 7, 11, 9, 0, tzinfo=ZoneInfo("UTC")),
+                    datetime(2022, 7, 13, 9, 0, tzinfo=ZoneInfo("UTC")),
+                    datetime(2022, 7, 15, 9, 0, tzinfo=ZoneInfo("UTC")),
+                ]
+            },
+        )
+
+    def test_recurrence_expand_occurrences_daylight_saving_time_gap(self):
+        """
+        Occurrences of a meeting at a local time skipped by a daylight saving time change
+        should be the same whatever the path and the window used to compute them, and the
+        local time of the meeting should be kept after the change.
+        """
+        paris = ZoneInfo("Europe/Paris")
+        meeting = MeetingFactory.build(
+            start=datetime(2023, 3, 20, 2, 30, tzinfo=paris),
+            end=datetime(2023, 3, 20, 3, 30, tzinfo=paris),
+            recurrence="daily",
+            frequency=1,
+            timezone=paris,
+            recurring_until=None,
+            nb_occurrences=None,
+        )
+        # 2:30 does not exist on 2023-03-26 and is resolved with the offset before the change
+        expected = [
+            *(
+                datetime(2023, 3, day, 1, 30, tzinfo=ZoneInfo("UTC"))
+                for day in range(20, 27)
+            ),
+            *(
+                datetime(2023, 3, day, 0, 30, tzinfo=ZoneInfo("UTC"))
+                for day in range(27, 31)
+            ),
+        ]
+        end = datetime(2023, 3, 30, 12, 0, tzinfo=ZoneInfo("UTC"))
+
+        for index, start in enumerate(expected):
+            self.assertEqual(meeting.get_nth_occurrence(index), start)
+            self.assertEqual(meeting.get_occurrences(start, end), expected[index:])
+            self.assertEqual(
+                expand_occurrences([meeting], start, end),
+                {meeting.pk: expected[index:]},
+            )
+            self.assertEqual(
+                list(
+                    meeting.iter_occurrences(
+                        after=start, limit=len(expected) - index - 1
+                    )
+                ),
+                expected[index:][1:],
+            )
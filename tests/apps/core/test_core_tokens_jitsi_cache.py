@@ -0,0 +1,158 @@
+"""Unit tests for the cache of Jitsi tokens."""
+from datetime import datetime, timedelta
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import override_settings
+
+import jwt
+
+from magnify.apps.core.factories import UserFactory
+from magnify.apps.core.tokens import JitsiTokenFactory, jitsi_tokens_cache
+from magnify.apps.core.utils import generate_token
+
+NOW = datetime(2022, 7, 1, 9, 0, tzinfo=ZoneInfo("UTC"))
+
+
+@mock.patch.object(
+    JitsiTokenFactory,
+    "create_token",
+    autospec=True,
+    side_effect=JitsiTokenFactory.create_token,
+)
+@override_settings(JITSI_TOKEN_CACHE_SIZE=10)
+class JitsiTokensCacheTestCase(TestCase):
+    """Unit test suite to validate the two tiers cache of Jitsi tokens."""
+
+    def setUp(self):
+        """Start each test with empty tiers."""
+        super().setUp()
+        cache.clear()
+        jitsi_tokens_cache.clear()
+
+    @override_settings(JITSI_TOKEN_CACHE_SIZE=0)
+    def test_tokens_jitsi_cache_disabled(self, mock_encode):
+        """Tokens should be signed on each call when the cache is not configured."""
+        user = UserFactory()
+
+        generate_token(user, "room")
+        generate_token(user, "room")
+
+        self.assertEqual(mock_encode.call_count, 2)
+        self.assertEqual(jitsi_tokens_cache.get_stats()["local_size"], 0)
+
+    def test_tokens_jitsi_cache_hits(self, mock_encode):
+        """A token should be signed once for the same user, room and moderation right."""
+        user = UserFactory()
+
+        with mock.patch("django.utils.timezone.now", return_value=NOW):
+            token = generate_token(user, "room")
+        with mock.patch(
+            "django.utils.timezone.now", return_value=NOW + timedelta(seconds=100)
+        ):
+            self.assertEqual(generate_token(user, "room"), token)
+
+        self.assertEqual(mock_encode.call_count, 1)
+        self.assertEqual(
+            jitsi_tokens_cache.get_stats(),
+            {
+                "local_hits": 1,
+                "shared_hits": 0,
+                "misses": 1,
+                "local_size": 1,
+                "local_max_size": 10,
+            },
+        )
+
+    def test_tokens_jitsi_cache_inputs(self, mock_encode):
+        """Tokens should not be shared between different inputs."""
+        user = UserFactory()
+
+        tokens = {
+            generate_token(user, "room"),
+            generate_token(user, "other-room"),
+            generate_token(user, "room", is_admin=True),
+            generate_token(UserFactory(), "room"),
+            generate_token(AnonymousUser(), "room"),
+        }
+        with override_settings(
+            JITSI_CONFIGURATION={
+                **settings.JITSI_CONFIGURATION,
+                "jitsi_secret_key": "AnotherSecretKey",
+            }
+        ):
+            tokens.add(generate_token(user, "room"))
+
+        self.assertEqual(mock_encode.call_count, 6)
+        self.assertEqual(len(tokens), 6)
+
+    def test_tokens_jitsi_cache_expiration(self, mock_encode):
+        """
+        A token should be signed again when less than the configured fraction of its
+        lifetime remains.
+        """
+        user = UserFactory()
+
+        with mock.patch("django.utils.timezone.now", return_value=NOW):
+            token = generate_token(user, "room")
+        # Less than half of the 300 seconds of the lifetime of the token remains
+        with mock.patch(
+            "django.utils.timezone.now", return_value=NOW + timedelta(seconds=151)
+        ):
+            new_token = generate_token(user, "room")
+
+        self.assertNotEqual(new_token, token)
+        self.assertEqual(mock_encode.call_count, 2)
+        self.assertEqual(
+            jwt.decode(new_token, options={"verify_signature": False})["iat"],
+            int((NOW + timedelta(seconds=151)).timestamp()),
+        )
+
+    @override_settings(JITSI_TOKEN_CACHE_SIZE=2)
+    def test_tokens_jitsi_cache_eviction(self, mock_encode):
+        """The least recently used tokens should be evicted from the local tier."""
+        user = UserFactory()
+
+        generate_token(user, "room-1")
+        generate_token(user, "room-2")
+        generate_token(user, "room-1")
+        generate_token(user, "room-3")
+        self.assertEqual(mock_encode.call_count, 3)
+
+        generate_token(user, "room-1")
+        self.assertEqual(mock_encode.call_count, 3)
+        generate_token(user, "room-2")
+        self.assertEqual(mock_encode.call_count, 4)
+
+    @override_settings(JITSI_TOKEN_CACHE_SIZE=0, JITSI_TOKEN_CACHE_ALIAS="default")
+    def test_tokens_jitsi_cache_shared(self, mock_encode):
+        """
+        Tokens should be shared between processes via the shared tier until they are too old
+        to be handed back.
+        """
+        user = UserFactory()
+
+        with mock.patch("django.utils.timezone.now", return_value=NOW):
+            token = generate_token(user, "room")
+
+        with mock.patch.object(cache, "set", wraps=cache.set) as mock_set:
+            with mock.patch(
+                "django.utils.timezone.now", return_value=NOW + timedelta(seconds=100)
+            ):
+                self.assertEqual(generate_token(user, "room"), token)
+        mock_set.assert_not_called()
+        self.assertEqual(mock_encode.call_count, 1)
+        self.assertEqual(jitsi_tokens_cache.get_stats()["shared_hits"], 1)
+
+        with mock.patch.object(cache, "set", wraps=cache.set) as mock_set:
+            with mock.patch(
+                "django.utils.timezone.now", return_value=NOW + timedelta(seconds=200)
+            ):
+                self.assertNotEqual(generate_token(user, "room"), token)
+        self.assertEqual(mock_encode.call_count, 2)
+        # The new token is kept for the half of its lifetime during which it is handed back
+        self.assertEqual(mock_set.call_args[0][2], 150)
@@ -0,0 +1,114 @@
+"""
+Differential tests of the factory of Jitsi tokens against PyJWT.
+"""
+import datetime
+import random
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase
+from django.test.utils import override_settings
+
+import jwt
+import time_machine
+
+from magnify.apps.core.factories import UserFactory
+from magnify.apps.core.models import User
+from magnify.apps.core.tokens import JitsiTokenFactory
+from magnify.apps.core.utils import create_token_payload
+
+JITSI_CONFIGURATION = {
+    "jitsi_app_id": "app_id",
+    "jitsi_guest_avatar": "avatar.jpg",
+    "jitsi_guest_username": "guest",
+    "jitsi_secret_key": "ThisIsAnExampleKeyForDevPurposeOnly",
+    "jitsi_token_expiration_seconds": 600,
+    "jitsi_xmpp_domain": "meet.jitsi",
+}
+
+# Strings that JSON must escape or encode as ASCII
+TRICKY_STRINGS = ["", 'quote"d', "back\\slash", "new\nline", "éèà", "日本語", "🎉"]
+
+
+def encode_with_pyjwt(user, room, is_admin=False):
+    """Returns the token PyJWT encodes from the reference payload."""
+    return jwt.encode(
+        create_token_payload(user, room, is_admin=is_admin),
+        settings.JITSI_CONFIGURATION["jitsi_secret_key"],
+        algorithm="HS256",
+    )
+
+
+@time_machine.travel(
+    datetime.datetime(2030, 6, 15, 9, 30, 15, 987654, tzinfo=datetime.timezone.utc),
+    tick=False,
+)
+@override_settings(JITSI_CONFIGURATION=JITSI_CONFIGURATION)
+class JitsiTokenFactoryTestCase(TestCase):
+    """Test suite to compare the tokens signed by the factory with the tokens of PyJWT."""
+
+    def assert_identical(self, user, room, is_admin=False):
+        """The factory should sign the same token as PyJWT, byte for byte."""
+        token, expires_at = JitsiTokenFactory.get_instance().create_token(
+            user, room, is_admin=is_admin
+        )
+        self.assertEqual(token, encode_with_pyjwt(user, room, is_admin=is_admin))
+        self.assertEqual(
+            int(expires_at.timestamp()),
+            jwt.decode(token, options={"verify_signature": False})["exp"],
+        )
+
+    def test_tokens_jitsi_token_factory_anonymous(self):
+        """Tokens of guests should be identical."""
+        for room in ["my-room", *TRICKY_STRINGS]:
+            for is_admin in [True, False]:
+                self.assert_identical(AnonymousUser(), room, is_admin=is_admin)
+
+    def test_tokens_jitsi_token_factory_authenticated(self):
+        """Tokens of users should be identical whatever their name and email."""
+        for value in TRICKY_STRINGS:
+            user = User(username=f"user{value:s}", email=f"{value:s}@example.com")
+            self.assert_identical(user, value, is_admin=random.choice([True, False]))
+
+    def test_tokens_jitsi_token_factory_staff(self):
+        """Tokens of staff users should be identical."""
+        self.assert_identical(UserFactory(is_staff=True), "my-room")
+
+    def test_tokens_jitsi_token_factory_settings(self):
+        """Tokens should remain identical for settings that JSON must escape or omit."""
+        for value in TRICKY_STRINGS:
+            configuration = {
+                **JITSI_CONFIGURATION,
+                "jitsi_app_id": f"app{value:s}",
+                "jitsi_guest_username": value,
+                "jitsi_secret_key": f"ThisIsAnExampleKeyForDevPurposeOnly{value:s}",
+                "jitsi_xmpp_domain": f"meet{value:s}",
+            }
+            with override_settings(JITSI_CONFIGURATION=configuration):
+                self.assert_identical(AnonymousUser(), "my-room")
+                self.assert_identical(UserFactory(), "my-room")
+
+        configuration = {**JITSI_CONFIGURATION}
+        del configuration["jitsi_guest_avatar"]
+        with override_settings(JITSI_CONFIGURATION=configuration):
+            self.assert_identical(AnonymousUser(), "my-room")
+
+    def test_tokens_jitsi_token_factory_instance(self):
+        """The factory should be built once and again when settings are replaced."""
+        factory = JitsiTokenFactory.get_instance()
+        self.assertIs(JitsiTokenFactory.get_instance(), factory)
+
+        configuration = {**JITSI_CONFIGURATION, "jitsi_token_expiration_seconds": 60}
+        with override_settings(JITSI_CONFIGURATION=configuration):
+            new_factory = JitsiTokenFactory.get_instance()
+            self.assertIsNot(new_factory, factory)
+            self.assertEqual(new_factory.expiration, datetime.timedelta(seconds=60))
+
+    def test_tokens_jitsi_token_factory_issuer(self):
+        """Like PyJWT, the factory should refuse an issuer that is not a string."""
+        configuration = {**JITSI_CONFIGURATION, "jitsi_app_id": None}
+        with override_settings(JITSI_CONFIGURATION=configuration):
+            with self.assertRaises(TypeError):
+                encode_with_pyjwt(AnonymousUser(), "my-room")
+            with self.assertRaises(TypeError):
+                JitsiTokenFactory.get_instance()
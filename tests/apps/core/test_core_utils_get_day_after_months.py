@@ -0,0 +1,39 @@
+"""
+Test suite for the `get_day_after_months` util
+"""
+from datetime import date
+
+from django.test import TestCase
+
+from magnify.apps.core.utils import get_day_after_months
+
+
+class GetDayAfterMonthsUtilsTestCase(TestCase):
+    """Test suite for computing the day reached by chained additions of months."""
+
+    def test_utils_get_day_after_months_no_clipping(self):
+        """Days that exist in all months should never change."""
+        self.assertEqual(get_day_after_months(date(2023, 1, 28), 1, 1000), 28)
+        self.assertEqual(get_day_after_months(date(2023, 3, 15), 7, 3), 15)
+
+    def test_utils_get_day_after_months_clipping_carries_over(self):
+        """Once clipped by a short month, the day should stay clipped."""
+        self.assertEqual(get_day_after_months(date(2023, 1, 31), 1, 0), 31)
+        self.assertEqual(get_day_after_months(date(2023, 1, 31), 1, 1), 28)
+        self.assertEqual(get_day_after_months(date(2023, 1, 31), 1, 100), 28)
+        self.assertEqual(get_day_after_months(date(2023, 8, 31), 1, 1), 30)
+        self.assertEqual(get_day_after_months(date(2023, 8, 31), 1, 6), 29)
+        self.assertEqual(get_day_after_months(date(2024, 1, 31), 1, 1), 29)
+
+    def test_utils_get_day_after_months_never_february(self):
+        """Months of the year never reached should not clip the day."""
+        self.assertEqual(get_day_after_months(date(2023, 1, 31), 12, 10000), 31)
+        self.assertEqual(get_day_after_months(date(2023, 1, 31), 6, 10000), 31)
+        self.assertEqual(get_day_after_months(date(2023, 1, 31), 2, 10000), 30)
+
+    def test_utils_get_day_after_months_leap_years(self):
+        """Leap days should be clipped on the first non-leap year reached."""
+        self.assertEqual(get_day_after_months(date(2024, 2, 29), 12, 3), 28)
+        self.assertEqual(get_day_after_months(date(2024, 2, 29), 48, 18), 29)
+        # 2100 is not a leap year
+        self.assertEqual(get_day_after_months(date(2024, 2, 29), 48, 19), 28)
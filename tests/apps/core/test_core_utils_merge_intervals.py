@@ -0,0 +1,29 @@
+"""
+Unit tests for the merge_intervals utility function
+"""
+from django.test import TestCase
+
+from magnify.apps.core.utils import merge_intervals
+
+
+class MergeIntervalsUtilsTestCase(TestCase):
+    """Unit test suite to validate the behavior of the `merge_intervals` function."""
+
+    def test_utils_merge_intervals_empty(self):
+        """No intervals should give no busy intervals."""
+        self.assertEqual(merge_intervals([]), [])
+        self.assertEqual(merge_intervals([[], []]), [])
+
+    def test_utils_merge_intervals_disjoint(self):
+        """Disjoint intervals should be interleaved in chronological order."""
+        self.assertEqual(
+            merge_intervals([[(1, 2), (5, 6)], [(3, 4)]]),
+            [(1, 2), (3, 4), (5, 6)],
+        )
+
+    def test_utils_merge_intervals_overlapping(self):
+        """Overlapping, nested and touching intervals should be merged."""
+        self.assertEqual(
+            merge_intervals([[(1, 4), (8, 9)], [(2, 3), (4, 6)], [(7, 8), (10, 12)]]),
+            [(1, 6), (7, 9), (10, 12)],
+        )